@@ -0,0 +1,108 @@
+"""
+Enqueue-to-execution benchmark for the celery app.
+
+Starts an embedded worker against the configured Redis broker,
+publishes probe tasks and reports enqueue latency, delivery latency
+(publish to task start) and tasks/sec as JSON.
+
+Run it against a local Redis, once per profile::
+
+    IDEANEST_ASSESMENT_REDIS_HOST=localhost \
+        python -m benchmarks.celery_throughput --profile performance
+"""
+
+import argparse
+import threading
+import time
+
+from celery.contrib.testing.worker import start_worker
+
+from benchmarks.utils import percentiles, report
+from ideanest_assesment.services.tasks.profiles import get_celery_profile
+from ideanest_assesment.services.tasks.send_email import app
+from ideanest_assesment.settings import CeleryProfile
+
+delivery_latencies: list[float] = []
+received = threading.Semaphore(0)
+
+
+@app.task(name="benchmarks.probe")
+def probe(sent_at: float, payload: str) -> None:
+    """Record how long the task waited between publish and execution."""
+    delivery_latencies.append(time.time() - sent_at)
+    received.release()
+
+
+def run(
+    profile: CeleryProfile,
+    tasks: int,
+    concurrency: int,
+    payload: int,
+    timeout: float,
+) -> None:
+    """
+    Publish probe tasks and wait until the worker executed all of them.
+
+    :param profile: celery profile to benchmark.
+    :param tasks: number of tasks to publish.
+    :param concurrency: number of worker threads.
+    :param payload: size of a task argument, in bytes.
+    :param timeout: seconds to wait for the worker to drain the queue.
+    """
+    app.conf.update(get_celery_profile(profile))
+    queue = app.conf.task_default_queue
+    body = "x" * payload
+    enqueue_latencies = []
+
+    with start_worker(
+        app,
+        pool="threads",
+        concurrency=concurrency,
+        perform_ping_check=False,
+        queues=[queue],
+    ):
+        started = time.perf_counter()
+        for _ in range(tasks):
+            before = time.perf_counter()
+            probe.apply_async((time.time(), body), queue=queue)
+            enqueue_latencies.append(time.perf_counter() - before)
+        deadline = time.monotonic() + timeout
+        for _ in range(tasks):
+            if not received.acquire(timeout=max(0, deadline - time.monotonic())):
+                break
+        elapsed = time.perf_counter() - started
+
+    report(
+        {
+            "benchmark": "celery_throughput",
+            "profile": profile.value,
+            "tasks": tasks,
+            "executed": len(delivery_latencies),
+            "concurrency": concurrency,
+            "payload_bytes": payload,
+            "elapsed_s": round(elapsed, 3),
+            "tasks_per_sec": round(len(delivery_latencies) / elapsed, 1),
+            "enqueue_ms": percentiles(enqueue_latencies),
+            "delivery_ms": percentiles(delivery_latencies),
+        },
+    )
+
+
+def main() -> None:
+    """Entrypoint of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--profile",
+        type=CeleryProfile,
+        default=CeleryProfile.PERFORMANCE,
+    )
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--payload", type=int, default=2048)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+    run(args.profile, args.tasks, args.concurrency, args.payload, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+End-to-end load test of the API.
+
+Runs scripted scenarios and reports RPS, latency percentiles and
+responses by status as JSON. By default the app runs in this process
+with its lifespan, against the configured MongoDB, Redis and RabbitMQ.
+``--fake-redis`` replaces Redis with fakeredis, ``--base-url`` sends
+requests to a running server instead. Test data is created directly
+in the configured MongoDB in both cases::
+
+    python -m benchmarks.load organization_reads --requests 5000
+    python -m benchmarks.load all --fake-redis --no-rate-limit
+    python -m benchmarks.load login_storm --base-url http://localhost:8000
+
+Available scenarios: login_storm, organization_reads, invite_burst,
+redis_bulk, rabbit_publish.
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, Optional
+
+import beanie
+import httpx
+from fastapi import FastAPI
+from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
+
+from benchmarks.load.runner import run_load
+from benchmarks.load.scenarios import SCENARIOS
+from benchmarks.utils import report
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.services.ratelimit.dependency import get_rate_limiter
+from ideanest_assesment.services.ratelimit.limiter import RateLimiter
+from ideanest_assesment.services.redis.dependency import get_redis, get_redis_pool
+from ideanest_assesment.services.roles.cache import RoleCache
+from ideanest_assesment.services.roles.dependency import get_role_cache
+from ideanest_assesment.settings import settings
+from ideanest_assesment.web.application import get_app
+
+
+def use_fake_redis(app: FastAPI) -> None:
+    """
+    Replace redis of the app with fakeredis.
+
+    :param app: tested application.
+    """
+    from fakeredis import FakeServer
+    from fakeredis.aioredis import FakeConnection
+
+    from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
+
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeConnection,
+        server=FakeServer(),
+        max_connections=settings.redis_pool_size,
+    )
+    redis = Redis(connection_pool=pool)
+    rate_limiter = RateLimiter(redis=redis, period=settings.rate_limit_period)
+    role_cache = RoleCache(redis=redis, ttl=settings.role_cache_ttl)
+    app.dependency_overrides[get_redis_pool] = lambda: pool
+    app.dependency_overrides[get_redis] = lambda: redis
+    app.dependency_overrides[get_rate_limiter] = lambda: rate_limiter
+    app.dependency_overrides[get_role_cache] = lambda: role_cache
+
+
+async def run(
+    scenarios: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    base_url: Optional[str],
+    fake_redis: bool,
+) -> None:
+    """
+    Run scenarios one after another.
+
+    :param scenarios: names of scenarios.
+    :param requests: measured requests per scenario.
+    :param concurrency: concurrent requests.
+    :param warmup: requests sent before measuring.
+    :param base_url: URL of a running server, the app runs in-process if None.
+    :param fake_redis: whether to use fakeredis in the in-process app.
+    """
+    results: list[dict[str, Any]] = []
+    async with AsyncExitStack() as stack:
+        if base_url:
+            db_client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+            await beanie.init_beanie(
+                database=db_client[settings.db_base],
+                document_models=load_all_models(),  # type: ignore
+            )
+            stack.callback(db_client.close)
+            client = httpx.AsyncClient(base_url=base_url, timeout=30)
+        else:
+            app = get_app()
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            if fake_redis:
+                use_fake_redis(app)
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                base_url="http://load-test",
+                timeout=30,
+            )
+        await stack.enter_async_context(client)
+
+        for name in scenarios:
+            scenario = SCENARIOS[name]()
+            try:
+                await scenario.setup(client, warmup + requests)
+                results.append(
+                    await run_load(client, scenario, requests, concurrency, warmup),
+                )
+            finally:
+                await scenario.teardown()
+
+    report(
+        {
+            "benchmark": "load",
+            "target": base_url or "in-process",
+            "fake_redis": fake_redis,
+            "rate_limit": settings.rate_limit_enabled,
+            "results": results,
+        },
+    )
+
+
+def main() -> None:
+    """Entrypoint of the load test."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("scenario", choices=[*SCENARIOS, "all"])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--base-url")
+    parser.add_argument("--fake-redis", action="store_true")
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="disable rate limiting of the in-process app",
+    )
+    args = parser.parse_args()
+    if args.no_rate_limit:
+        settings.rate_limit_enabled = False
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    asyncio.run(
+        run(
+            scenarios,
+            args.requests,
+            args.concurrency,
+            args.warmup,
+            args.base_url,
+            args.fake_redis,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Any, Iterator
+
+import httpx
+
+from benchmarks.load.scenarios import Scenario
+from benchmarks.utils import percentiles
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, Any]:
+    """
+    Send scenario requests from concurrent workers.
+
+    Every worker sends the next request as soon as the previous one
+    completed, so the load is limited only by concurrency.
+
+    :param client: client of the tested app.
+    :param scenario: scenario to run, already set up.
+    :param requests: number of measured requests.
+    :param concurrency: number of workers.
+    :param warmup: number of requests sent before measuring.
+    :return: throughput, latency percentiles and responses by status.
+    """
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+
+    async def worker(numbers: Iterator[int], total: int, measure: bool) -> None:
+        for number in numbers:
+            if number >= total:
+                return
+            method, url, kwargs = scenario.request(number)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            if measure:
+                latencies.append(time.perf_counter() - started)
+                statuses[status] += 1
+
+    # Workers share the counter, so every number is sent once.
+    numbers = itertools.count()
+    await asyncio.gather(*(worker(numbers, warmup, False) for _ in range(concurrency)))
+    numbers = itertools.count(warmup)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(numbers, warmup + requests, True) for _ in range(concurrency)),
+    )
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario.name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+        "statuses": dict(statuses),
+    }
@@ -0,0 +1,306 @@
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+from beanie.operators import In, RegEx
+
+from ideanest_assesment.auth.auth import create_access_token
+from ideanest_assesment.db.models.organization import (
+    MemberUser,
+    Organization,
+    OrganizationMember,
+)
+from ideanest_assesment.db.models.outbox import OutboxMessage
+from ideanest_assesment.db.models.user import User, pwd_context
+
+Request = tuple[str, str, Dict[str, Any]]
+
+PASSWORD = "load-test-password"  # noqa: S105
+
+
+class Scenario:
+    """
+    Scripted load against the API.
+
+    Scenarios create the data they need in ``setup``, produce requests
+    by their number in ``request`` and remove their data in ``teardown``.
+    Data of every run is prefixed with a random id, so runs don't collide.
+    """
+
+    name = ""
+
+    def __init__(self) -> None:
+        self.run_id = uuid.uuid4().hex[:8]
+        self.users: List[User] = []
+        self.organizations: List[Organization] = []
+
+    async def setup(self, client: httpx.AsyncClient, total: int) -> None:
+        """
+        Create data for the scenario.
+
+        :param client: client of the tested app.
+        :param total: number of requests that will be sent.
+        """
+
+    def request(self, number: int) -> Request:
+        """
+        Build a request.
+
+        :param number: number of the request.
+        :return: method, URL and keyword arguments for ``httpx``.
+        """
+        raise NotImplementedError
+
+    async def teardown(self) -> None:
+        """Remove data created by the scenario."""
+        if self.organizations:
+            await Organization.find(
+                In(Organization.id, [org.id for org in self.organizations]),
+            ).delete()
+        if self.users:
+            await User.find(In(User.id, [user.id for user in self.users])).delete()
+
+    async def create_users(self, count: int) -> List[User]:
+        """
+        Create users sharing the same password.
+
+        The password is hashed once, bcrypt is too slow to do it per user.
+
+        :param count: number of users.
+        :return: created users.
+        """
+        hashed_password = pwd_context.hash(PASSWORD)
+        users = [
+            User(
+                name=f"Load {number}",
+                email=f"load-{self.run_id}-{number}@example.com",
+                hashed_password=hashed_password,
+            )
+            for number in range(count)
+        ]
+        result = await User.insert_many(users)
+        for user, user_id in zip(users, result.inserted_ids):
+            user.id = user_id
+        self.users.extend(users)
+        return users
+
+    async def create_organizations(
+        self,
+        count: int,
+        owner: User,
+        members: int,
+    ) -> List[Organization]:
+        """
+        Create organizations.
+
+        :param count: number of organizations.
+        :param owner: user added as every member.
+        :param members: members in each organization.
+        :return: created organizations.
+        """
+        organizations = []
+        user = MemberUser.from_user(owner)
+        for number in range(count):
+            organization = Organization(
+                name=f"load-{self.run_id}-{number}",
+                description="Organization created by the load test.",
+                members=[
+                    OrganizationMember(user=user, access_level="admin"),
+                    *(
+                        OrganizationMember(user=user, access_level="read_only")
+                        for _ in range(members - 1)
+                    ),
+                ],
+            )
+            await organization.insert()
+            organizations.append(organization)
+        self.organizations.extend(organizations)
+        return organizations
+
+
+def auth_headers(user: User) -> Dict[str, str]:
+    """
+    Get headers authenticating requests as the user.
+
+    :param user: authenticated user.
+    :return: headers with access token.
+    """
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+class LoginStorm(Scenario):
+    """Logins to many accounts, every fifth one with a wrong password."""
+
+    name = "login_storm"
+
+    def __init__(self, users: int = 50) -> None:
+        super().__init__()
+        self.accounts = users
+
+    async def setup(self, client: httpx.AsyncClient, total: int) -> None:
+        """See :meth:`Scenario.setup`."""
+        await self.create_users(self.accounts)
+
+    def request(self, number: int) -> Request:
+        """See :meth:`Scenario.request`."""
+        user = self.users[number % len(self.users)]
+        password = "wrong" if number % 5 == 4 else PASSWORD
+        return (
+            "POST",
+            "/api/users/token",
+            {"data": {"username": user.email, "password": password}},
+        )
+
+
+class OrganizationReads(Scenario):
+    """
+    Polling of organizations.
+
+    Requests alternate between the list and single organizations,
+    every second one revalidates the ETag received before.
+    """
+
+    name = "organization_reads"
+
+    def __init__(self, organizations: int = 50, members: int = 20) -> None:
+        super().__init__()
+        self.count = organizations
+        self.members = members
+        self.headers: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+
+    async def setup(self, client: httpx.AsyncClient, total: int) -> None:
+        """See :meth:`Scenario.setup`."""
+        (owner,) = await self.create_users(1)
+        self.headers = auth_headers(owner)
+        await self.create_organizations(self.count, owner, self.members)
+        for url in [self.url(number) for number in range(self.count + 1)]:
+            response = await client.get(url, headers=self.headers)
+            self.etags[url] = response.headers.get("ETag", "")
+
+    def url(self, number: int) -> str:
+        """
+        Get URL of the list or of a single organization.
+
+        :param number: 0 for the list, otherwise organization number.
+        :return: URL.
+        """
+        if number == 0:
+            return "/api/organizations/"
+        return f"/api/organizations/{self.organizations[number - 1].id}"
+
+    def request(self, number: int) -> Request:
+        """See :meth:`Scenario.request`."""
+        url = self.url(0 if number % 4 < 2 else number % self.count + 1)
+        headers = self.headers
+        if number % 2:
+            headers = {**headers, "If-None-Match": self.etags[url]}
+        return "GET", url, {"headers": headers}
+
+
+class InviteBurst(Scenario):
+    """
+    Invitations of new members.
+
+    Invitations are spread over organizations, so concurrent requests
+    rarely change the same one.
+    Run it without a celery worker: invitation emails go to example.com.
+    """
+
+    name = "invite_burst"
+
+    def __init__(self, organizations: int = 50) -> None:
+        super().__init__()
+        self.count = organizations
+        self.headers: Dict[str, str] = {}
+        self.invitees: List[User] = []
+
+    async def setup(self, client: httpx.AsyncClient, total: int) -> None:
+        """See :meth:`Scenario.setup`."""
+        owner, *self.invitees = await self.create_users(total + 1)
+        self.headers = auth_headers(owner)
+        await self.create_organizations(self.count, owner, 1)
+
+    def request(self, number: int) -> Request:
+        """See :meth:`Scenario.request`."""
+        organization = self.organizations[number % self.count]
+        return (
+            "POST",
+            f"/api/organizations/{organization.id}/invite",
+            {
+                "headers": self.headers,
+                "json": {"user_email": self.invitees[number].email},
+            },
+        )
+
+    async def teardown(self) -> None:
+        """See :meth:`Scenario.teardown`."""
+        await OutboxMessage.find(
+            RegEx("args.1", f"^load-{self.run_id}-"),
+        ).delete()
+        await super().teardown()
+
+
+class RedisBulk(Scenario):
+    """Bulk writes of values followed by bulk reads of them."""
+
+    name = "redis_bulk"
+
+    def __init__(self, batch: int = 100, value_size: int = 512) -> None:
+        super().__init__()
+        self.batch = batch
+        self.value = "x" * value_size
+
+    def keys(self, number: int) -> List[str]:
+        """
+        Get keys written by a request.
+
+        :param number: number of the write request.
+        :return: keys.
+        """
+        return [f"load:{self.run_id}:{number}:{key}" for key in range(self.batch)]
+
+    def request(self, number: int) -> Request:
+        """See :meth:`Scenario.request`."""
+        if number % 2:
+            return "POST", "/api/redis/mget", {"json": {"keys": self.keys(number - 1)}}
+        items = [
+            {"key": key, "value": self.value, "ttl": 300} for key in self.keys(number)
+        ]
+        return "PUT", "/api/redis/mset", {"json": {"items": items}}
+
+
+class RabbitPublish(Scenario):
+    """Publishing of messages to RabbitMQ."""
+
+    name = "rabbit_publish"
+
+    def __init__(self, message_size: int = 256) -> None:
+        super().__init__()
+        self.message = "x" * message_size
+
+    def request(self, number: int) -> Request:
+        """See :meth:`Scenario.request`."""
+        return (
+            "POST",
+            "/api/rabbit/",
+            {
+                "json": {
+                    "exchange_name": f"load-{self.run_id}",
+                    "routing_key": "load",
+                    "message": self.message,
+                },
+            },
+        )
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        LoginStorm,
+        OrganizationReads,
+        InviteBurst,
+        RedisBulk,
+        RabbitPublish,
+    )
+}
@@ -0,0 +1,268 @@
+"""
+Organization search on a large collection.
+
+Fills the configured MongoDB with organizations, runs prefix and keyword
+searches through ``OrganizationDAO`` and explains the same queries.
+Reports latency of every page and keys and documents examined by it,
+and fails if any query plan has a collection scan::
+
+    IDEANEST_ASSESMENT_DB_HOST=localhost \
+        python -m benchmarks.organization_search --organizations 1000000
+
+Organizations of a run are removed afterwards unless ``--keep`` is given;
+``--reuse`` searches organizations kept by a previous run.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.utils import percentiles, report
+from ideanest_assesment.db.dao.organization_dao import OrganizationDAO
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.models.organization import Organization, SearchMode
+from ideanest_assesment.settings import settings
+
+# Prefix of names of generated organizations.
+NAME_PREFIX = "bench-search"
+WORDS = [
+    "alpha",
+    "analytics",
+    "atlas",
+    "beacon",
+    "cloud",
+    "data",
+    "delta",
+    "digital",
+    "dynamics",
+    "energy",
+    "foundry",
+    "global",
+    "health",
+    "labs",
+    "logistics",
+    "media",
+    "network",
+    "nova",
+    "orbit",
+    "partners",
+    "quantum",
+    "robotics",
+    "solutions",
+    "systems",
+    "ventures",
+]
+SEARCHES = [
+    (SearchMode.prefix, f"{NAME_PREFIX} Alpha"),
+    (SearchMode.prefix, f"{NAME_PREFIX} quantum lab"),
+    (SearchMode.prefix, f"{NAME_PREFIX} NOVA ORBIT 1"),
+    (SearchMode.text, "robotics"),
+    (SearchMode.text, "foundry orbit"),
+]
+
+
+def generate(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate organizations with names and descriptions of random words.
+
+    :param count: number of organizations.
+    :param seed: seed of random words.
+    :yield: raw documents.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    for number in range(count):
+        words = rng.sample(WORDS, 4)
+        yield {
+            "name": f"{NAME_PREFIX} {words[0].title()} {words[1]} {number}",
+            "description": f"{words[2].title()} and {words[3]} company.",
+            "members": [],
+        }
+
+
+async def fill(count: int, batch_size: int = 10000) -> None:
+    """
+    Insert organizations.
+
+    :param count: number of organizations.
+    :param batch_size: organizations inserted at once.
+    """
+    collection = Organization.get_motor_collection()
+    batch: List[Dict[str, Any]] = []
+    for document in generate(count):
+        batch.append(document)
+        if len(batch) == batch_size:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+def plan_stages(plan: Any, stages: Optional[Set[str]] = None) -> Set[str]:
+    """
+    Collect names of all stages of a query plan.
+
+    :param plan: explain output or its part.
+    :param stages: names collected so far.
+    :return: names of stages.
+    """
+    stages = set() if stages is None else stages
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            plan_stages(value, stages)
+    elif isinstance(plan, list):
+        for value in plan:
+            plan_stages(value, stages)
+    return stages
+
+
+async def explain(
+    mode: SearchMode,
+    query: str,
+    limit: int,
+    cursor: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Explain a search the way ``OrganizationDAO`` runs it.
+
+    :param mode: how to search.
+    :param query: searched text.
+    :param limit: organizations on a page.
+    :param cursor: cursor of the page.
+    :return: stages of the winning plan, keys and documents examined.
+    """
+    search = OrganizationDAO.search_query(query, mode, cursor)
+    plan = await (
+        Organization.get_motor_collection()
+        .find(
+            search["filter"],
+            sort=search["sort"],
+            limit=limit + 1,
+            collation=search.get("collation"),
+        )
+        .explain()
+    )
+    stats = plan["executionStats"]
+    return {
+        "stages": sorted(plan_stages(plan["queryPlanner"]["winningPlan"])),
+        "keys_examined": stats["totalKeysExamined"],
+        "docs_examined": stats["totalDocsExamined"],
+        "returned": stats["nReturned"],
+    }
+
+
+async def search(
+    mode: SearchMode,
+    query: str,
+    limit: int,
+    pages: int,
+) -> Dict[str, Any]:
+    """
+    Get first pages of a search.
+
+    :param mode: how to search.
+    :param query: searched text.
+    :param limit: organizations on a page.
+    :param pages: number of pages to get.
+    :return: latency and plans of pages.
+    """
+    latencies = []
+    plans = []
+    cursor = None
+    for _ in range(pages):
+        plans.append(await explain(mode, query, limit, cursor))
+        started = time.perf_counter()
+        page = await OrganizationDAO.search_organizations(query, mode, limit, cursor)
+        latencies.append(time.perf_counter() - started)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    return {
+        "mode": mode.value,
+        "query": query,
+        "pages": len(latencies),
+        "latency_ms": percentiles(latencies),
+        "plans": plans,
+    }
+
+
+async def run(
+    organizations: int,
+    limit: int,
+    pages: int,
+    keep: bool,
+    reuse: bool,
+) -> bool:
+    """
+    Fill the collection and run searches.
+
+    :param organizations: number of generated organizations.
+    :param limit: organizations on a page.
+    :param pages: pages of every search.
+    :param keep: whether to keep generated organizations.
+    :param reuse: whether to search organizations of a previous run.
+    :return: whether no query scanned the collection.
+    """
+    client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+    await beanie.init_beanie(
+        database=client[settings.db_base],
+        document_models=load_all_models(),  # type: ignore
+    )
+    generated = {"name": {"$regex": f"^{NAME_PREFIX} "}}
+    collection = Organization.get_motor_collection()
+    try:
+        started = time.perf_counter()
+        if not reuse:
+            await fill(organizations)
+        fill_elapsed = time.perf_counter() - started
+        results = [await search(mode, query, limit, pages) for mode, query in SEARCHES]
+    finally:
+        if not keep:
+            await collection.delete_many(generated)
+        client.close()
+
+    collection_scans = [
+        result["query"]
+        for result in results
+        if any("COLLSCAN" in plan["stages"] for plan in result["plans"])
+    ]
+    report(
+        {
+            "benchmark": "organization_search",
+            "organizations": organizations,
+            "fill_s": round(fill_elapsed, 3),
+            "limit": limit,
+            "results": results,
+            "collection_scans": collection_scans,
+        },
+    )
+    return not collection_scans
+
+
+def main() -> None:
+    """Entrypoint of the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--organizations", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument("--reuse", action="store_true")
+    args = parser.parse_args()
+    ok = asyncio.run(
+        run(args.organizations, args.limit, args.pages, args.keep, args.reuse),
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Serialization cost of organization endpoint payloads.
+
+Builds organizations in memory and compares how long it takes to turn
+them into response bytes. Every path builds the response models
+the endpoints send, ``OrganizationResponse``, within the timed call:
+
+* ``jsonable_encoder`` + ujson, as responses were built before;
+* ``jsonable_encoder`` + orjson, the default response class now;
+* ``ModelResponse``, used by the organization endpoints.
+
+Beanie needs a database to be initialized, nothing is written to it::
+
+    IDEANEST_ASSESMENT_DB_HOST=localhost \
+        python -m benchmarks.organization_serialization --organizations 100
+"""
+
+import argparse
+import asyncio
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Union
+
+import beanie
+import orjson
+from beanie import PydanticObjectId
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.utils import percentiles, report
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.models.organization import (
+    MemberUser,
+    Organization,
+    OrganizationMember,
+)
+from ideanest_assesment.settings import settings
+from ideanest_assesment.web.api.organization.schema import OrganizationResponse
+from ideanest_assesment.web.responses import ModelResponse
+
+try:
+    import ujson  # type: ignore
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore
+
+
+def build_organizations(organizations: int, members: int) -> List[Organization]:
+    """
+    Build organizations with members.
+
+    :param organizations: number of organizations.
+    :param members: members in each organization.
+    :return: organizations.
+    """
+    return [
+        Organization(
+            id=PydanticObjectId(),
+            name=f"Organization {number}",
+            description="Organization used to benchmark serialization.",
+            members=[
+                OrganizationMember(
+                    user=MemberUser(
+                        _id=PydanticObjectId(),
+                        name=f"Member {member}",
+                        email=f"member{member}@example.com",
+                    ),
+                    access_level="admin" if member == 0 else "read_only",
+                )
+                for member in range(members)
+            ],
+        )
+        for number in range(organizations)
+    ]
+
+
+Payload = Union[Organization, List[Organization]]
+
+
+def to_response(payload: Payload) -> Any:
+    """Build response models the endpoints send for organizations."""
+    if isinstance(payload, Organization):
+        return OrganizationResponse.from_organization(payload)
+    return [
+        OrganizationResponse.from_organization(organization) for organization in payload
+    ]
+
+
+def encode_ujson(payload: Payload) -> bytes:
+    """Serialize payload the way responses were built before."""
+    return ujson.dumps(jsonable_encoder(to_response(payload))).encode()
+
+
+def encode_orjson(payload: Payload) -> bytes:
+    """Serialize payload the way the default response class does it."""
+    return orjson.dumps(jsonable_encoder(to_response(payload)))
+
+
+def encode_model_response(payload: Payload) -> bytes:
+    """Serialize payload the way the organization endpoints do it."""
+    return ModelResponse(to_response(payload)).body
+
+
+def measure(serialize: Callable[[], bytes], rounds: int) -> dict[str, Any]:
+    """
+    Call serializer several times.
+
+    :param serialize: function producing response body.
+    :param rounds: number of repetitions.
+    :return: body size and timings.
+    """
+    samples = []
+    body = b""
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = serialize()
+        samples.append(time.perf_counter() - started)
+    return {"size_bytes": len(body), "ms": percentiles(samples)}
+
+
+async def run(organizations: int, members: int, rounds: int) -> None:
+    """
+    Compare serialization paths.
+
+    :param organizations: organizations in the list payload.
+    :param members: members in each organization.
+    :param rounds: repetitions per path.
+    """
+    client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+    await beanie.init_beanie(
+        database=client[settings.db_base],
+        document_models=load_all_models(),  # type: ignore
+    )
+    payloads: Dict[str, Payload] = {
+        "get_organization": build_organizations(1, members)[0],
+        "get_all_organizations": build_organizations(organizations, members),
+    }
+
+    results = {}
+    for endpoint, payload in payloads.items():
+        paths = {
+            "jsonable_encoder+orjson": partial(encode_orjson, payload),
+            "model_response": partial(encode_model_response, payload),
+        }
+        if ujson is not None:
+            paths["jsonable_encoder+ujson"] = partial(encode_ujson, payload)
+        results[endpoint] = {
+            name: measure(serialize, rounds) for name, serialize in paths.items()
+        }
+    client.close()
+
+    report(
+        {
+            "benchmark": "organization_serialization",
+            "organizations": organizations,
+            "members": members,
+            "rounds": rounds,
+            "endpoints": results,
+        },
+    )
+
+
+def main() -> None:
+    """Entrypoint of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--organizations", type=int, default=100)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.organizations, args.members, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Size and CPU cost of redis value compression.
+
+Encodes typical organization payloads with every algorithm and reports
+stored size, compression ratio and encode/decode time as JSON.
+With ``--redis`` the values are also written to the configured Redis
+and ``MEMORY USAGE`` of each key is reported::
+
+    IDEANEST_ASSESMENT_REDIS_HOST=localhost \
+        python -m benchmarks.redis_compression --redis
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+from benchmarks.utils import percentiles, report
+from ideanest_assesment.services.redis.codec import ValueCodec
+from ideanest_assesment.settings import RedisCompression, settings
+
+
+def organization_payload(members: int) -> bytes:
+    """
+    Build JSON of an organization with its members.
+
+    :param members: number of members.
+    :return: serialized organization.
+    """
+    return json.dumps(
+        {
+            "organization_id": uuid.uuid4().hex,
+            "name": "Ideanest engineering",
+            "description": "Organization used to benchmark redis compression.",
+            "organization_members": [
+                {
+                    "name": f"Member {number}",
+                    "email": f"member{number}@example.com",
+                    "access_level": "read_only" if number % 3 else "admin",
+                }
+                for number in range(members)
+            ],
+        },
+    ).encode()
+
+
+def measure(
+    codec: ValueCodec,
+    payload: bytes,
+    rounds: int,
+) -> tuple[bytes, dict[str, Any]]:
+    """
+    Encode and decode payload several times.
+
+    :param codec: codec to measure.
+    :param payload: value to encode.
+    :param rounds: number of repetitions.
+    :return: encoded value and timings.
+    """
+    encode_times = []
+    decode_times = []
+    encoded = b""
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encoded = codec.encode(payload)
+        encode_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        codec.decode(encoded)
+        decode_times.append(time.perf_counter() - started)
+    return encoded, {
+        "encode_ms": percentiles(encode_times),
+        "decode_ms": percentiles(decode_times),
+    }
+
+
+async def memory_usage(values: dict[str, bytes]) -> dict[str, Optional[int]]:
+    """
+    Store values in redis and get memory they use.
+
+    :param values: values to store, by key.
+    :return: bytes used by each key.
+    """
+    prefix = f"benchmarks:{uuid.uuid4().hex}"
+    async with Redis.from_url(str(settings.redis_url)) as redis:
+        usage = {}
+        for name, value in values.items():
+            key = f"{prefix}:{name}"
+            await redis.set(key, value)
+            usage[name] = await redis.memory_usage(key)
+            await redis.delete(key)
+    return usage
+
+
+def run(members: int, rounds: int, threshold: int, use_redis: bool) -> None:
+    """
+    Compare compression algorithms on the same payload.
+
+    :param members: number of members in the payload.
+    :param rounds: encode/decode repetitions per algorithm.
+    :param threshold: compression threshold, in bytes.
+    :param use_redis: whether to measure memory usage in redis.
+    """
+    payload = organization_payload(members)
+    results = {}
+    encoded_values = {}
+    for compression in RedisCompression:
+        codec = ValueCodec(compression=compression, threshold=threshold)
+        encoded, timings = measure(codec, payload, rounds)
+        encoded_values[compression.value] = encoded
+        results[compression.value] = {
+            "size_bytes": len(encoded),
+            "ratio": round(len(payload) / len(encoded), 2),
+            **timings,
+        }
+    if use_redis:
+        usage = asyncio.run(memory_usage(encoded_values))
+        for name, used in usage.items():
+            results[name]["redis_memory_bytes"] = used
+
+    report(
+        {
+            "benchmark": "redis_compression",
+            "members": members,
+            "payload_bytes": len(payload),
+            "threshold_bytes": threshold,
+            "rounds": rounds,
+            "algorithms": results,
+        },
+    )
+
+
+def main() -> None:
+    """Entrypoint of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=settings.redis_compression_threshold,
+    )
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+    run(args.members, args.rounds, args.threshold, args.redis)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Throughput of bulk user provisioning.
+
+Creates the same number of users twice and reports users/sec:
+
+* ``signup``, calling ``auth.signup`` per user like the signup endpoint;
+* ``provisioning``, :func:`ideanest_assesment.provisioning.provision_users`
+  with passwords hashed in a process pool and batched inserts.
+
+Users are created in the configured MongoDB and removed afterwards::
+
+    IDEANEST_ASSESMENT_DB_HOST=localhost \
+        python -m benchmarks.user_provisioning --users 500 --workers 8
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import beanie
+from beanie.operators import RegEx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.utils import report
+from ideanest_assesment.auth.auth import signup
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.models.user import User
+from ideanest_assesment.provisioning import provision_users
+from ideanest_assesment.settings import settings
+
+
+def make_rows(prefix: str, users: int) -> List[Dict[str, Any]]:
+    """
+    Build user data.
+
+    :param prefix: prefix of emails, unique per run.
+    :param users: number of users.
+    :return: rows accepted by signup and provisioning.
+    """
+    return [
+        {
+            "name": f"Provisioned {number}",
+            "email": f"{prefix}-{number}@example.com",
+            "password": f"password-{number}",
+        }
+        for number in range(users)
+    ]
+
+
+async def run(users: int, workers: int, batch_size: int) -> None:
+    """
+    Create users with both methods.
+
+    :param users: users created by every method.
+    :param workers: processes hashing passwords.
+    :param batch_size: users inserted at once.
+    """
+    client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+    await beanie.init_beanie(
+        database=client[settings.db_base],
+        document_models=load_all_models(),  # type: ignore
+    )
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    try:
+        started = time.perf_counter()
+        for row in make_rows(f"signup-{run_id}", users):
+            await signup(row)
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "method": "signup",
+                "elapsed_s": round(elapsed, 3),
+                "users_per_s": round(users / elapsed, 1),
+            },
+        )
+
+        rows = make_rows(f"provisioning-{run_id}", users)
+        with ProcessPoolExecutor(workers) as executor:
+            started = time.perf_counter()
+            result = await provision_users(
+                enumerate(rows, start=1),
+                executor,
+                batch_size,
+            )
+            elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "method": "provisioning",
+                "created": result.created,
+                "elapsed_s": round(elapsed, 3),
+                "users_per_s": round(users / elapsed, 1),
+            },
+        )
+    finally:
+        await User.find(RegEx(User.email, f"-{run_id}-")).delete()
+        client.close()
+
+    report(
+        {
+            "benchmark": "user_provisioning",
+            "users": users,
+            "workers": workers,
+            "batch_size": batch_size,
+            "results": results,
+        },
+    )
+
+
+def main() -> None:
+    """Entrypoint of the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.workers, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import json
+import sys
+from typing import Any, Sequence
+
+
+def percentiles(samples: Sequence[float]) -> dict[str, float]:
+    """
+    Summarize latency samples.
+
+    :param samples: latencies in seconds.
+    :return: p50/p95/p99 and max in milliseconds.
+    """
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def report(result: dict[str, Any]) -> None:
+    """
+    Print benchmark result as a single JSON document.
+
+    :param result: benchmark result.
+    """
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
@@ -1,15 +1,60 @@
+import os
+import shutil
+
 import uvicorn
 
-from ideanest_assesment.gunicorn_runner import GunicornApplication
+from ideanest_assesment.gunicorn_runner import (
+    GunicornApplication,
+    cpu_limit,
+    memory_limit,
+    on_worker_exit,
+    workers_for,
+)
 from ideanest_assesment.settings import settings
 
 
+def set_multiproc_dir() -> None:
+    """
+    Sets PROMETHEUS_MULTIPROC_DIR env variable.
+
+    This function cleans up the multiprocess directory
+    and recreates it. Workers write their metrics to files
+    in this directory, so any worker can serve metrics
+    of all of them. Files left by a previous run would be
+    counted as well, so the directory is emptied on start.
+
+    The variable must be set before prometheus-client
+    is imported, because it chooses how to store values on import.
+    """
+    shutil.rmtree(settings.prometheus_dir, ignore_errors=True)
+    settings.prometheus_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(
+        settings.prometheus_dir.expanduser().absolute(),
+    )
+
+
+def get_workers_count() -> int:
+    """
+    Get the number of workers.
+
+    Unless set explicitly, it's chosen from CPUs and memory
+    available to the container.
+
+    :return: number of workers.
+    """
+    if settings.workers_count:
+        return settings.workers_count
+    return workers_for(cpu_limit(), memory_limit(), settings.worker_max_rss)
+
+
 def main() -> None:
     """Entrypoint of the application."""
+    set_multiproc_dir()
+    workers = get_workers_count()
     if settings.reload:
         uvicorn.run(
             "ideanest_assesment.web.application:get_app",
-            workers=settings.workers_count,
+            workers=workers,
             host=settings.host,
             port=settings.port,
             reload=settings.reload,
@@ -24,11 +69,17 @@ def main() -> None:
             "ideanest_assesment.web.application:get_app",
             host=settings.host,
             port=settings.port,
-            workers=settings.workers_count,
+            workers=workers,
+            max_worker_rss=settings.worker_max_rss,
+            rss_check_interval=settings.worker_rss_check_interval,
+            recycle_interval=settings.worker_recycle_interval,
+            max_requests=settings.worker_max_requests,
+            max_requests_jitter=settings.worker_max_requests_jitter,
             factory=True,
             accesslog="-",
             loglevel=settings.log_level.value.lower(),
             access_log_format='%r "-" %s "-" %Tf',
+            child_exit=on_worker_exit,
         ).run()
 
 
@@ -4,10 +4,12 @@ from typing import Dict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from redis.asyncio import ConnectionPool, Redis
+from pymongo.errors import DuplicateKeyError
+from redis.asyncio import Redis
 
+from ideanest_assesment.auth.known_emails import KnownEmails
 from ideanest_assesment.db.models.user import User, pwd_context
-from ideanest_assesment.services.redis.dependency import get_redis_pool
+from ideanest_assesment.services.redis.dependency import get_redis
 from ideanest_assesment.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/token")
@@ -17,6 +19,8 @@ ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 REFRESH_TOKEN_EXPIRE_MINUTES = settings.refresh_token_expire_minutes
 
+known_emails = KnownEmails(settings.known_emails_cache_size)
+
 
 def create_access_token(data: Dict, expires_delta: timedelta | None = None) -> str:
     """
@@ -145,6 +149,10 @@ async def signup(user_data: dict) -> Dict:
     """
     Create a new user account.
 
+    The unique index on emails rejects registered emails in the same
+    round-trip as the insert. Emails this worker already knows are
+    rejected before the password is hashed.
+
     Args:
         user_data (UserCreate): The user registration data.
 
@@ -154,23 +162,32 @@ async def signup(user_data: dict) -> Dict:
     Raises:
         HTTPException: If a user with the provided email already exists.
     """
-    existing_user = await User.find_one(User.email == user_data.get("email"))
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+    email = user_data["email"]
+    already_registered = HTTPException(
+        status_code=400,
+        detail="Email already registered",
+    )
+    if email in known_emails:
+        raise already_registered
 
     hashed_password = pwd_context.hash(user_data.get("password"))
     new_user = User(
         name=user_data.get("name"),
-        email=user_data.get("email"),
+        email=email,
         hashed_password=hashed_password,
     )
-    await new_user.create()
+    try:
+        await new_user.create()
+    except DuplicateKeyError:
+        known_emails.add(email)
+        raise already_registered from None
+    known_emails.add(email)
     return {"message": "User created successfully"}
 
 
 async def new_refresh_token(
     refresh_token: str,
-    redis_pool: ConnectionPool = Depends(get_redis_pool),
+    redis: Redis = Depends(get_redis),
 ):
     """Refresh an access token."""
     credentials_exception = HTTPException(
@@ -191,8 +208,7 @@ async def new_refresh_token(
         raise credentials_exception
 
     # Check if the refresh token has been revoked
-    async with Redis(connection_pool=redis_pool) as redis:
-        revoked = await redis.exists(f"revoked_token:{refresh_token}")
+    revoked = await redis.exists(f"revoked_token:{refresh_token}")
     if revoked:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -221,7 +237,7 @@ async def new_refresh_token(
 async def revoke_refresh_token(
     refresh_token: str,
     current_user: User,
-    redis_pool: ConnectionPool = Depends(get_redis_pool),
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     """Revoke a refresh token."""
     try:
@@ -238,11 +254,10 @@ async def revoke_refresh_token(
             detail="Invalid refresh token",
         )
 
-    async with Redis(connection_pool=redis_pool) as redis:
-        # Store the refresh token in Redis with an expiration time
-        await redis.set(
-            f"revoked_token:{refresh_token}",
-            1,
-            ex=REFRESH_TOKEN_EXPIRE_MINUTES * 60,
-        )
+    # Store the refresh token in Redis with an expiration time
+    await redis.set(
+        f"revoked_token:{refresh_token}",
+        1,
+        ex=REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+    )
     return {"message": "Refresh token revoked"}
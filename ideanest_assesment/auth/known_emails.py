@@ -0,0 +1,33 @@
+from typing import Dict
+
+
+class KnownEmails:
+    """
+    Emails known to be registered, remembered by a worker.
+
+    Users are never deleted, so a remembered email stays registered
+    and signups with it can be rejected before hashing the password
+    or asking the database. An email missing here may still be
+    registered, the unique index of users decides. The oldest emails
+    are forgotten when the set is full.
+    """
+
+    def __init__(self, maxsize: int = 100000) -> None:
+        self.maxsize = maxsize
+        # Dicts keep insertion order, so the first key is the oldest.
+        self._emails: Dict[str, None] = {}
+
+    def __contains__(self, email: object) -> bool:
+        return email in self._emails
+
+    def add(self, email: str) -> None:
+        """
+        Remember a registered email.
+
+        :param email: the email.
+        """
+        if email in self._emails:
+            return
+        if len(self._emails) >= self.maxsize:
+            del self._emails[next(iter(self._emails))]
+        self._emails[email] = None
@@ -1,13 +1,79 @@
+import base64
+import binascii
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Optional
+
+import orjson
+from beanie import PydanticObjectId
+from beanie.exceptions import RevisionIdWasChanged
+from beanie.odm.enums import SortDirection
+from beanie.operators import In
 from fastapi import HTTPException
 
-from ideanest_assesment.db.models.organization import Organization, OrganizationMember
+from ideanest_assesment.db.dao.outbox_dao import OutboxDAO
+from ideanest_assesment.db.models.organization import (
+    NAME_COLLATION,
+    MemberUser,
+    Organization,
+    OrganizationMember,
+    OrganizationPage,
+    OrganizationRevision,
+    SearchMode,
+)
+from ideanest_assesment.db.models.outbox import OutboxMessage
 from ideanest_assesment.db.models.user import User
+from ideanest_assesment.services.roles.cache import RoleCache
 from ideanest_assesment.services.tasks.send_email import send_invitation_email
-from ideanest_assesment.web.api.organization.schema import (
-    OrganizationCreate,
-    OrganizationInvite,
-    OrganizationUpdate,
-)
+
+if TYPE_CHECKING:
+    # The web package imports this module, so schemas are imported
+    # only for type checking to let the DAO be imported on its own.
+    from ideanest_assesment.web.api.organization.schema import (
+        OrganizationCreate,
+        OrganizationInvite,
+        OrganizationUpdate,
+    )
+
+CONFLICT_DETAIL = "Organization was changed by another request, try again"
+# Sorts after all other characters in collations, so names from
+# "<prefix>" up to "<prefix>\uffff" are exactly the names starting with it.
+COLLATION_MAX = "\uffff"
+
+
+def encode_cursor(sort_key: List[Any]) -> str:
+    """
+    Encode sort key of the last organization on a page.
+
+    :param sort_key: values of sort fields.
+    :return: opaque cursor.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(sort_key)).decode()
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """
+    Decode cursor of a page.
+
+    :param cursor: cursor made by :func:`encode_cursor`.
+    :param length: number of sort fields of the search.
+    :return: values of sort fields.
+    :raises HTTPException: if the cursor is malformed.
+    """
+    try:
+        sort_key = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError):
+        sort_key = None
+    if (
+        not isinstance(sort_key, list)
+        or len(sort_key) != length
+        or not PydanticObjectId.is_valid(sort_key[-1])
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    sort_key[-1] = PydanticObjectId(sort_key[-1])
+    return sort_key
+
+
+def _object_ids(organization_ids: Collection[str]) -> List[PydanticObjectId]:
+    return [PydanticObjectId(organization_id) for organization_id in organization_ids]
 
 
 class OrganizationDAO:
@@ -20,8 +86,9 @@ class OrganizationDAO:
     @classmethod
     async def create_organization(
         cls,
-        organization_data: OrganizationCreate,
+        organization_data: "OrganizationCreate",
         current_user: User,
+        role_cache: RoleCache,
     ) -> Organization:
         """
         Create a new organization.
@@ -29,6 +96,7 @@ class OrganizationDAO:
         Args:
             organization_data (OrganizationCreate): The data for the new organization.
             current_user (User): The user creating the organization.
+            role_cache (RoleCache): The cache granted the admin role.
 
         Returns:
             OrganizationResponse: The created organization.
@@ -36,9 +104,13 @@ class OrganizationDAO:
         organization = Organization(**organization_data.model_dump())
         # Add the creator as the first admin member
         organization.members.append(
-            OrganizationMember(user=current_user, access_level="admin"),
+            OrganizationMember(
+                user=MemberUser.from_user(current_user),
+                access_level="admin",
+            ),
         )
         await organization.create()
+        await role_cache.set(current_user.id, organization.id, "admin")  # type: ignore
         return organization
 
     @classmethod
@@ -61,20 +133,178 @@ class OrganizationDAO:
         return organization
 
     @classmethod
-    async def get_all_organizations(cls) -> list[Organization]:
+    async def get_organization_revision(
+        cls,
+        organization_id: str,
+    ) -> OrganizationRevision:
+        """
+        Retrieve only the revision of an organization.
+
+        Args:
+            organization_id (str): The ID of the organization.
+
+        Returns:
+            OrganizationRevision: The ID and revision of the organization.
+
+        Raises:
+            HTTPException: If the organization is not found.
+        """
+        revision = None
+        if PydanticObjectId.is_valid(organization_id):
+            revision = await Organization.find_one(
+                Organization.id == PydanticObjectId(organization_id),
+                projection_model=OrganizationRevision,
+            )
+        if not revision:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        return revision
+
+    @classmethod
+    async def get_all_organization_revisions(
+        cls,
+        organization_ids: Collection[str],
+    ) -> list[OrganizationRevision]:
+        """
+        Retrieve only the revisions of organizations.
+
+        Args:
+            organization_ids (Collection[str]): The IDs of the organizations.
+
+        Returns:
+            list[OrganizationRevision]: IDs and revisions, in the order
+                of `get_all_organizations`.
+        """
+        return await Organization.find(
+            In(Organization.id, _object_ids(organization_ids)),
+            projection_model=OrganizationRevision,
+            sort=[("_id", SortDirection.ASCENDING)],
+        ).to_list()
+
+    @classmethod
+    async def get_all_organizations(
+        cls,
+        organization_ids: Collection[str],
+    ) -> list[Organization]:
+        """
+        Retrieve organizations by IDs.
+
+        Args:
+            organization_ids (Collection[str]): The IDs of the organizations.
+
+        Returns:
+            list[Organization]: The organizations, in the order of IDs.
+        """
+        return await Organization.find(
+            In(Organization.id, _object_ids(organization_ids)),
+            sort=[("_id", SortDirection.ASCENDING)],
+        ).to_list()
+
+    @classmethod
+    def search_query(
+        cls,
+        query: str,
+        mode: SearchMode,
+        cursor: Optional[str] = None,
+        organization_ids: Optional[Collection[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build arguments of ``find`` searching organizations.
+
+        Prefix search scans a range of the ``name_search`` index, it's
+        used only when the query has the same collation as the index.
+        Keyword search uses the ``text_search`` index. Pages are
+        continued after the sort key of the last organization,
+        so deep pages cost as much as the first one.
+
+        Args:
+            query (str): The beginning of names or keywords.
+            mode (SearchMode): How to search.
+            cursor (str, optional): The cursor of the page to get.
+            organization_ids (Collection[str], optional): The IDs of
+                organizations to search in, all organizations by default.
+
+        Returns:
+            Dict[str, Any]: The filter, sort and collation of the search.
+        """
+        ids: Dict[str, Any] = {}
+        if organization_ids is not None:
+            ids["$in"] = _object_ids(organization_ids)
+        if mode == SearchMode.prefix:
+            filter_: Dict[str, Any] = {
+                "name": {"$gte": query, "$lt": query + COLLATION_MAX},
+            }
+            if ids:
+                filter_["_id"] = ids
+            if cursor:
+                name, last_id = decode_cursor(cursor, 2)
+                # Names equal ignoring case are ordered by id.
+                filter_["$or"] = [
+                    {"name": {"$gt": name}},
+                    {"name": name, "_id": {"$gt": last_id}},
+                ]
+            return {
+                "filter": filter_,
+                "sort": [("name", 1), ("_id", 1)],
+                "collation": NAME_COLLATION,
+            }
+
+        filter_ = {"$text": {"$search": query}}
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            ids["$gt"] = last_id
+        if ids:
+            filter_["_id"] = ids
+        return {"filter": filter_, "sort": [("_id", 1)]}
+
+    @classmethod
+    async def search_organizations(
+        cls,
+        query: str,
+        mode: SearchMode,
+        limit: int,
+        cursor: Optional[str] = None,
+        organization_ids: Optional[Collection[str]] = None,
+    ) -> OrganizationPage:
         """
-        Retrieve all organizations.
+        Search organizations.
+
+        Args:
+            query (str): The beginning of names or keywords.
+            mode (SearchMode): How to search.
+            limit (int): The maximum number of organizations on the page.
+            cursor (str, optional): The cursor of the page to get.
+            organization_ids (Collection[str], optional): The IDs of
+                organizations to search in, all organizations by default.
 
         Returns:
-            list[OrganizationResponse]: A list of all organizations.
+            OrganizationPage: Found organizations and the cursor of the next page.
+
+        Raises:
+            HTTPException: If the cursor is malformed.
         """
-        return await Organization.find_all().to_list()
+        search = cls.search_query(query, mode, cursor, organization_ids)
+        organizations = await Organization.find(
+            search["filter"],
+            sort=search["sort"],
+            # One more to know whether there is a next page.
+            limit=limit + 1,
+            collation=search.get("collation"),
+        ).to_list()
+        next_cursor = None
+        if len(organizations) > limit:
+            organizations = organizations[:limit]
+            last = organizations[-1]
+            sort_key: List[Any] = [str(last.id)]
+            if mode == SearchMode.prefix:
+                sort_key.insert(0, last.name)
+            next_cursor = encode_cursor(sort_key)
+        return OrganizationPage(items=organizations, next_cursor=next_cursor)
 
     @classmethod
     async def update_organization(
         cls,
         organization_id: str,
-        organization_data: OrganizationUpdate,
+        organization_data: "OrganizationUpdate",
     ) -> Organization:
         """
         Update an organization.
@@ -85,32 +315,66 @@ class OrganizationDAO:
 
         Returns:
             Organization: The updated organization.
+
+        Raises:
+            HTTPException: If the organization was changed concurrently.
         """
         organization = await cls.get_organization(organization_id)
         update_data = organization_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(organization, key, value)
-        await organization.save()
+        try:
+            await organization.save()
+        except RevisionIdWasChanged:
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL) from None
         return organization
 
     @classmethod
-    async def delete_organization(cls, organization_id: str) -> None:
+    async def delete_organization(
+        cls,
+        organization_id: str,
+        role_cache: RoleCache,
+    ) -> None:
         """
         Delete an organization.
 
         Args:
             organization_id (str): The ID of the organization to delete.
+            role_cache (RoleCache): The cache revoking roles of members.
         """
         organization = await cls.get_organization(organization_id)
         await organization.delete()
+        for member in organization.members:
+            await role_cache.set(
+                member.user.id,
+                organization.id,  # type: ignore
+                None,
+            )
 
     @classmethod
     async def invite_user(
         cls,
         organization_id: str,
-        invite_data: OrganizationInvite,
+        invite_data: "OrganizationInvite",
         current_user: User,
-    ):
+        role_cache: RoleCache,
+    ) -> None:
+        """
+        Add a user to an organization and send them an invitation email.
+
+        The email is written to the outbox together with the membership
+        change and is published to celery by the outbox relay.
+
+        Args:
+            organization_id (str): The ID of the organization.
+            invite_data (OrganizationInvite): The email of the user to invite.
+            current_user (User): The user sending the invitation.
+            role_cache (RoleCache): The cache granted the member role.
+
+        Raises:
+            HTTPException: If the user is not found or is already a member,
+                or the organization was changed concurrently.
+        """
         organization = await cls.get_organization(organization_id)
 
         # Check if the user to be invited exists
@@ -135,12 +399,17 @@ class OrganizationDAO:
         # Add the invited user to the organization's members list
         organization.members.append(
             OrganizationMember(
-                user=invited_user, access_level="member",
+                user=MemberUser.from_user(invited_user), access_level="member",
             )
         )
-        await organization.save()
-        send_invitation_email.delay(
-            organization.name, invited_user.email, current_user.email
+        message = OutboxMessage(
+            task_name=send_invitation_email.name,
+            args=[organization.name, invited_user.email, current_user.email],
         )
+        try:
+            await OutboxDAO().save_with_message(organization, message)
+        except RevisionIdWasChanged:
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL) from None
+        await role_cache.set(invited_user.id, organization.id, "member")  # type: ignore
 
 
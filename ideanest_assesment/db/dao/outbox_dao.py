@@ -0,0 +1,168 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Type
+
+from beanie import PydanticObjectId
+from beanie.operators import In
+from bson import Binary
+from pymongo.errors import BulkWriteError
+
+from ideanest_assesment.db.models.outbox import (
+    OutboxDocument,
+    OutboxMessage,
+    OutboxStatus,
+)
+
+# Longest delay between two delivery attempts, in seconds.
+MAX_RETRY_DELAY = 300
+# Error code of unique index violations.
+DUPLICATE_KEY = 11000
+
+
+class OutboxDAO:
+    """Class for accessing outbox collection."""
+
+    async def save_with_message(
+        self,
+        document: OutboxDocument,
+        message: OutboxMessage,
+    ) -> None:
+        """
+        Save a document together with an outbox message.
+
+        The message is kept in the document, so both are written
+        by one atomic write without transactions. The relay moves it
+        to the outbox with :meth:`collect`.
+
+        :param document: changed document.
+        :param message: message caused by the change.
+        """
+        message.id = PydanticObjectId()
+        document.outbox.append(message.model_dump(by_alias=True))
+        await document.save()
+
+    async def collect(self, model: Type[OutboxDocument], limit: int) -> int:
+        """
+        Move messages kept in documents to the outbox.
+
+        Messages keep their ids, so a move interrupted after the insert
+        is finished by the next call without duplicates. Removing
+        messages sets a new revision, so a document saved from
+        a stale copy can't bring them back.
+
+        :param model: model of documents keeping messages.
+        :param limit: maximum number of documents to take messages from.
+        :return: number of moved messages.
+        """
+        collection = model.get_motor_collection()
+        outbox = OutboxMessage.get_motor_collection()
+        moved = 0
+        documents = collection.find(
+            {"outbox._id": {"$exists": True}},
+            {"outbox": 1},
+            limit=limit,
+        )
+        async for document in documents:
+            messages = document["outbox"]
+            try:
+                await outbox.insert_many(messages, ordered=False)
+            except BulkWriteError as exc:
+                errors = exc.details["writeErrors"]
+                if any(error["code"] != DUPLICATE_KEY for error in errors):
+                    raise
+            update: Dict[str, Any] = {
+                "$pull": {
+                    "outbox": {"_id": {"$in": [msg["_id"] for msg in messages]}},
+                },
+            }
+            if model.get_settings().use_revision:
+                update["$set"] = {"revision_id": Binary.from_uuid(uuid.uuid4())}
+            await collection.update_one({"_id": document["_id"]}, update)
+            moved += len(messages)
+        return moved
+
+    async def claim_batch(self, limit: int, lease: timedelta) -> List[OutboxMessage]:
+        """
+        Claim messages that are ready to be published.
+
+        Messages stay claimed for the lease time. Claims of a relay
+        that died are taken over once their lease expires.
+
+        :param limit: maximum number of messages to claim.
+        :param lease: how long the claim is valid.
+        :return: claimed messages.
+        """
+        now = datetime.utcnow()
+        claimable: Dict[str, Any] = {
+            "$or": [
+                {
+                    "status": OutboxStatus.PENDING.value,
+                    "available_at": {"$lte": now},
+                },
+                {
+                    "status": OutboxStatus.CLAIMED.value,
+                    "claimed_until": {"$lte": now},
+                },
+            ],
+        }
+        collection = OutboxMessage.get_motor_collection()
+        cursor = collection.find(claimable, {"_id": 1})
+        ids = [doc["_id"] async for doc in cursor.sort("available_at").limit(limit)]
+        if not ids:
+            return []
+
+        claim = uuid.uuid4().hex
+        await collection.update_many(
+            {"_id": {"$in": ids}, **claimable},
+            {
+                "$set": {
+                    "status": OutboxStatus.CLAIMED.value,
+                    "claimed_by": claim,
+                    "claimed_until": now + lease,
+                },
+                "$inc": {"attempts": 1},
+            },
+        )
+        # Looked up by ids to use the _id index, messages another relay
+        # claimed first don't have this claim.
+        return await OutboxMessage.find(
+            In(OutboxMessage.id, ids),
+            OutboxMessage.claimed_by == claim,
+        ).to_list()
+
+    async def ack(self, ids: List[PydanticObjectId]) -> None:
+        """
+        Delete published messages.
+
+        :param ids: ids of published messages.
+        """
+        if ids:
+            await OutboxMessage.find(In(OutboxMessage.id, ids)).delete()
+
+    async def release(
+        self,
+        message: OutboxMessage,
+        error: str,
+        max_attempts: int,
+    ) -> None:
+        """
+        Return a message that couldn't be published.
+
+        The message is retried with exponential backoff
+        until it runs out of attempts.
+
+        :param message: claimed message.
+        :param error: reason of the failure.
+        :param max_attempts: attempts before the message is given up.
+        """
+        update: Dict[str, Any] = {"claimed_by": None, "last_error": error}
+        if message.attempts >= max_attempts:
+            update["status"] = OutboxStatus.FAILED.value
+        else:
+            delay = min(2**message.attempts, MAX_RETRY_DELAY)
+            update["status"] = OutboxStatus.PENDING.value
+            update["available_at"] = datetime.utcnow() + timedelta(seconds=delay)
+        await OutboxMessage.get_motor_collection().update_one(
+            {"_id": message.id, "claimed_by": message.claimed_by},
+            {"$set": update},
+        )
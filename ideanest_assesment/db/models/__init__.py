@@ -6,6 +6,7 @@ from beanie import Document
 
 from ideanest_assesment.db.models.dummy_model import DummyModel
 from ideanest_assesment.db.models.organization import Organization
+from ideanest_assesment.db.models.outbox import OutboxMessage
 from ideanest_assesment.db.models.user import User
 
 
@@ -15,4 +16,5 @@ def load_all_models() -> Sequence[Type[Document]]:
         DummyModel,
         User,
         Organization,
+        OutboxMessage,
     ]
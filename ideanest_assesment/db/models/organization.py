@@ -1,18 +1,49 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
 
-from beanie import Document, Indexed, Link
-from pydantic import BaseModel
+from beanie import Indexed, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.collation import Collation, CollationStrength
 
+from ideanest_assesment.db.models.outbox import PENDING_OUTBOX_INDEX, OutboxDocument
 from ideanest_assesment.db.models.user import User
 
+# Compares names ignoring case, used to search organizations by name.
+NAME_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+
+class MemberUser(BaseModel):
+    """
+    User of a member, stored in the organization.
+
+    Only the id and the fields shown with members are kept,
+    credentials of users never reach organizations.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    email: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "MemberUser":
+        """
+        Take the stored fields of a user.
+
+        :param user: saved user.
+        :return: the member user.
+        """
+        return cls(_id=user.id, name=user.name, email=user.email)  # type: ignore
+
 
 class OrganizationMember(BaseModel):
     """Represents a member of an organization."""
 
-    user: Link[User]
+    user: MemberUser
     access_level: str
 
-class Organization(Document):
+class Organization(OutboxDocument):
     """Represents an organization."""
 
     name: Indexed(str, unique=True)
@@ -21,3 +52,46 @@ class Organization(Document):
 
     class Settings:
         name = "organizations"
+        # Every write through beanie sets a new revision, it's used as ETag.
+        use_revision = True
+        indexes = [  # noqa: RUF012
+            # Prefix search by name, queries must use NAME_COLLATION.
+            IndexModel(
+                [("name", ASCENDING), ("_id", ASCENDING)],
+                name="name_search",
+                collation=NAME_COLLATION,
+            ),
+            # Keyword search, matches in names weigh more.
+            IndexModel(
+                [("name", TEXT), ("description", TEXT)],
+                name="text_search",
+                weights={"name": 10, "description": 1},
+            ),
+            # Organizations of a user.
+            IndexModel([("members.user._id", ASCENDING)], name="members_user"),
+            PENDING_OUTBOX_INDEX,
+        ]
+
+
+class OrganizationRevision(BaseModel):
+    """Projection of an organization to its revision."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    revision_id: Optional[UUID] = None
+
+
+class SearchMode(str, Enum):
+    """How organizations are searched."""
+
+    # Names starting with the query, ignoring case, ordered by name.
+    prefix = "prefix"
+    # Names and descriptions with words of the query, in creation order.
+    text = "text"
+
+
+class OrganizationPage(BaseModel):
+    """Page of organizations found by a search."""
+
+    items: List[Organization]
+    # Cursor of the next page, None on the last page.
+    next_cursor: Optional[str] = None
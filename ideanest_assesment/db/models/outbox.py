@@ -0,0 +1,79 @@
+import enum
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from beanie import Document
+from opentelemetry import propagate
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class OutboxStatus(str, enum.Enum):
+    """Delivery states of an outbox message."""
+
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    FAILED = "failed"
+
+
+def current_trace_context() -> Dict[str, str]:
+    """
+    Serialize the current trace context.
+
+    :return: W3C trace context headers, empty when nothing is traced.
+    """
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+class OutboxMessage(Document):
+    """
+    Celery task waiting to be published.
+
+    Messages are kept in the document whose change caused them, see
+    :class:`OutboxDocument`, moved here and published by the outbox relay.
+    Published messages are deleted.
+    """
+
+    task_name: str
+    args: List[Any] = Field(default_factory=list)
+    kwargs: Dict[str, Any] = Field(default_factory=dict)
+    options: Dict[str, Any] = Field(default_factory=dict)
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    claimed_by: Optional[str] = None
+    claimed_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    # Trace of the request that wrote the message, publishing continues it.
+    trace_context: Dict[str, str] = Field(default_factory=current_trace_context)
+
+    class Settings:
+        name = "outbox"
+        indexes = [  # noqa: RUF012
+            IndexModel([("status", ASCENDING), ("available_at", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("claimed_until", ASCENDING)]),
+        ]
+
+
+class OutboxDocument(Document):
+    """
+    Document keeping outbox messages caused by its changes.
+
+    A change and its messages are saved by one single-document write,
+    which is atomic on a standalone mongod too. The outbox relay moves
+    messages to the ``outbox`` collection, models need a
+    :data:`PENDING_OUTBOX_INDEX` to be found quickly.
+    """
+
+    # Raw OutboxMessage documents waiting to be moved.
+    outbox: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+# Index of documents with messages waiting to be moved.
+PENDING_OUTBOX_INDEX = IndexModel(
+    [("outbox._id", ASCENDING)],
+    name="pending_outbox",
+    partialFilterExpression={"outbox._id": {"$exists": True}},
+)
@@ -5,6 +5,19 @@ from pydantic import EmailStr
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def hash_password(password: str) -> str:
+    """
+    Hash a password.
+
+    Unlike ``pwd_context.hash`` it can be pickled, so passwords
+    can be hashed in a process pool.
+
+    :param password: plain text password.
+    :return: hashed password.
+    """
+    return pwd_context.hash(password)
+
+
 class User(Document):
     """Represents the User Model in the database."""
 
@@ -0,0 +1,152 @@
+import contextlib
+import logging
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Union
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Longest lists and deepest documents rendered in query shapes.
+SHAPE_MAX_ITEMS = 10
+SHAPE_MAX_DEPTH = 6
+
+
+@dataclass
+class CommandStats:
+    """Number and duration of MongoDB commands of one request."""
+
+    commands: int = 0
+    duration: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, duration: float) -> None:
+        """
+        Account a finished command.
+
+        Commands finish in motor's threads, possibly several at once.
+
+        :param duration: duration of the command in seconds.
+        """
+        with self._lock:
+            self.commands += 1
+            self.duration += duration
+
+
+# Statistics of the current request, None outside of requests.
+command_stats: ContextVar[Optional[CommandStats]] = ContextVar(
+    "command_stats",
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def track_commands() -> Iterator[CommandStats]:
+    """
+    Account MongoDB commands run in the current context.
+
+    Motor copies the context to the threads running commands,
+    so commands started inside the block are attributed to it.
+
+    :yield: statistics filled as commands finish.
+    """
+    stats = CommandStats()
+    token = command_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        command_stats.reset(token)
+
+
+def query_shape(value: Any, depth: int = 0) -> Any:
+    """
+    Replace values of a query with placeholders.
+
+    Field names and operators are kept, so queries differing only
+    in values have the same shape, and no data gets into logs.
+
+    >>> query_shape({"email": "a@b.c", "age": {"$gt": 18}})
+    {'email': '?', 'age': {'$gt': '?'}}
+
+    :param value: filter, pipeline or a part of them.
+    :param depth: nesting level of the value.
+    :return: shape of the value.
+    """
+    if depth >= SHAPE_MAX_DEPTH:
+        return "..."
+    if isinstance(value, Mapping):
+        return {key: query_shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if not any(isinstance(item, Mapping) for item in value):
+            return "?"
+        return [query_shape(item, depth + 1) for item in value[:SHAPE_MAX_ITEMS]]
+    return "?"
+
+
+def command_filter(command: Mapping[str, Any]) -> Any:
+    """
+    Get the part of a command selecting documents.
+
+    :param command: MongoDB command.
+    :return: filter, pipeline or None for commands without them.
+    """
+    for key in ("filter", "pipeline", "query"):
+        if key in command:
+            return command[key]
+    for key in ("updates", "deletes"):
+        statements = command.get(key)
+        if statements:
+            return statements[0].get("q")
+    return None
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    Times MongoDB commands.
+
+    Durations are added to the statistics of the current request,
+    see :func:`track_commands`. Commands slower than ``slow_threshold``
+    seconds are logged with the shape of their filter.
+    """
+
+    def __init__(self, slow_threshold: float) -> None:
+        self._slow_threshold = slow_threshold
+        # Started commands, to log the filter when they turn out slow.
+        self._started: Dict[Tuple[int, Any], Mapping[str, Any]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remember started command."""
+        self._started[event.request_id, event.connection_id] = event.command
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Account succeeded command."""
+        self._finished(event, "succeeded")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Account failed command."""
+        self._finished(event, "failed")
+
+    def _finished(
+        self,
+        event: Union[monitoring.CommandSucceededEvent, monitoring.CommandFailedEvent],
+        outcome: str,
+    ) -> None:
+        command = self._started.pop((event.request_id, event.connection_id), {})
+        duration = event.duration_micros / 1_000_000
+        stats = command_stats.get()
+        if stats is not None:
+            stats.record(duration)
+        if duration < self._slow_threshold:
+            return
+        collection = command.get(event.command_name)
+        logger.warning(
+            "Slow MongoDB command %s on %s.%s %s in %.1f ms, filter %s",
+            event.command_name,
+            event.database_name,
+            collection if isinstance(collection, str) else "-",
+            outcome,
+            duration * 1000,
+            query_shape(command_filter(command)),
+        )
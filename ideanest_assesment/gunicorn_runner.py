@@ -1,6 +1,14 @@
-from typing import Any
+import contextlib
+import math
+import mmap
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
 
 from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
 from gunicorn.util import import_app
 from uvicorn.workers import UvicornWorker as BaseUvicornWorker
 
@@ -28,6 +36,200 @@ class UvicornWorker(BaseUvicornWorker):
     }
 
 
+# Control groups of the container, both v2 and v1 layouts are read.
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# v1 reports a huge number when memory isn't limited.
+UNLIMITED_MEMORY = 1 << 60
+
+
+def _read_int(path: Path, field: int = 0) -> Optional[int]:
+    try:
+        return int(path.read_text().split()[field])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> float:
+    """
+    Get the number of CPUs the process may use.
+
+    CFS quota of the container is respected,
+    so a container limited to 1.5 CPUs on a 64 core host gets 1.5.
+
+    :param cgroup_root: mount point of control groups.
+    :return: number of CPUs, possibly fractional.
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:  # pragma: no cover
+        cpus = float(os.cpu_count() or 1)
+
+    try:
+        quota, period = (cgroup_root / "cpu.max").read_text().split()
+        if quota != "max":
+            return min(cpus, int(quota) / int(period))
+    except (OSError, ValueError):
+        v1_quota = _read_int(cgroup_root / "cpu" / "cpu.cfs_quota_us")
+        v1_period = _read_int(cgroup_root / "cpu" / "cpu.cfs_period_us")
+        if v1_quota and v1_quota > 0 and v1_period:
+            return min(cpus, v1_quota / v1_period)
+    return cpus
+
+
+def memory_limit(cgroup_root: Path = CGROUP_ROOT) -> Optional[int]:
+    """
+    Get memory available to the process.
+
+    :param cgroup_root: mount point of control groups.
+    :return: memory limit of the container or physical memory,
+        in bytes, None if unknown.
+    """
+    limits = [
+        _read_int(cgroup_root / "memory.max"),
+        _read_int(cgroup_root / "memory" / "memory.limit_in_bytes"),
+    ]
+    with contextlib.suppress(AttributeError, ValueError, OSError):
+        limits.append(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    known = [limit for limit in limits if limit and limit < UNLIMITED_MEMORY]
+    return min(known, default=None)
+
+
+def workers_for(cpus: float, memory: Optional[int], worker_memory: int) -> int:
+    """
+    Choose the number of workers.
+
+    Async workers keep a CPU busy on their own, so there is one
+    per CPU, as many as fit into memory with ``worker_memory`` each.
+
+    :param cpus: number of available CPUs.
+    :param memory: available memory in bytes, None if unknown.
+    :param worker_memory: memory a worker may take, in bytes.
+    :return: number of workers, at least one.
+    """
+    workers = math.ceil(cpus)
+    if memory is not None and worker_memory > 0:
+        workers = min(workers, memory // worker_memory)
+    return max(workers, 1)
+
+
+def worker_rss(pid: int) -> Optional[int]:
+    """
+    Get resident memory of a process.
+
+    :param pid: id of the process.
+    :return: RSS in bytes, None if it can't be read, e.g. outside of Linux.
+    """
+    # The second field of statm is the number of resident pages.
+    pages = _read_int(Path(f"/proc/{pid}/statm"), 1)
+    if pages is None:
+        return None
+    return pages * mmap.PAGESIZE
+
+
+def select_worker_to_recycle(rss: Dict[int, int], max_rss: int) -> Optional[int]:
+    """
+    Choose a worker to recycle.
+
+    :param rss: resident memory of workers by pid.
+    :param max_rss: memory a worker may take, in bytes.
+    :return: pid of the largest worker over the limit, if any.
+    """
+    over_limit = {pid: size for pid, size in rss.items() if size > max_rss}
+    if not over_limit:
+        return None
+    return max(over_limit, key=over_limit.__getitem__)
+
+
+def _metrics() -> Any:
+    # Imported here, so the main process imports prometheus-client
+    # only after PROMETHEUS_MULTIPROC_DIR is set.
+    from ideanest_assesment.services.metrics import metrics  # (Found nested import)
+
+    return metrics
+
+
+def on_worker_exit(server: Arbiter, worker: BaseUvicornWorker) -> None:
+    """
+    Account an exited worker.
+
+    It's called by gunicorn in the main process
+    when a worker exits. Live gauges of the worker
+    are removed, so they are no longer summed in metrics.
+
+    :param server: gunicorn arbiter.
+    :param worker: exited worker.
+    """
+    from prometheus_client import multiprocess  # (Found nested import)
+
+    multiprocess.mark_process_dead(worker.pid)
+    recycled = worker.pid in getattr(server, "recycled", ())
+    _metrics().WORKER_EVENTS.labels("recycled" if recycled else "exited").inc()
+
+
+class SupervisingArbiter(Arbiter):
+    """
+    Gunicorn arbiter recycling workers that use too much memory.
+
+    Every ``rss_check_interval`` seconds resident memory of workers
+    is checked. The largest worker over ``max_worker_rss`` is stopped
+    gracefully and replaced. Workers are recycled one at a time,
+    at least ``recycle_interval`` seconds apart, so they don't
+    all restart at once when memory grows evenly.
+    """
+
+    def __init__(self, app: "GunicornApplication") -> None:
+        super().__init__(app)
+        self.max_worker_rss = app.max_worker_rss
+        self.rss_check_interval = app.rss_check_interval
+        self.recycle_interval = app.recycle_interval
+        self.recycled: Set[int] = set()
+        self._next_check = 0.0
+        self._last_recycle = -math.inf
+
+    def spawn_worker(self) -> int:
+        """
+        Start a worker.
+
+        :return: pid of the worker.
+        """
+        pid = super().spawn_worker()
+        # Only the main process gets here, the worker exits in the call.
+        _metrics().WORKER_EVENTS.labels("spawned").inc()
+        return pid
+
+    def manage_workers(self) -> None:
+        """Keep the number of workers and recycle those using too much memory."""
+        super().manage_workers()
+        metrics = _metrics()
+        metrics.WORKERS.set(len(self.WORKERS))
+        now = time.monotonic()
+        if not self.max_worker_rss or now < self._next_check:
+            return
+        self._next_check = now + self.rss_check_interval
+
+        rss = {}
+        for pid in self.WORKERS:
+            size = worker_rss(pid)
+            if size is not None:
+                rss[pid] = size
+        self.recycled &= set(self.WORKERS)
+        metrics.WORKER_MAX_RSS.set(max(rss.values(), default=0))
+        if self.recycled or now - self._last_recycle < self.recycle_interval:
+            # The previous worker is still stopping or was stopped recently.
+            return
+        pid = select_worker_to_recycle(rss, self.max_worker_rss)
+        if pid is None:
+            return
+        self.log.info(
+            "Recycling worker (pid:%s), it uses %d MiB",
+            pid,
+            rss[pid] // (1024 * 1024),
+        )
+        self.recycled.add(pid)
+        self._last_recycle = now
+        self.kill_worker(pid, signal.SIGTERM)
+
+
 class GunicornApplication(BaseApplication):
     """
     Custom gunicorn application.
@@ -42,8 +244,14 @@ class GunicornApplication(BaseApplication):
         host: str,
         port: int,
         workers: int,
+        max_worker_rss: int = 0,
+        rss_check_interval: float = 10.0,
+        recycle_interval: float = 60.0,
         **kwargs: Any,
     ) -> None:
+        self.max_worker_rss = max_worker_rss
+        self.rss_check_interval = rss_check_interval
+        self.recycle_interval = recycle_interval
         self.options = {
             "bind": f"{host}:{port}",
             "workers": workers,
@@ -77,3 +285,7 @@ class GunicornApplication(BaseApplication):
         :returns: python path to app factory.
         """
         return import_app(self.app)
+
+    def run(self) -> None:
+        """Start the main process supervising workers."""
+        SupervisingArbiter(self).run()
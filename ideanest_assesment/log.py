@@ -1,11 +1,21 @@
 import logging
+import queue
+import random
 import sys
-from typing import Union
+import threading
+import traceback
+from typing import IO, Any, Dict, List, Optional, Union
 
+import orjson
 from loguru import logger
 
 from ideanest_assesment.settings import settings
 
+# Records written by the background sink in one go.
+SINK_BATCH_SIZE = 512
+# Seconds the sink waits for queued records to be written when stopped.
+SINK_STOP_TIMEOUT = 5.0
+
 
 class InterceptHandler(logging.Handler):
     """
@@ -18,6 +28,17 @@ class InterceptHandler(logging.Handler):
     https://loguru.readthedocs.io/en/stable/overview.html#entirely-compatible-with-standard-logging
     """
 
+    def __init__(self, caller: bool = True) -> None:
+        """
+        Create handler.
+
+        :param caller: whether to find the function that logged the record.
+            It walks the stack on every record, without it records
+            keep the logger name, function and line known to logging.
+        """
+        super().__init__()
+        self.caller = caller
+
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover
         """
         Propagates logs to loguru.
@@ -29,6 +50,19 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
+        if not self.caller:
+            # Otherwise records would look like logged by this method.
+            logger.patch(
+                lambda patched: patched.update(
+                    {
+                        "name": record.name,
+                        "function": record.funcName,
+                        "line": record.lineno,
+                    },
+                ),
+            ).opt(exception=record.exc_info).log(level, record.getMessage())
+            return
+
         # Find caller from where originated the logged message
         frame, depth = logging.currentframe(), 2
         while frame.f_code.co_filename == logging.__file__:
@@ -41,11 +75,194 @@ class InterceptHandler(logging.Handler):
         )
 
 
+class JsonSink:
+    """
+    Loguru sink writing JSON lines from a background thread.
+
+    Logging calls only put the record to a bounded queue, so a slow
+    stdout pipe never blocks request handling. Records are serialized
+    and written in batches by the thread. When the queue is full,
+    records are dropped and counted; the number of dropped records
+    is logged once the thread catches up. Records that can't be
+    serialized are written with their extra as ``repr``.
+    """
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        buffer_size: int = 10000,
+        caller: bool = False,
+    ) -> None:
+        """
+        Start the writer thread.
+
+        :param stream: binary stream to write to.
+        :param buffer_size: records waiting to be written before new are dropped.
+        :param caller: whether to write module, function and line of the caller.
+        """
+        self.stream = stream
+        self.caller = caller
+        self.dropped = 0
+        self._reported = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(
+            buffer_size,
+        )
+        self._thread = threading.Thread(
+            target=self._run,
+            name="log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        """
+        Queue a record.
+
+        :param message: message formatted by loguru, with the record.
+        """
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Write queued records and stop the thread, called by loguru."""
+        try:
+            self._queue.put(None, timeout=SINK_STOP_TIMEOUT)
+        except queue.Full:
+            # The thread is stuck on the stream, it's a daemon anyway.
+            return
+        self._thread.join(timeout=SINK_STOP_TIMEOUT)
+
+    def serialize(self, record: Dict[str, Any]) -> bytes:
+        """
+        Serialize a loguru record.
+
+        :param record: loguru record.
+        :return: JSON line.
+        """
+        extra = dict(record["extra"])
+        line: Dict[str, Any] = {
+            "time": record["time"],
+            "level": record["level"].name,
+            "logger": record["name"],
+            "message": record["message"],
+        }
+        if self.caller:
+            line["function"] = record["function"]
+            line["line"] = record["line"]
+        if extra:
+            line["extra"] = extra
+        exception = record["exception"]
+        if exception is not None:
+            line["exception"] = "".join(
+                traceback.format_exception(
+                    exception.type,
+                    exception.value,
+                    exception.traceback,
+                ),
+            )
+        return orjson.dumps(
+            line,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Optional[Dict[str, Any]]] = [self._queue.get()]
+            while len(batch) < SINK_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [
+                self._serialize_safely(record) for record in batch if record is not None
+            ]
+            dropped = self.dropped
+            if dropped > self._reported:
+                lines.append(self._dropped_line(dropped - self._reported))
+                self._reported = dropped
+            try:
+                self.stream.write(b"".join(lines))
+                self.stream.flush()
+            except (OSError, ValueError):
+                pass
+            if None in batch:
+                return
+
+    def _serialize_safely(self, record: Dict[str, Any]) -> bytes:
+        try:
+            return self.serialize(record)
+        except Exception as exc:
+            error = exc
+        try:
+            return orjson.dumps(
+                {
+                    "time": record["time"],
+                    "level": record["level"].name,
+                    "logger": record["name"],
+                    "message": record["message"],
+                    "extra": repr(record["extra"]),
+                    "error": f"Record could not be serialized: {error}",
+                },
+                default=str,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+        except Exception:
+            self.dropped += 1
+            return b""
+
+    def _dropped_line(self, count: int) -> bytes:
+        return orjson.dumps(
+            {
+                "level": "WARNING",
+                "logger": __name__,
+                "message": f"{count} log records dropped, the log buffer is full",
+            },
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+
+
+class AccessLogSampler(logging.Filter):
+    """
+    Passes a fraction of uvicorn access log records.
+
+    Responses with server errors are always logged.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """
+        Create filter.
+
+        :param rate: fraction of access log records to keep.
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether to log a record.
+
+        :param record: access log record.
+        :return: whether the record is logged.
+        """
+        if self.rate >= 1:
+            return True
+        # Uvicorn logs client, method, path, HTTP version and status.
+        args = record.args
+        status = args[-1] if isinstance(args, tuple) and args else None
+        if isinstance(status, int) and status >= 500:
+            return True
+        return random.random() < self.rate  # noqa: S311
+
+
 def configure_logging() -> None:  # pragma: no cover
     """Configures logging."""
-    intercept_handler = InterceptHandler()
+    intercept_handler = InterceptHandler(caller=settings.log_caller)
 
-    logging.basicConfig(handlers=[intercept_handler], level=logging.NOTSET)
+    # Records below the level are dropped before reaching loguru.
+    logging.basicConfig(handlers=[intercept_handler], level=settings.log_level.value)
 
     for logger_name in logging.root.manager.loggerDict:
         if logger_name.startswith("uvicorn."):
@@ -53,11 +270,26 @@ def configure_logging() -> None:  # pragma: no cover
 
     # change handler for default uvicorn logger
     logging.getLogger("uvicorn").handlers = [intercept_handler]
-    logging.getLogger("uvicorn.access").handlers = [intercept_handler]
+    access_logger = logging.getLogger("uvicorn.access")
+    access_logger.handlers = [intercept_handler]
+    access_logger.filters = [AccessLogSampler(settings.access_log_sample_rate)]
 
     # set logs output, level and format
     logger.remove()
+    if not settings.log_json:
+        logger.add(
+            sys.stdout,
+            level=settings.log_level.value,
+        )
+        return
     logger.add(
-        sys.stdout,
+        JsonSink(
+            sys.stdout.buffer,
+            buffer_size=settings.log_buffer_size,
+            caller=settings.log_caller,
+        ),
         level=settings.log_level.value,
+        # A callable format keeps loguru from formatting exceptions,
+        # the sink does it in its thread.
+        format=lambda _: "{message}",
     )
@@ -0,0 +1,221 @@
+"""
+Bulk provisioning of users.
+
+Reads users from a JSON lines file, one ``{"name", "email", "password"}``
+object per line, and prints the number of created users and rejected
+lines as JSON::
+
+    python -m ideanest_assesment.provisioning users.jsonl --workers 8
+
+Passwords are hashed in a process pool, bcrypt holds the GIL.
+Users are inserted in unordered batches, so a rejected user doesn't
+stop the rest of its batch. Emails already registered are looked up
+once per batch and skipped before hashing, so running the same file
+again is cheap.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+import beanie
+import orjson
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.models.user import User, hash_password
+from ideanest_assesment.settings import settings
+from ideanest_assesment.web.api.user.schema import UserCreate
+
+# Error code of unique index violations.
+DUPLICATE_KEY = 11000
+ALREADY_REGISTERED = "Email already registered"
+
+
+@dataclass
+class ProvisioningReport:
+    """Result of bulk provisioning."""
+
+    created: int = 0
+    # Reasons of rejection by row number.
+    rejected: Dict[int, str] = field(default_factory=dict)
+
+
+async def provision_users(
+    rows: Iterable[Tuple[int, Any]],
+    executor: Executor,
+    batch_size: int = 1000,
+) -> ProvisioningReport:
+    """
+    Create users in batches.
+
+    :param rows: numbered rows with user data, see :class:`UserCreate`.
+    :param executor: executor hashing passwords, a process pool
+        uses all CPUs.
+    :param batch_size: number of users inserted at once.
+    :return: created users and rejected rows.
+    """
+    report = ProvisioningReport()
+    seen: Set[str] = set()
+    rows_iter = iter(rows)
+    while batch := list(islice(rows_iter, batch_size)):
+        await _provision_batch(batch, executor, seen, report)
+    return report
+
+
+def _validate(
+    rows: List[Tuple[int, Any]],
+    seen: Set[str],
+    report: ProvisioningReport,
+) -> List[Tuple[int, UserCreate]]:
+    accepted = []
+    for number, row in rows:
+        try:
+            user = UserCreate.model_validate(row)
+        except ValidationError as exc:
+            report.rejected[number] = _describe(exc)
+            continue
+        if user.email in seen:
+            report.rejected[number] = ALREADY_REGISTERED
+            continue
+        seen.add(user.email)
+        accepted.append((number, user))
+    return accepted
+
+
+async def _provision_batch(
+    rows: List[Tuple[int, Any]],
+    executor: Executor,
+    seen: Set[str],
+    report: ProvisioningReport,
+) -> None:
+    accepted = _validate(rows, seen, report)
+    if not accepted:
+        return
+
+    registered = set(
+        await User.get_motor_collection().distinct(
+            "email",
+            {"email": {"$in": [user.email for _, user in accepted]}},
+        ),
+    )
+    for number, user in accepted:
+        if user.email in registered:
+            report.rejected[number] = ALREADY_REGISTERED
+    accepted = [
+        (number, user) for number, user in accepted if user.email not in registered
+    ]
+    if not accepted:
+        return
+
+    loop = asyncio.get_running_loop()
+    hashed_passwords = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, hash_password, user.password)
+            for _, user in accepted
+        ),
+    )
+    users = [
+        User(name=user.name, email=user.email, hashed_password=hashed_password)
+        for (_, user), hashed_password in zip(accepted, hashed_passwords)
+    ]
+    try:
+        result = await User.insert_many(users, ordered=False)
+    except BulkWriteError as exc:
+        report.created += exc.details["nInserted"]
+        for error in exc.details["writeErrors"]:
+            number = accepted[error["index"]][0]
+            if error["code"] == DUPLICATE_KEY:
+                report.rejected[number] = ALREADY_REGISTERED
+            else:
+                report.rejected[number] = error["errmsg"]
+    else:
+        report.created += len(result.inserted_ids)
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        ": ".join(filter(None, (".".join(map(str, error["loc"])), error["msg"])))
+        for error in exc.errors()
+    )
+
+
+def read_jsonl(path: Path) -> Iterator[Tuple[int, Any]]:
+    """
+    Read rows of a JSON lines file.
+
+    Lines that aren't JSON are passed as is and rejected by validation.
+
+    :param path: path to the file.
+    :yield: line numbers and parsed lines, empty lines are skipped.
+    """
+    with path.open("rb") as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield number, line
+
+
+async def run(path: Path, workers: int, batch_size: int) -> None:
+    """
+    Provision users from a file and print the report.
+
+    :param path: JSON lines file with users.
+    :param workers: number of processes hashing passwords.
+    :param batch_size: number of users inserted at once.
+    """
+    client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+    await beanie.init_beanie(
+        database=client[settings.db_base],
+        document_models=load_all_models(),  # type: ignore
+    )
+    started = time.perf_counter()
+    try:
+        # Forking after motor started its threads may deadlock the workers.
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            report = await provision_users(read_jsonl(path), executor, batch_size)
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - started
+    result = {
+        "created": report.created,
+        "rejected": [
+            {"line": number, "error": error}
+            for number, error in sorted(report.rejected.items())
+        ],
+        "elapsed_s": round(elapsed, 3),
+    }
+    sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n")
+
+
+def main() -> None:
+    """Entrypoint of bulk provisioning."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.path, args.workers, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Health checking service."""
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from opentelemetry.instrumentation.utils import suppress_instrumentation
+
+logger = logging.getLogger(__name__)
+
+Check = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class DependencyHealth:
+    """Result of a dependency check."""
+
+    healthy: bool
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class HealthReport:
+    """Results of all dependency checks."""
+
+    dependencies: Dict[str, DependencyHealth]
+    checked_at: float
+
+    @property
+    def healthy(self) -> bool:
+        """
+        Whether all dependencies are healthy.
+
+        :return: True if every check passed.
+        """
+        return all(result.healthy for result in self.dependencies.values())
+
+    @property
+    def age(self) -> float:
+        """
+        Time since the checks finished.
+
+        :return: age in seconds.
+        """
+        return time.monotonic() - self.checked_at
+
+
+class HealthChecker:
+    """
+    Checks dependencies in background and caches the result.
+
+    Probes read :attr:`report` without touching the dependencies,
+    so they are cheap no matter how often orchestrators call them.
+    Every worker checks once per ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        checks: Mapping[str, Check],
+        interval: float,
+        timeout: float,
+    ) -> None:
+        self._checks = checks
+        self._interval = interval
+        self._timeout = timeout
+        self._task: Optional[asyncio.Task[None]] = None
+        self.report: Optional[HealthReport] = None
+
+    def is_ready(self) -> bool:
+        """
+        Whether the worker can serve traffic.
+
+        A report older than three intervals means the checks hang
+        or stopped, so it isn't trusted.
+
+        :return: True if the last checks passed and are recent.
+        """
+        return (
+            self.report is not None
+            and self.report.healthy
+            and self.report.age < 3 * self._interval
+        )
+
+    def start(self) -> None:
+        """Start checking in background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background checks."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def check(self) -> HealthReport:
+        """
+        Run all checks concurrently and store the report.
+
+        :return: fresh report.
+        """
+        names = list(self._checks)
+        results = await asyncio.gather(*(self._check(name) for name in names))
+        self.report = HealthReport(
+            dependencies=dict(zip(names, results)),
+            checked_at=time.monotonic(),
+        )
+        return self.report
+
+    async def _check(self, name: str) -> DependencyHealth:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._checks[name](), timeout=self._timeout)
+        except Exception as exc:
+            error = repr(exc)
+            if isinstance(exc, asyncio.TimeoutError):
+                error = f"Timed out after {self._timeout} s"
+            logger.warning("Health check of %s failed: %s", name, error)
+            return DependencyHealth(
+                healthy=False,
+                latency=time.perf_counter() - started,
+                error=error,
+            )
+        return DependencyHealth(healthy=True, latency=time.perf_counter() - started)
+
+    async def _run(self) -> None:
+        while True:
+            # Checks would start a trace every interval in every worker.
+            with suppress_instrumentation():
+                await self.check()
+            await asyncio.sleep(self._interval)
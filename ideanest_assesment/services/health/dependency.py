@@ -0,0 +1,13 @@
+from starlette.requests import Request
+
+from ideanest_assesment.services.health.checker import HealthChecker
+
+
+def get_health_checker(request: Request) -> HealthChecker:  # pragma: no cover
+    """
+    Returns health checker of the worker.
+
+    :param request: current request.
+    :returns: health checker.
+    """
+    return request.app.state.health_checker
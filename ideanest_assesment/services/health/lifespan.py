@@ -0,0 +1,49 @@
+from aio_pika.abc import AbstractRobustConnection
+from aio_pika.pool import Pool
+from fastapi import FastAPI
+from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
+
+from ideanest_assesment.services.health.checker import HealthChecker
+from ideanest_assesment.settings import settings
+
+
+def init_health_checker(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts background checks of MongoDB, Redis and RabbitMQ.
+
+    Must be called after the clients were initialized.
+
+    :param app: current fastapi application.
+    """
+    db_client: AsyncIOMotorClient = app.state.db_client  # type: ignore
+    redis: Redis = app.state.redis
+    rmq_pool: Pool[AbstractRobustConnection] = app.state.rmq_pool
+
+    async def check_mongo() -> None:
+        await db_client.admin.command("ping")
+
+    async def check_redis() -> None:
+        await redis.ping()
+
+    async def check_rabbit() -> None:
+        async with rmq_pool.acquire() as connection:
+            channel = await connection.channel()
+            await channel.close()
+
+    checker = HealthChecker(
+        checks={"mongo": check_mongo, "redis": check_redis, "rabbit": check_rabbit},
+        interval=settings.health_check_interval,
+        timeout=settings.health_check_timeout,
+    )
+    checker.start()
+    app.state.health_checker = checker
+
+
+async def shutdown_health_checker(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops background health checks.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.health_checker.stop()
@@ -0,0 +1,35 @@
+from fastapi import FastAPI
+
+from ideanest_assesment.services.metrics.sampler import PoolMetricsSampler
+from ideanest_assesment.settings import settings
+
+
+def init_metrics(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts sampling of pool metrics.
+
+    Must be called after redis, rabbit and the task dispatcher
+    were initialized.
+
+    :param app: current fastapi application.
+    """
+    sampler = PoolMetricsSampler(
+        interval=settings.metrics_sample_interval,
+        redis_pool=app.state.redis_pool,
+        rabbit_pools={
+            "connections": app.state.rmq_pool,
+            "channels": app.state.rmq_channel_pool,
+        },
+        dispatcher=app.state.task_dispatcher,
+    )
+    sampler.start()
+    app.state.metrics_sampler = sampler
+
+
+async def shutdown_metrics(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops sampling of pool metrics.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.metrics_sampler.stop()
@@ -0,0 +1,74 @@
+from typing import Optional, Tuple
+
+from pymongo import monitoring
+
+from ideanest_assesment.services.metrics.metrics import (
+    MONGO_POOL_CHECKOUT_FAILURES,
+    MONGO_POOL_CONNECTIONS,
+    MONGO_POOL_IN_USE,
+)
+
+
+def _address(address: Tuple[str, Optional[int]]) -> str:
+    host, port = address
+    return f"{host}:{port}"
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection pools of MongoDB clients.
+
+    Pass it to the client in ``event_listeners``. Pymongo calls
+    the listener from the threads using connections, metrics are
+    updated there without waiting for a scrape.
+    """
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        """Ignore pool creation, the pool has no connections yet."""
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        """Ignore pool becoming ready."""
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        """Ignore pool clearing, closed connections are reported one by one."""
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        """Ignore pool closing, closed connections are reported one by one."""
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        """Count opened connection."""
+        MONGO_POOL_CONNECTIONS.labels(_address(event.address)).inc()
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        """Ignore connection becoming ready."""
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        """Count closed connection."""
+        MONGO_POOL_CONNECTIONS.labels(_address(event.address)).dec()
+
+    def connection_check_out_started(
+        self,
+        event: monitoring.ConnectionCheckOutStartedEvent,
+    ) -> None:
+        """Ignore start of a checkout."""
+
+    def connection_check_out_failed(
+        self,
+        event: monitoring.ConnectionCheckOutFailedEvent,
+    ) -> None:
+        """Count failed checkout."""
+        MONGO_POOL_CHECKOUT_FAILURES.labels(
+            _address(event.address),
+            event.reason,
+        ).inc()
+
+    def connection_checked_out(
+        self,
+        event: monitoring.ConnectionCheckedOutEvent,
+    ) -> None:
+        """Count connection taken from the pool."""
+        MONGO_POOL_IN_USE.labels(_address(event.address)).inc()
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        """Count connection returned to the pool."""
+        MONGO_POOL_IN_USE.labels(_address(event.address)).dec()
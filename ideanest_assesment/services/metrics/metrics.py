@@ -0,0 +1,146 @@
+import os
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Metrics are created once per process.
+# Under gunicorn every worker writes its values to files in
+# PROMETHEUS_MULTIPROC_DIR and the endpoint aggregates them,
+# gauges are summed over live workers.
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Handled HTTP requests.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle HTTP requests, including sending the response.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections",
+    "Open connections of MongoDB pools.",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_IN_USE = Gauge(
+    "mongo_pool_connections_in_use",
+    "Connections checked out of MongoDB pools.",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total",
+    "Failed checkouts of MongoDB connections.",
+    ["address", "reason"],
+)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections",
+    "Connections of the redis pool.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+REDIS_POOL_MAX_CONNECTIONS = Gauge(
+    "redis_pool_max_connections",
+    "Size of the redis pool.",
+    multiprocess_mode="livesum",
+)
+REDIS_POOL_CHECKOUTS = Counter(
+    "redis_pool_checkouts_total",
+    "Connections taken from the redis pool.",
+)
+REDIS_POOL_CHECKOUT_ERRORS = Counter(
+    "redis_pool_checkout_errors_total",
+    "Failed attempts to take a connection from the redis pool.",
+)
+REDIS_POOL_CHECKOUT_SECONDS = Counter(
+    "redis_pool_checkout_seconds_total",
+    "Time spent waiting for connections of the redis pool.",
+)
+
+RABBIT_POOL_ITEMS = Gauge(
+    "rabbit_pool_items",
+    "Connections or channels of RabbitMQ pools.",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+RABBIT_POOL_MAX_ITEMS = Gauge(
+    "rabbit_pool_max_items",
+    "Size of RabbitMQ pools.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+TASK_DISPATCHES = Counter(
+    "celery_task_dispatches_total",
+    "Celery tasks handed over to the task dispatcher.",
+    ["result"],
+)
+TASK_DISPATCH_SECONDS = Counter(
+    "celery_task_enqueue_seconds_total",
+    "Time spent publishing celery tasks to the broker.",
+)
+TASK_DISPATCH_PENDING = Gauge(
+    "celery_task_dispatch_pending",
+    "Celery tasks being published.",
+    multiprocess_mode="livesum",
+)
+
+# Set by the gunicorn main process.
+WORKERS = Gauge(
+    "gunicorn_workers",
+    "Running gunicorn workers.",
+    multiprocess_mode="livesum",
+)
+WORKER_MAX_RSS = Gauge(
+    "gunicorn_worker_max_rss_bytes",
+    "Resident memory of the largest worker at the last check.",
+    multiprocess_mode="livesum",
+)
+WORKER_EVENTS = Counter(
+    "gunicorn_worker_events_total",
+    "Workers spawned, exited and recycled for using too much memory.",
+    ["event"],
+)
+
+
+def is_multiprocess() -> bool:
+    """
+    Check whether metrics are shared between processes.
+
+    :return: whether PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def render_metrics() -> bytes:
+    """
+    Render metrics in Prometheus text format.
+
+    In multiprocess mode metrics of all workers are read from files,
+    otherwise metrics of the current process are rendered.
+
+    :return: metrics of the application.
+    """
+    if not is_multiprocess():
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return generate_latest(registry)
@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any, Dict, Mapping, Optional
+
+from aio_pika.pool import Pool
+
+from ideanest_assesment.services.metrics.metrics import (
+    RABBIT_POOL_ITEMS,
+    RABBIT_POOL_MAX_ITEMS,
+    REDIS_POOL_CHECKOUT_ERRORS,
+    REDIS_POOL_CHECKOUT_SECONDS,
+    REDIS_POOL_CHECKOUTS,
+    REDIS_POOL_CONNECTIONS,
+    REDIS_POOL_MAX_CONNECTIONS,
+    TASK_DISPATCH_PENDING,
+    TASK_DISPATCH_SECONDS,
+    TASK_DISPATCHES,
+)
+from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetricsSampler:
+    """
+    Copies statistics of pools and of the task dispatcher to metrics.
+
+    The statistics are kept by the pools themselves, the sampler reads
+    them periodically in every worker. Scrapes are answered by one worker
+    only, so sampling at scrape time would miss the others.
+    Counters grow by the difference since the previous sample.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        redis_pool: Optional[InstrumentedConnectionPool] = None,
+        rabbit_pools: Optional[Mapping[str, "Pool[Any]"]] = None,
+        dispatcher: Optional[TaskDispatcher] = None,
+    ) -> None:
+        self._interval = interval
+        self._redis_pool = redis_pool
+        self._rabbit_pools = rabbit_pools or {}
+        self._dispatcher = dispatcher
+        self._previous: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """Start sampling in background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling and take the last sample."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self.sample()
+
+    def sample(self) -> None:
+        """Update metrics from current statistics."""
+        if self._redis_pool is not None:
+            stats = self._redis_pool.stats()
+            REDIS_POOL_CONNECTIONS.labels("in_use").set(stats.in_use)
+            REDIS_POOL_CONNECTIONS.labels("idle").set(stats.idle)
+            REDIS_POOL_MAX_CONNECTIONS.set(stats.max_connections)
+            REDIS_POOL_CHECKOUTS.inc(self._delta("redis_checkouts", stats.checkouts))
+            REDIS_POOL_CHECKOUT_ERRORS.inc(
+                self._delta("redis_checkout_errors", stats.checkout_errors),
+            )
+            REDIS_POOL_CHECKOUT_SECONDS.inc(
+                self._delta(
+                    "redis_checkout_time",
+                    self._redis_pool.total_checkout_time,
+                ),
+            )
+
+        for name, pool in self._rabbit_pools.items():
+            created, idle, max_size = rabbit_pool_usage(pool)
+            RABBIT_POOL_ITEMS.labels(name, "in_use").set(created - idle)
+            RABBIT_POOL_ITEMS.labels(name, "idle").set(idle)
+            RABBIT_POOL_MAX_ITEMS.labels(name).set(max_size)
+
+        if self._dispatcher is not None:
+            dispatch = self._dispatcher.stats
+            for result in ("enqueued", "failed", "rejected"):
+                TASK_DISPATCHES.labels(result).inc(
+                    self._delta(f"tasks_{result}", getattr(dispatch, result)),
+                )
+            TASK_DISPATCH_SECONDS.inc(
+                self._delta("tasks_latency", dispatch.total_latency),
+            )
+            TASK_DISPATCH_PENDING.set(dispatch.pending)
+
+    def _delta(self, name: str, value: float) -> float:
+        previous = self._previous.get(name, 0)
+        self._previous[name] = value
+        return max(value - previous, 0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception:
+                logger.exception("Failed to sample pool metrics")
+            await asyncio.sleep(self._interval)
+
+
+def rabbit_pool_usage(pool: "Pool[Any]") -> tuple[int, int, int]:
+    """
+    Get usage of an aio-pika pool.
+
+    aio-pika doesn't expose the counters of a pool,
+    they are read from its private attributes.
+
+    :param pool: connection or channel pool.
+    :return: created items, idle items and maximum size, 0 if unlimited.
+    """
+    created = getattr(pool, "_Pool__created", 0)
+    items = getattr(pool, "_Pool__items", None)
+    idle = items.qsize() if items is not None else 0
+    max_size = getattr(pool, "_Pool__max_size", None) or 0
+    return created, idle, max_size
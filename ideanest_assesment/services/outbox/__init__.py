@@ -0,0 +1 @@
+"""Transactional outbox relay."""
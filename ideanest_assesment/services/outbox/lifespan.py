@@ -0,0 +1,34 @@
+from fastapi import FastAPI
+
+from ideanest_assesment.services.outbox.relay import OutboxRelay
+from ideanest_assesment.services.tasks.send_email import app as celery_app
+from ideanest_assesment.settings import settings
+
+
+def init_outbox_relay(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts relay publishing outbox messages.
+
+    Must be called after the task dispatcher was initialized.
+
+    :param app: current fastapi application.
+    """
+    relay = OutboxRelay(
+        dispatcher=app.state.task_dispatcher,
+        celery_app=celery_app,
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+        claim_timeout=settings.outbox_claim_timeout,
+        max_attempts=settings.outbox_max_attempts,
+    )
+    relay.start()
+    app.state.outbox_relay = relay
+
+
+async def shutdown_outbox_relay(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Stops outbox relay.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.outbox_relay.stop()
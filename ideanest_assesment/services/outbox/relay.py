@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from celery import Celery
+from opentelemetry import propagate, trace
+from opentelemetry.instrumentation.utils import suppress_instrumentation
+
+from ideanest_assesment.db.dao.outbox_dao import OutboxDAO
+from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.models.outbox import OutboxDocument, OutboxMessage
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class OutboxRelay:
+    """
+    Publishes outbox messages to celery in batches.
+
+    Messages kept in changed documents are moved to the outbox first.
+    Every worker runs its own relay. Messages are claimed before
+    publishing, so concurrent relays never publish the same message twice,
+    and a message is deleted only after the broker accepted it.
+    """
+
+    def __init__(
+        self,
+        dispatcher: TaskDispatcher,
+        celery_app: Celery,
+        batch_size: int,
+        poll_interval: float,
+        claim_timeout: float,
+        max_attempts: int,
+    ) -> None:
+        self._dispatcher = dispatcher
+        self._celery_app = celery_app
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease = timedelta(seconds=claim_timeout)
+        self._max_attempts = max_attempts
+        self._dao = OutboxDAO()
+        self._sources = [
+            model for model in load_all_models() if issubclass(model, OutboxDocument)
+        ]
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """Start relaying messages in background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background relay."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def relay_batch(self) -> int:
+        """
+        Claim and publish one batch of messages.
+
+        :return: number of claimed messages.
+        """
+        # Polls would start a trace every poll interval in every worker.
+        with suppress_instrumentation():
+            for model in self._sources:
+                await self._dao.collect(model, self._batch_size)
+            messages = await self._dao.claim_batch(self._batch_size, self._lease)
+        if not messages:
+            return 0
+
+        results = await asyncio.gather(
+            *(self._publish(message) for message in messages),
+            return_exceptions=True,
+        )
+        published = []
+        for message, result in zip(messages, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Failed to publish outbox message %s: %s",
+                    message.id,
+                    result,
+                )
+                await self._dao.release(message, repr(result), self._max_attempts)
+            else:
+                published.append(message.id)
+        await self._dao.ack(published)  # type: ignore
+        return len(messages)
+
+    async def _publish(self, message: OutboxMessage) -> None:
+        # Publishing belongs to the trace of the request that wrote the message.
+        with tracer.start_as_current_span(
+            f"outbox publish {message.task_name}",
+            context=propagate.extract(message.trace_context),
+            kind=trace.SpanKind.PRODUCER,
+        ):
+            await self._dispatcher.enqueue(
+                self._celery_app.signature(message.task_name),
+                args=message.args,
+                kwargs=message.kwargs,
+                **message.options,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.relay_batch()
+            except Exception:
+                logger.exception("Outbox relay failed")
+                claimed = 0
+            # A full batch means there is a backlog, so keep draining.
+            if claimed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
@@ -0,0 +1,114 @@
+import hashlib
+import math
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import Depends, HTTPException, status
+from jose import JWTError, jwt
+from starlette.requests import Request
+
+from ideanest_assesment.services.ratelimit.limiter import RateLimiter
+from ideanest_assesment.settings import settings
+
+AccountGetter = Callable[[Request], Awaitable[Optional[str]]]
+
+
+def get_rate_limiter(request: Request) -> RateLimiter:  # pragma: no cover
+    """
+    Returns rate limiter shared by the worker.
+
+    :param request: current request.
+    :returns: rate limiter.
+    """
+    return request.app.state.rate_limiter
+
+
+async def form_username(request: Request) -> Optional[str]:
+    """
+    Get account from the username of a login form.
+
+    :param request: current request.
+    :returns: username, if present.
+    """
+    username = (await request.form()).get("username")
+    return username if isinstance(username, str) else None
+
+
+async def json_email(request: Request) -> Optional[str]:
+    """
+    Get account from the email field of a JSON body.
+
+    :param request: current request.
+    :returns: email, if present.
+    """
+    body = await request.json()
+    email = body.get("email") if isinstance(body, dict) else None
+    return email if isinstance(email, str) else None
+
+
+async def refresh_token_subject(request: Request) -> Optional[str]:
+    """
+    Get account from the subject of a refresh token.
+
+    The signature isn't verified, the endpoint does it anyway.
+
+    :param request: current request.
+    :returns: subject of the token, if present.
+    """
+    token = request.query_params.get("refresh_token")
+    if not token:
+        return None
+    try:
+        subject = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return subject if isinstance(subject, str) else None
+
+
+class RateLimit:
+    """
+    Dependency throttling an endpoint per client IP and per account.
+
+    Use it in the dependencies of a route:
+
+    >>> @router.post("/token", dependencies=[Depends(RateLimit("token"))])
+
+    Requests over the limit get 429 with a ``Retry-After`` header.
+    """
+
+    def __init__(self, scope: str, account: Optional[AccountGetter] = None) -> None:
+        self.scope = scope
+        self.account = account
+
+    async def __call__(
+        self,
+        request: Request,
+        limiter: RateLimiter = Depends(get_rate_limiter),
+    ) -> None:
+        """
+        Count the request and reject it when over the limit.
+
+        :param request: current request.
+        :param limiter: rate limiter.
+        :raises HTTPException: if the request is over the limit.
+        """
+        if not settings.rate_limit_enabled:
+            return
+        host = request.client.host if request.client else "unknown"
+        limits: Dict[str, int] = {
+            f"rate_limit:{self.scope}:ip:{host}": settings.rate_limit_ip_requests,
+        }
+        account = await self.account(request) if self.account else None
+        if account:
+            # Hashing keeps keys short whatever the client sends.
+            digest = hashlib.sha256(account.lower().encode()).hexdigest()[:32]
+            limits[f"rate_limit:{self.scope}:account:{digest}"] = (
+                settings.rate_limit_account_requests
+            )
+
+        wait = await limiter.hit(limits)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
@@ -0,0 +1,19 @@
+from fastapi import FastAPI
+
+from ideanest_assesment.services.ratelimit.limiter import RateLimiter
+from ideanest_assesment.settings import settings
+
+
+def init_rate_limiter(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates rate limiter.
+
+    It uses the redis client, so it must be created after redis.
+
+    :param app: current fastapi application.
+    """
+    app.state.rate_limiter = RateLimiter(
+        redis=app.state.redis,
+        period=settings.rate_limit_period,
+        deny_cache_size=settings.rate_limit_deny_cache_size,
+    )
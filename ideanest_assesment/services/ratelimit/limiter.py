@@ -0,0 +1,110 @@
+import logging
+import time
+from typing import Dict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# GCRA over every key in a single round-trip.
+# Each key stores the theoretical arrival time (TAT) of the next request.
+# A request is allowed only if it fits the limit of every key,
+# otherwise nothing is updated and time to wait is returned per key.
+# Redis clock is used, so workers don't need synchronized clocks.
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local period = tonumber(ARGV[1])
+local tats = {}
+local waits = {}
+local allowed = true
+for i, key in ipairs(KEYS) do
+    local interval = period / tonumber(ARGV[i + 1])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then
+        tat = now
+    end
+    tats[i] = tat + interval
+    waits[i] = math.max(0, math.ceil(tats[i] - period - now))
+    if waits[i] > 0 then
+        allowed = false
+    end
+end
+if allowed then
+    for i, key in ipairs(KEYS) do
+        redis.call('SET', key, tostring(tats[i]), 'PX', math.ceil(tats[i] - now))
+    end
+end
+return waits
+"""
+
+
+class RateLimiter:
+    """
+    Limits requests with GCRA stored in redis.
+
+    Every key allows ``limit`` requests per period, spread evenly
+    with bursts up to the whole limit. Keys that were denied are remembered
+    locally until they may retry, so floods of rejected requests
+    don't reach redis at all.
+
+    When redis is unavailable requests are allowed, so an outage of redis
+    doesn't lock users out.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        period: float,
+        deny_cache_size: int = 10000,
+    ) -> None:
+        self.period = period
+        self.deny_cache_size = deny_cache_size
+        self._script = redis.register_script(GCRA_SCRIPT)
+        self._denied: Dict[str, float] = {}
+
+    async def hit(self, limits: Dict[str, int]) -> float:
+        """
+        Count a request against several keys at once.
+
+        The request is counted only if all limits allow it.
+
+        :param limits: number of requests allowed per period, by key.
+        :return: seconds to wait before retrying, 0 if the request is allowed.
+        """
+        now = time.monotonic()
+        cached_wait = max(
+            (self._denied.get(key, now) - now for key in limits),
+            default=0,
+        )
+        if cached_wait > 0:
+            return cached_wait
+
+        try:
+            waits = await self._script(
+                keys=list(limits),
+                args=[int(self.period * 1000), *limits.values()],
+            )
+        except RedisError as exc:
+            logger.warning("Rate limiting is skipped: %s", exc)
+            return 0
+
+        wait = 0.0
+        for key, key_wait in zip(limits, waits):
+            if key_wait > 0:
+                self._deny(key, now + key_wait / 1000)
+                wait = max(wait, key_wait / 1000)
+        return wait
+
+    def _deny(self, key: str, until: float) -> None:
+        if len(self._denied) >= self.deny_cache_size:
+            now = time.monotonic()
+            self._denied = {
+                denied: deadline
+                for denied, deadline in self._denied.items()
+                if deadline > now
+            }
+            if len(self._denied) >= self.deny_cache_size:
+                self._denied.clear()
+        self._denied[key] = until
@@ -0,0 +1,77 @@
+import logging
+import zlib
+from typing import Optional, Union
+
+import lz4.frame
+import zstandard
+
+from ideanest_assesment.settings import RedisCompression
+
+logger = logging.getLogger(__name__)
+
+# Compressed values start with one of these bytes.
+# They never appear in UTF-8 text, so values without a header
+# are plain values written before compression was enabled.
+# Binary values may start with them too, values that fail
+# to decompress are returned as stored.
+ZSTD_HEADER = b"\xff"
+LZ4_HEADER = b"\xfe"
+ZLIB_HEADER = b"\xfd"
+
+
+class ValueCodec:
+    """
+    Compresses large redis values.
+
+    Values shorter than the threshold, and values that don't get smaller,
+    are stored as is. Decoding understands every algorithm regardless of
+    the configured one, so compression can be switched on, off or changed
+    without migrating existing values.
+    """
+
+    def __init__(self, compression: RedisCompression, threshold: int) -> None:
+        self.compression = compression
+        self.threshold = threshold
+        self._zstd_compressor = zstandard.ZstdCompressor()
+        self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, value: Union[str, bytes]) -> bytes:
+        """
+        Prepare value to be stored in redis.
+
+        :param value: value to store.
+        :return: compressed or original value.
+        """
+        data = value.encode() if isinstance(value, str) else value
+        if self.compression == RedisCompression.NONE or len(data) < self.threshold:
+            return data
+        if self.compression == RedisCompression.ZSTD:
+            compressed = ZSTD_HEADER + self._zstd_compressor.compress(data)
+        elif self.compression == RedisCompression.LZ4:
+            compressed = LZ4_HEADER + lz4.frame.compress(data)
+        else:
+            compressed = ZLIB_HEADER + zlib.compress(data)
+        if len(compressed) < len(data):
+            return compressed
+        return data
+
+    def decode(self, value: Optional[bytes]) -> Optional[bytes]:
+        """
+        Restore value read from redis.
+
+        :param value: stored value.
+        :return: original value.
+        """
+        if not value:
+            return value
+        header = value[:1]
+        try:
+            if header == ZSTD_HEADER:
+                return self._zstd_decompressor.decompress(value[1:])
+            if header == LZ4_HEADER:
+                return lz4.frame.decompress(value[1:])
+            if header == ZLIB_HEADER:
+                return zlib.decompress(value[1:])
+        except (zlib.error, RuntimeError, zstandard.ZstdError) as exc:
+            logger.warning("Value isn't compressed or is corrupt: %s", exc)
+        return value
@@ -3,6 +3,8 @@ from typing import AsyncGenerator
 from redis.asyncio import Redis
 from starlette.requests import Request
 
+from ideanest_assesment.services.redis.codec import ValueCodec
+
 
 async def get_redis_pool(
     request: Request,
@@ -10,17 +12,39 @@ async def get_redis_pool(
     """
     Returns connection pool.
 
+    Use it to inspect the pool, to run commands use `get_redis`.
+
+    :param request: current request.
+    :returns:  redis connection pool.
+    """
+    return request.app.state.redis_pool
+
+
+def get_redis(request: Request) -> Redis:  # pragma: no cover
+    """
+    Returns redis client shared by the worker.
+
     You can use it like this:
 
-    >>> from redis.asyncio import ConnectionPool, Redis
+    >>> from redis.asyncio import Redis
     >>>
-    >>> async def handler(redis_pool: ConnectionPool = Depends(get_redis_pool)):
-    >>>     async with Redis(connection_pool=redis_pool) as redis:
-    >>>         await redis.get('key')
+    >>> async def handler(redis: Redis = Depends(get_redis)):
+    >>>     await redis.get('key')
 
-    I use pools, so you don't acquire connection till the end of the handler.
+    The client takes connections from the pool only for the time
+    of a command, so don't close it in handlers.
 
     :param request: current request.
-    :returns:  redis connection pool.
+    :returns: redis client.
     """
-    return request.app.state.redis_pool
+    return request.app.state.redis
+
+
+def get_redis_codec(request: Request) -> ValueCodec:  # pragma: no cover
+    """
+    Returns codec for redis values.
+
+    :param request: current request.
+    :returns: value codec.
+    """
+    return request.app.state.redis_codec
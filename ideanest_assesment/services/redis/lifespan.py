@@ -1,24 +1,40 @@
 from fastapi import FastAPI
-from redis.asyncio import ConnectionPool
+from redis.asyncio import Redis
 
+from ideanest_assesment.services.redis.codec import ValueCodec
+from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
 from ideanest_assesment.settings import settings
 
 
 def init_redis(app: FastAPI) -> None:  # pragma: no cover
     """
-    Creates connection pool for redis.
+    Creates connection pool and client for redis.
+
+    The client is shared by all requests of the worker.
 
     :param app: current fastapi application.
     """
-    app.state.redis_pool = ConnectionPool.from_url(
+    pool = InstrumentedConnectionPool.from_url(
         str(settings.redis_url),
+        max_connections=settings.redis_pool_size,
+        timeout=settings.redis_pool_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_connect_timeout,
+        health_check_interval=settings.redis_health_check_interval,
+    )
+    app.state.redis_pool = pool
+    app.state.redis = Redis(connection_pool=pool)
+    app.state.redis_codec = ValueCodec(
+        compression=settings.redis_compression,
+        threshold=settings.redis_compression_threshold,
     )
 
 
 async def shutdown_redis(app: FastAPI) -> None:  # pragma: no cover
     """
-    Closes redis connection pool.
+    Closes redis client and connection pool.
 
     :param app: current FastAPI app.
     """
+    await app.state.redis.aclose()
     await app.state.redis_pool.disconnect()
@@ -0,0 +1,80 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool
+from redis.asyncio.connection import AbstractConnection
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of connection pool usage."""
+
+    max_connections: int
+    in_use: int
+    idle: int
+    checkouts: int
+    checkout_errors: int
+    avg_checkout_time: float
+    max_checkout_time: float
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Blocking connection pool that measures connection checkouts.
+
+    When all connections are busy, callers wait up to ``timeout`` seconds
+    for a free one instead of opening new connections without limit.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_errors = 0
+        self.total_checkout_time = 0.0
+        self.max_checkout_time = 0.0
+
+    async def get_connection(
+        self,
+        command_name: str,
+        *keys: Any,
+        **options: Any,
+    ) -> AbstractConnection:
+        """
+        Take a connection from the pool, waiting for a free one if needed.
+
+        :param command_name: command the connection is taken for.
+        :param keys: keys of the command.
+        :param options: options of the command.
+        :return: connection ready to use.
+        """
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except Exception:
+            self.checkout_errors += 1
+            raise
+        elapsed = time.perf_counter() - started
+        self.checkouts += 1
+        self.total_checkout_time += elapsed
+        self.max_checkout_time = max(self.max_checkout_time, elapsed)
+        return connection
+
+    def stats(self) -> PoolStats:
+        """
+        Get current usage of the pool.
+
+        :return: pool statistics.
+        """
+        avg_checkout_time = 0.0
+        if self.checkouts:
+            avg_checkout_time = self.total_checkout_time / self.checkouts
+        return PoolStats(
+            max_connections=self.max_connections,
+            in_use=len(self._in_use_connections),
+            idle=len(self._available_connections),
+            checkouts=self.checkouts,
+            checkout_errors=self.checkout_errors,
+            avg_checkout_time=avg_checkout_time,
+            max_checkout_time=self.max_checkout_time,
+        )
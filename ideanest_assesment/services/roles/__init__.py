@@ -0,0 +1 @@
+"""Cache of access levels of users in organizations."""
@@ -0,0 +1,206 @@
+import logging
+from typing import Any, Awaitable, Dict, List, Optional, cast
+
+from beanie import PydanticObjectId
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ideanest_assesment.db.models.organization import Organization
+
+logger = logging.getLogger(__name__)
+
+# Fields of a roles hash besides access levels by organization id.
+LOADED_FIELD = "_loaded"
+VERSION_FIELD = "_v"
+
+# Replaces the hash with roles loaded from mongo, unless the version
+# was bumped after they were read, i.e. membership changed meanwhile
+# and the loaded roles may be stale. The version itself is kept.
+FILL_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], '_v') or ''
+if version ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], '_loaded', '1', unpack(ARGV, 3))
+if version ~= '' then
+    redis.call('HSET', KEYS[1], '_v', version)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Bumps the version and changes one role in a loaded hash.
+# An empty role removes it.
+SET_ROLE_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], '_v', 1)
+if redis.call('HEXISTS', KEYS[1], '_loaded') == 1 then
+    if ARGV[2] == '' then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+    else
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    end
+end
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+def _decode(value: Any) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RoleCache:
+    """
+    Access levels of users in organizations, cached in redis.
+
+    Every user has a hash ``org_roles:<user id>`` with access levels
+    by organization id, so checking a role is a single ``HMGET``.
+    The hash is loaded from mongo on the first check and kept
+    up to date by :class:`OrganizationDAO` on membership changes.
+
+    Each change bumps a version stamp in the hash. Roles loaded
+    from mongo are stored only if the version didn't change while
+    they were read, so a concurrent change is never overwritten
+    by a stale grant. Hashes expire, which bounds staleness if
+    an update couldn't reach redis.
+
+    When redis is unavailable roles are read from mongo,
+    so an outage of redis doesn't grant or deny access by mistake.
+    """
+
+    def __init__(self, redis: Redis, ttl: int) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self._fill = redis.register_script(FILL_SCRIPT)
+        self._set_role = redis.register_script(SET_ROLE_SCRIPT)
+
+    @staticmethod
+    def key(user_id: PydanticObjectId) -> str:
+        """
+        Get key of the roles hash of a user.
+
+        :param user_id: id of the user.
+        :return: redis key.
+        """
+        return f"org_roles:{user_id}"
+
+    async def get(
+        self,
+        user_id: PydanticObjectId,
+        organization_id: str,
+    ) -> Optional[str]:
+        """
+        Get access level of a user in an organization.
+
+        :param user_id: id of the user.
+        :param organization_id: id of the organization.
+        :return: access level, None if the user isn't a member.
+        """
+        if not PydanticObjectId.is_valid(organization_id):
+            # Also keeps service fields of the hash from being read as roles.
+            return None
+        key = self.key(user_id)
+        try:
+            loaded, role, version = await cast(
+                Awaitable[List[Any]],
+                self.redis.hmget(key, [LOADED_FIELD, organization_id, VERSION_FIELD]),
+            )
+        except RedisError as exc:
+            logger.warning("Roles are loaded from mongo: %s", exc)
+            return (await load_roles(user_id)).get(organization_id)
+        if loaded:
+            return _decode(role)
+        return (await self._load(user_id, _decode(version))).get(organization_id)
+
+    async def roles(self, user_id: PydanticObjectId) -> Dict[str, str]:
+        """
+        Get access levels of a user in all their organizations.
+
+        :param user_id: id of the user.
+        :return: access levels by organization id.
+        """
+        try:
+            cached = await cast(
+                Awaitable[Dict[Any, Any]],
+                self.redis.hgetall(self.key(user_id)),
+            )
+        except RedisError as exc:
+            logger.warning("Roles are loaded from mongo: %s", exc)
+            return await load_roles(user_id)
+        roles = {_decode(field): _decode(value) for field, value in cached.items()}
+        version = roles.pop(VERSION_FIELD, None)
+        if roles.pop(LOADED_FIELD, None):
+            return roles  # type: ignore
+        return await self._load(user_id, version)
+
+    async def _load(
+        self,
+        user_id: PydanticObjectId,
+        version: Optional[str],
+    ) -> Dict[str, str]:
+        roles = await load_roles(user_id)
+        fields: List[str] = [part for item in roles.items() for part in item]
+        try:
+            await self._fill(
+                keys=[self.key(user_id)],
+                args=[version or "", self.ttl, *fields],
+            )
+        except RedisError as exc:
+            logger.warning("Roles are not cached: %s", exc)
+        return roles
+
+    async def set(
+        self,
+        user_id: PydanticObjectId,
+        organization_id: PydanticObjectId,
+        role: Optional[str],
+    ) -> None:
+        """
+        Record a membership change and invalidate stale grants.
+
+        Call it after the change is saved to mongo.
+
+        :param user_id: id of the user.
+        :param organization_id: id of the organization.
+        :param role: new access level, None if the user was removed.
+        """
+        try:
+            await self._set_role(
+                keys=[self.key(user_id)],
+                args=[str(organization_id), role or "", self.ttl],
+            )
+        except RedisError as exc:
+            logger.error(
+                "Role of %s in %s is cached until expiry: %s",
+                user_id,
+                organization_id,
+                exc,
+            )
+
+
+async def load_roles(user_id: PydanticObjectId) -> Dict[str, str]:
+    """
+    Load access levels of a user in all their organizations.
+
+    The ``members_user`` index makes it a single index lookup.
+
+    :param user_id: id of the user.
+    :return: access levels by organization id.
+    """
+    roles: Dict[str, str] = {}
+    organizations = Organization.get_motor_collection().find(
+        {"members.user._id": user_id},
+        {"members.user._id": 1, "members.access_level": 1},
+    )
+    async for organization in organizations:
+        for member in organization["members"]:
+            if member["user"]["_id"] != user_id:
+                continue
+            organization_id = str(organization["_id"])
+            # A user listed twice gets the higher level.
+            if roles.get(organization_id) != "admin":
+                roles[organization_id] = member["access_level"]
+    return roles
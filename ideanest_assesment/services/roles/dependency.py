@@ -0,0 +1,63 @@
+from fastapi import Depends, HTTPException, status
+from starlette.requests import Request
+
+from ideanest_assesment.auth.auth import get_current_active_user
+from ideanest_assesment.db.models.user import User
+from ideanest_assesment.services.roles.cache import RoleCache
+
+
+def get_role_cache(request: Request) -> RoleCache:  # pragma: no cover
+    """
+    Returns cache of organization roles shared by the worker.
+
+    :param request: current request.
+    :returns: role cache.
+    """
+    return request.app.state.role_cache
+
+
+class OrganizationAccess:
+    """
+    Dependency allowing only members of the organization in the path.
+
+    Use it in the dependencies of a route with ``organization_id``:
+
+    >>> admins = Depends(OrganizationAccess("admin"))
+    >>> @router.put("/{organization_id}", dependencies=[admins])
+
+    Without access levels any member is allowed. The organization
+    isn't loaded, the role comes from :class:`RoleCache`.
+    Users who aren't members get 404, so they can't tell whether
+    the organization exists, members without the level get 403.
+    """
+
+    def __init__(self, *access_levels: str) -> None:
+        self.access_levels = frozenset(access_levels)
+
+    async def __call__(
+        self,
+        organization_id: str,
+        current_user: User = Depends(get_current_active_user),
+        role_cache: RoleCache = Depends(get_role_cache),
+    ) -> str:
+        """
+        Check access level of the current user.
+
+        :param organization_id: id of the organization.
+        :param current_user: authenticated user.
+        :param role_cache: cache of organization roles.
+        :return: access level of the user.
+        :raises HTTPException: if the user has no access.
+        """
+        role = await role_cache.get(current_user.id, organization_id)  # type: ignore
+        if role is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found",
+            )
+        if self.access_levels and role not in self.access_levels:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return role
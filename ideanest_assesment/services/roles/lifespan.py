@@ -0,0 +1,18 @@
+from fastapi import FastAPI
+
+from ideanest_assesment.services.roles.cache import RoleCache
+from ideanest_assesment.settings import settings
+
+
+def init_role_cache(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates cache of organization roles.
+
+    It uses the redis client, so it must be created after redis.
+
+    :param app: current fastapi application.
+    """
+    app.state.role_cache = RoleCache(
+        redis=app.state.redis,
+        ttl=settings.role_cache_ttl,
+    )
@@ -0,0 +1,18 @@
+from starlette.requests import Request
+
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+
+
+def get_task_dispatcher(request: Request) -> TaskDispatcher:  # pragma: no cover
+    """
+    Returns dispatcher for celery tasks.
+
+    You can use it like this:
+
+    >>> async def handler(dispatcher: TaskDispatcher = Depends(get_task_dispatcher)):
+    >>>     await dispatcher.enqueue(send_invitation_email, args=(...))
+
+    :param request: current request.
+    :returns: task dispatcher.
+    """
+    return request.app.state.task_dispatcher
@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Union
+
+from celery import Task
+from celery.canvas import Signature
+from celery.result import AsyncResult
+
+logger = logging.getLogger(__name__)
+
+
+class TaskDispatchError(Exception):
+    """Raised when a task cannot be handed over to the dispatcher."""
+
+
+@dataclass
+class DispatchStats:
+    """Counters and enqueue latency of a task dispatcher."""
+
+    enqueued: int = 0
+    failed: int = 0
+    rejected: int = 0
+    pending: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        """
+        Average enqueue latency of successfully published tasks.
+
+        :return: latency in seconds.
+        """
+        if not self.enqueued:
+            return 0.0
+        return self.total_latency / self.enqueued
+
+    def record(self, latency: float) -> None:
+        """
+        Account a successfully published task.
+
+        :param latency: time from submission to broker acknowledgement.
+        """
+        self.enqueued += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+class TaskDispatcher:
+    """
+    Publishes celery tasks without blocking the event loop.
+
+    Celery's producer writes to the broker synchronously,
+    so every publish is handed over to a small dedicated thread pool.
+    The number of publishes that may wait for a free thread is bounded:
+    when the buffer is full, callers wait up to ``wait_timeout`` seconds
+    and then get a ``TaskDispatchError`` instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        buffer_size: int,
+        wait_timeout: float,
+        slow_threshold: float = 0.1,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="task-dispatch",
+        )
+        self._slots = asyncio.Semaphore(max_workers + buffer_size)
+        self._wait_timeout = wait_timeout
+        self._slow_threshold = slow_threshold
+        self.stats = DispatchStats()
+
+    async def enqueue(
+        self,
+        task: Union[Task, Signature],
+        args: Sequence[Any] = (),
+        kwargs: Optional[dict[str, Any]] = None,
+        **options: Any,
+    ) -> AsyncResult:
+        """
+        Publish a task to the broker.
+
+        Accepts the same arguments as ``Task.apply_async``.
+
+        :param task: task or signature to publish.
+        :param args: positional arguments of the task.
+        :param kwargs: keyword arguments of the task.
+        :param options: publishing options, such as queue or countdown.
+        :raises TaskDispatchError: if the dispatch buffer stays full.
+        :return: result of the published task.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self._wait_timeout)
+        except asyncio.TimeoutError as exc:
+            self.stats.rejected += 1
+            raise TaskDispatchError("Task dispatch buffer is full") from exc
+
+        loop = asyncio.get_running_loop()
+        # Publish in the caller's context, so the trace continues in the task.
+        context = contextvars.copy_context()
+        started = time.perf_counter()
+        self.stats.pending += 1
+        try:
+            result = await loop.run_in_executor(
+                self._executor,
+                functools.partial(
+                    context.run,
+                    task.apply_async,
+                    args,
+                    kwargs,
+                    **options,
+                ),
+            )
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.stats.pending -= 1
+            self._slots.release()
+
+        latency = time.perf_counter() - started
+        self.stats.record(latency)
+        if latency > self._slow_threshold:
+            logger.warning(
+                "Slow enqueue of task %s: %.1f ms",
+                task.name,
+                latency * 1000,
+            )
+        return result
+
+    async def close(self) -> None:
+        """Wait for in-flight publishes and stop the thread pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
@@ -0,0 +1,27 @@
+from fastapi import FastAPI
+
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+from ideanest_assesment.settings import settings
+
+
+def init_task_dispatcher(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates dispatcher for celery tasks.
+
+    :param app: current fastapi application.
+    """
+    app.state.task_dispatcher = TaskDispatcher(
+        max_workers=settings.task_dispatch_workers,
+        buffer_size=settings.task_dispatch_buffer_size,
+        wait_timeout=settings.task_dispatch_wait_timeout,
+        slow_threshold=settings.task_dispatch_slow_threshold,
+    )
+
+
+async def shutdown_task_dispatcher(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Waits for pending publishes and stops the dispatcher.
+
+    :param app: current FastAPI app.
+    """
+    await app.state.task_dispatcher.close()
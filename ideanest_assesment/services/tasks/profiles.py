@@ -0,0 +1,54 @@
+from typing import Any
+
+from kombu import Queue
+
+from ideanest_assesment.settings import CeleryProfile, settings
+
+# Emails a user is waiting for, such as invitations.
+INTERACTIVE_EMAIL_QUEUE = "email.interactive"
+# Mass mailings that may lag without anyone noticing.
+BULK_EMAIL_QUEUE = "email.bulk"
+
+
+def get_celery_profile(profile: CeleryProfile) -> dict[str, Any]:
+    """
+    Get celery configuration for a named profile.
+
+    The ``default`` profile keeps celery defaults.
+    The ``performance`` profile is meant for fire-and-forget email tasks:
+    results are not stored, messages are acknowledged only
+    after the task finished, so every process reserves a single task,
+    payloads are compressed and interactive
+    emails never wait behind bulk ones, because they use separate queues.
+
+    Run one worker per queue to keep them isolated::
+
+        celery -A ideanest_assesment.services.tasks.send_email worker \
+            -Q email.interactive
+
+    :param profile: name of the profile.
+    :return: configuration to update celery app with.
+    """
+    if profile == CeleryProfile.DEFAULT:
+        return {}
+    return {
+        "task_ignore_result": True,
+        "task_store_errors_even_if_ignored": False,
+        "worker_prefetch_multiplier": settings.celery_prefetch_multiplier,
+        "task_acks_late": True,
+        "task_reject_on_worker_lost": True,
+        "task_compression": "gzip",
+        "task_default_queue": INTERACTIVE_EMAIL_QUEUE,
+        "task_queues": (
+            Queue(INTERACTIVE_EMAIL_QUEUE),
+            Queue(BULK_EMAIL_QUEUE),
+        ),
+        "task_routes": {
+            "send_invitation_email": {"queue": INTERACTIVE_EMAIL_QUEUE},
+        },
+        # Late acks on redis re-deliver unacked tasks after this timeout,
+        # so it must exceed the longest task.
+        "broker_transport_options": {
+            "visibility_timeout": settings.celery_visibility_timeout,
+        },
+    }
@@ -2,14 +2,24 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 
+from ideanest_assesment.services.tasks.profiles import get_celery_profile
 from ideanest_assesment.settings import settings
+from ideanest_assesment.telemetry import (
+    setup_worker_opentelemetry,
+    shutdown_worker_opentelemetry,
+)
 
 app = Celery(__name__)
 app.conf.broker_url = str(settings.redis_url)
 app.conf.result_backend = str(settings.redis_url)
+app.conf.update(get_celery_profile(settings.celery_profile))
+
+worker_process_init.connect(setup_worker_opentelemetry, weak=False)
+worker_process_shutdown.connect(shutdown_worker_opentelemetry, weak=False)
 
 SENDGRID_API_KEY = settings.sendgrid_api_key
 
@@ -20,6 +20,22 @@ class LogLevel(str, enum.Enum):
     FATAL = "FATAL"
 
 
+class RedisCompression(str, enum.Enum):
+    """Algorithms used to compress large redis values."""
+
+    NONE = "none"
+    ZSTD = "zstd"
+    LZ4 = "lz4"
+    ZLIB = "zlib"
+
+
+class CeleryProfile(str, enum.Enum):
+    """Named sets of celery settings."""
+
+    DEFAULT = "default"
+    PERFORMANCE = "performance"
+
+
 class Settings(BaseSettings):
     """
     Application settings.
@@ -30,8 +46,17 @@ class Settings(BaseSettings):
 
     host: str = "127.0.0.1"
     port: int = 8000
-    # quantity of workers for uvicorn
-    workers_count: int = 1
+    # quantity of workers for uvicorn, 0 sizes it from CPU quota and memory
+    workers_count: int = 0
+    # Workers using more resident memory, in bytes, are recycled one at a time
+    worker_max_rss: int = 512 * 1024 * 1024
+    # Seconds between checks of worker memory
+    worker_rss_check_interval: float = 10.0
+    # Minimal seconds between two recycled workers
+    worker_recycle_interval: float = 60.0
+    # Restart workers after this many requests plus random jitter, 0 disables
+    worker_max_requests: int = 0
+    worker_max_requests_jitter: int = 0
     # Enable uvicorn reloading
     reload: bool = False
 
@@ -39,6 +64,50 @@ class Settings(BaseSettings):
     environment: str = "dev"
 
     log_level: LogLevel = LogLevel.INFO
+    # Write logs as JSON lines from a background thread
+    log_json: bool = True
+    # Records waiting to be written, new records are dropped when it's full
+    log_buffer_size: int = 10000
+    # Log module, function and line of the caller, walks the stack per record
+    log_caller: bool = False
+    # Fraction of requests written to the access log, server errors are always written
+    access_log_sample_rate: float = 1.0
+
+    # Seconds between background checks of dependencies for readiness probes
+    health_check_interval: float = 5.0
+    # Seconds a dependency may take to answer a check
+    health_check_timeout: float = 2.0
+
+    # Record request and pool metrics served at /api/metrics
+    metrics_enabled: bool = True
+    # Seconds between samples of redis, rabbit and task dispatcher statistics
+    metrics_sample_interval: float = 5.0
+    # Workers of gunicorn share metrics through files in this directory
+    prometheus_dir: Path = TEMP_DIR / "prom"
+
+    # Response bodies smaller than this, in bytes, are sent uncompressed
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # OTLP gRPC endpoint receiving traces, tracing is disabled if not set
+    opentelemetry_endpoint: Optional[str] = None
+    # Fraction of traces started by this service that are recorded
+    opentelemetry_sample_rate: float = 1.0
+
+    # Profile requests with pyinstrument
+    profiling_enabled: bool = False
+    # Fraction of requests to profile
+    profiling_sample_rate: float = 0.0
+    # Requests with X-Profile header equal to this token are always profiled
+    profiling_token: Optional[str] = None
+    # Seconds between samples
+    profiling_interval: float = 0.001
+    # Profiles are saved to a directory per route, the newest ones are kept
+    profiling_dir: Path = TEMP_DIR / "profiles"
+    profiling_max_profiles: int = 20
+
     # Variables for the database
     db_host: str = "localhost"
     db_port: int = 27017
@@ -46,6 +115,10 @@ class Settings(BaseSettings):
     db_pass: str = "ideanest_assesment"
     db_base: str = "admin"
     db_echo: bool = False
+    # Commands slower than this (in seconds) are logged with their filter
+    db_slow_command_threshold: float = 0.1
+    # Requests running more commands are logged as warnings
+    db_request_commands_warning: int = 50
 
     # Variables for Redis
     redis_host: str = "ideanest_assesment-redis"
@@ -53,6 +126,17 @@ class Settings(BaseSettings):
     redis_user: Optional[str] = None
     redis_pass: Optional[str] = None
     redis_base: Optional[int] = None
+    # Connections per worker
+    redis_pool_size: int = 50
+    # Seconds to wait for a free connection when the pool is exhausted
+    redis_pool_timeout: float = 5.0
+    redis_socket_timeout: float = 5.0
+    redis_socket_connect_timeout: float = 2.0
+    # Seconds a connection may stay idle before it's checked with PING
+    redis_health_check_interval: int = 30
+    # Values written through the API longer than threshold bytes get compressed
+    redis_compression: RedisCompression = RedisCompression.NONE
+    redis_compression_threshold: int = 1024
 
     # Variables for RabbitMQ
     rabbit_host: str = "ideanest_assesment-rmq"
@@ -64,6 +148,44 @@ class Settings(BaseSettings):
     rabbit_pool_size: int = 2
     rabbit_channel_pool_size: int = 10
 
+    # Threads publishing celery tasks from request handlers
+    task_dispatch_workers: int = 4
+    # How many publishes may wait for a free thread
+    task_dispatch_buffer_size: int = 1000
+    # Seconds to wait for a free slot before rejecting a publish
+    task_dispatch_wait_timeout: float = 1.0
+    # Enqueues slower than this (in seconds) are logged
+    task_dispatch_slow_threshold: float = 0.1
+
+    # Variables for Celery
+    celery_profile: CeleryProfile = CeleryProfile.DEFAULT
+    # Tasks reserved per worker process by the performance profile.
+    # With late acks, reserved tasks wait unacknowledged behind a slow one.
+    celery_prefetch_multiplier: int = 1
+    celery_visibility_timeout: int = 3600
+
+    # Variables for the outbox relay
+    outbox_batch_size: int = 100
+    # Seconds between polls when the outbox is drained
+    outbox_poll_interval: float = 1.0
+    # Seconds a claimed message is hidden from other relays
+    outbox_claim_timeout: float = 60.0
+    outbox_max_attempts: int = 10
+
+    # Variables for rate limiting of auth endpoints
+    rate_limit_enabled: bool = True
+    # Requests allowed per period from one IP address
+    rate_limit_ip_requests: int = 60
+    # Requests allowed per period for one account
+    rate_limit_account_requests: int = 10
+    # Length of the period, in seconds
+    rate_limit_period: float = 60.0
+    # Denied keys remembered by a worker without asking redis
+    rate_limit_deny_cache_size: int = 10000
+
+    # Seconds organization roles of a user stay cached in redis
+    role_cache_ttl: int = 3600
+
     @property
     def db_url(self) -> URL:
         """
@@ -120,6 +242,8 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24 * 7
+    # Registered emails remembered by a worker to reject signups without hashing
+    known_emails_cache_size: int = 100000
 
     # SENDGRID_API_KEY
     sendgrid_api_key: str = "SENDGRID_API_KEY"
@@ -0,0 +1,113 @@
+from typing import Any, Optional
+
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.instrumentation.aio_pika import AioPikaInstrumentor
+from opentelemetry.instrumentation.celery import CeleryInstrumentor
+from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+from opentelemetry.instrumentation.redis import RedisInstrumentor
+from opentelemetry.sdk.resources import (
+    DEPLOYMENT_ENVIRONMENT,
+    SERVICE_NAME,
+    TELEMETRY_SDK_LANGUAGE,
+    Resource,
+)
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import get_tracer_provider, set_tracer_provider
+
+from ideanest_assesment.settings import settings
+
+
+def create_tracer_provider(
+    service_name: str,
+    exporter: Optional[SpanExporter] = None,
+) -> TracerProvider:
+    """
+    Create tracer provider configured from settings.
+
+    Traces are sampled at ``opentelemetry_sample_rate`` where they start;
+    downstream services follow the decision propagated with the context.
+
+    :param service_name: name of the traced service.
+    :param exporter: exporter receiving every span as soon as it ends,
+        such as ``InMemorySpanExporter`` in tests. Spans are sent
+        to ``opentelemetry_endpoint`` in batches by default.
+    :return: tracer provider.
+    """
+    tracer_provider = TracerProvider(
+        resource=Resource(
+            attributes={
+                SERVICE_NAME: service_name,
+                TELEMETRY_SDK_LANGUAGE: "python",
+                DEPLOYMENT_ENVIRONMENT: settings.environment,
+            },
+        ),
+        sampler=ParentBased(TraceIdRatioBased(settings.opentelemetry_sample_rate)),
+    )
+    processor: SpanProcessor
+    if exporter is not None:
+        processor = SimpleSpanProcessor(exporter)
+    else:
+        processor = BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=settings.opentelemetry_endpoint, insecure=True),
+        )
+    tracer_provider.add_span_processor(processor)
+    return tracer_provider
+
+
+def instrument_clients(tracer_provider: TracerProvider) -> None:
+    """
+    Trace calls of MongoDB, Redis, RabbitMQ and Celery.
+
+    Celery and aio-pika instrumentations pass the trace context
+    in task headers and AMQP message headers, so spans of consumers
+    continue the trace of the publisher.
+
+    MongoDB clients created before this call are not traced.
+
+    :param tracer_provider: provider of tracers.
+    """
+    PymongoInstrumentor().instrument(tracer_provider=tracer_provider)
+    RedisInstrumentor().instrument(tracer_provider=tracer_provider)
+    AioPikaInstrumentor().instrument(tracer_provider=tracer_provider)
+    CeleryInstrumentor().instrument(tracer_provider=tracer_provider)
+
+
+def uninstrument_clients() -> None:
+    """Stop tracing calls of MongoDB, Redis, RabbitMQ and Celery."""
+    PymongoInstrumentor().uninstrument()
+    RedisInstrumentor().uninstrument()
+    AioPikaInstrumentor().uninstrument()
+    CeleryInstrumentor().uninstrument()
+
+
+def setup_worker_opentelemetry(**kwargs: Any) -> None:  # pragma: no cover
+    """
+    Enables opentelemetry in a celery worker process.
+
+    It's connected to ``worker_process_init`` signal,
+    because the exporter's thread doesn't survive forking.
+
+    :param kwargs: arguments of the signal.
+    """
+    if not settings.opentelemetry_endpoint:
+        return
+    tracer_provider = create_tracer_provider("ideanest_assesment-worker")
+    instrument_clients(tracer_provider)
+    set_tracer_provider(tracer_provider)
+
+
+def shutdown_worker_opentelemetry(**kwargs: Any) -> None:  # pragma: no cover
+    """
+    Sends spans left in a celery worker process before it exits.
+
+    :param kwargs: arguments of the signal.
+    """
+    tracer_provider = get_tracer_provider()
+    if isinstance(tracer_provider, TracerProvider):
+        tracer_provider.shutdown()
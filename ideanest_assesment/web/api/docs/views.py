@@ -5,10 +5,27 @@ from fastapi.openapi.docs import (
     get_swagger_ui_oauth2_redirect_html,
 )
 from fastapi.responses import HTMLResponse
+from starlette.responses import Response
+
+from ideanest_assesment.web.static import static_url
 
 router = APIRouter()
 
 
+@router.get("/openapi.json", include_in_schema=False)
+async def openapi(request: Request) -> Response:
+    """
+    OpenAPI document.
+
+    The document is loaded once, see
+    :class:`~ideanest_assesment.web.openapi.OpenAPIDocument`.
+
+    :param request: current request.
+    :return: the document.
+    """
+    return request.app.state.openapi.response(request)
+
+
 @router.get("/docs", include_in_schema=False)
 async def swagger_ui_html(request: Request) -> HTMLResponse:
     """
@@ -19,11 +36,11 @@ async def swagger_ui_html(request: Request) -> HTMLResponse:
     """
     title = request.app.title
     return get_swagger_ui_html(
-        openapi_url=request.app.openapi_url,
+        openapi_url=request.app.url_path_for("openapi"),
         title=f"{title} - Swagger UI",
         oauth2_redirect_url=str(request.url_for("swagger_ui_redirect")),
-        swagger_js_url="/static/docs/swagger-ui-bundle.js",
-        swagger_css_url="/static/docs/swagger-ui.css",
+        swagger_js_url=static_url(request, "docs/swagger-ui-bundle.js"),
+        swagger_css_url=static_url(request, "docs/swagger-ui.css"),
     )
 
 
@@ -47,7 +64,7 @@ async def redoc_html(request: Request) -> HTMLResponse:
     """
     title = request.app.title
     return get_redoc_html(
-        openapi_url=request.app.openapi_url,
+        openapi_url=request.app.url_path_for("openapi"),
         title=f"{title} - ReDoc",
-        redoc_js_url="/static/docs/redoc.standalone.js",
+        redoc_js_url=static_url(request, "docs/redoc.standalone.js"),
     )
@@ -0,0 +1,20 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class DependencyHealthDTO(BaseModel):
+    """DTO for the result of a dependency check."""
+
+    healthy: bool
+    latency_ms: float
+    error: Optional[str] = None
+
+
+class ReadinessDTO(BaseModel):
+    """DTO for readiness of the worker."""
+
+    ready: bool
+    # Seconds since the dependencies were checked, None before the first check.
+    age: Optional[float]
+    dependencies: Dict[str, DependencyHealthDTO]
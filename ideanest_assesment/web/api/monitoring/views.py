@@ -1,4 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette import status
+
+from ideanest_assesment.services.health.checker import HealthChecker
+from ideanest_assesment.services.health.dependency import get_health_checker
+from ideanest_assesment.services.metrics.metrics import render_metrics
+from ideanest_assesment.web.api.monitoring.schema import (
+    DependencyHealthDTO,
+    ReadinessDTO,
+)
 
 router = APIRouter()
 
@@ -10,3 +21,68 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get("/health/live")
+async def liveness() -> None:
+    """
+    Liveness probe.
+
+    It returns 200 while the worker's event loop responds,
+    dependencies aren't checked: their outage isn't fixed by a restart.
+    """
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessDTO,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessDTO}},
+)
+async def readiness(
+    checker: HealthChecker = Depends(get_health_checker),
+) -> ORJSONResponse:
+    """
+    Readiness probe.
+
+    Returns results of the last background check of MongoDB, Redis
+    and RabbitMQ without contacting them. The status is 503 until
+    the first check passed, when a dependency is unhealthy or when
+    checks stopped updating.
+
+    :param checker: health checker of the worker.
+    :return: readiness with latency of every dependency.
+    """
+    report = checker.report
+    readiness_dto = ReadinessDTO(
+        ready=checker.is_ready(),
+        age=report.age if report else None,
+        dependencies={
+            name: DependencyHealthDTO(
+                healthy=result.healthy,
+                latency_ms=result.latency * 1000,
+                error=result.error,
+            )
+            for name, result in (report.dependencies.items() if report else [])
+        },
+    )
+    return ORJSONResponse(
+        readiness_dto.model_dump(),
+        status_code=(
+            status.HTTP_200_OK
+            if readiness_dto.ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Exposes metrics in Prometheus text format.
+
+    Under gunicorn metrics of all workers are aggregated.
+
+    :return: response with metrics.
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,7 +1,11 @@
 from bson import ObjectId
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
-from ideanest_assesment.db.models.organization import OrganizationMember
+from ideanest_assesment.db.models.organization import (
+    Organization,
+    OrganizationMember,
+    OrganizationPage,
+)
 
 
 class OrganizationCreate(BaseModel):
@@ -16,13 +20,85 @@ class OrganizationUpdate(BaseModel):
     name: str | None = None
     description: str | None = None
 
+class MemberUserResponse(BaseModel):
+    """Schema for the user of a member, without credentials."""
+
+    id: str = Field(..., alias="_id")
+    name: str
+    email: str
+
+
+class OrganizationMemberResponse(BaseModel):
+    """Schema for a member of an organization."""
+
+    user: MemberUserResponse
+    access_level: str
+
+    @classmethod
+    def from_member(cls, member: OrganizationMember) -> "OrganizationMemberResponse":
+        """
+        Build response from a member.
+
+        :param member: member of an organization.
+        :return: the response.
+        """
+        user = member.user
+        return cls(
+            user=MemberUserResponse(
+                _id=str(user.id),
+                name=user.name,
+                email=user.email,
+            ),
+            access_level=member.access_level,
+        )
+
+
 class OrganizationResponse(BaseModel):
     """Schema for the organization response."""
 
     id: str = Field(..., alias="_id")
     name: str
     description: str
-    members: list[OrganizationMember] = []
+    members: list[OrganizationMemberResponse] = []
+
+    @classmethod
+    def from_organization(cls, organization: Organization) -> "OrganizationResponse":
+        """
+        Build response from an organization.
+
+        :param organization: the organization.
+        :return: the response.
+        """
+        return cls(
+            _id=str(organization.id),
+            name=organization.name,
+            description=organization.description,
+            members=[
+                OrganizationMemberResponse.from_member(member)
+                for member in organization.members
+            ],
+        )
+
+
+class OrganizationSearchResponse(BaseModel):
+    """Schema for a page of found organizations."""
+
+    items: list[OrganizationResponse]
+    # Pass it as cursor to get the next page, null on the last page.
+    next_cursor: str | None = None
+
+    @classmethod
+    def from_page(cls, page: OrganizationPage) -> "OrganizationSearchResponse":
+        """
+        Build response from a page of found organizations.
+
+        :param page: the page.
+        :return: the response.
+        """
+        return cls(
+            items=[OrganizationResponse.from_organization(item) for item in page.items],
+            next_cursor=page.next_cursor,
+        )
 
 
 class OrganizationInvite(BaseModel):
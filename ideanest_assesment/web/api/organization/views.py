@@ -1,18 +1,49 @@
-from fastapi import APIRouter, Depends
+from typing import Iterable, Optional, Union
+
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.responses import Response
 
 from ideanest_assesment.auth.auth import get_current_active_user
 from ideanest_assesment.db.dao.organization_dao import OrganizationDAO
+from ideanest_assesment.db.models.organization import (
+    Organization,
+    OrganizationRevision,
+    SearchMode,
+)
 from ideanest_assesment.db.models.user import User
+from ideanest_assesment.services.roles.cache import RoleCache
+from ideanest_assesment.services.roles.dependency import (
+    OrganizationAccess,
+    get_role_cache,
+)
 from ideanest_assesment.web.api.organization.schema import (
     OrganizationCreate,
     OrganizationInvite,
     OrganizationResponse,
+    OrganizationSearchResponse,
     OrganizationUpdate,
 )
+from ideanest_assesment.web.responses import (
+    REVALIDATE_HEADERS,
+    ModelResponse,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
 
 router = APIRouter()
 
 
+def _revisions_etag(
+    organizations: Iterable[Union[Organization, OrganizationRevision]],
+) -> str:
+    return make_etag(
+        part
+        for organization in organizations
+        for part in (organization.id, organization.revision_id)
+    )
+
+
 @router.post(
     "/",
     dependencies=[Depends(get_current_active_user)],
@@ -20,61 +51,147 @@ router = APIRouter()
 async def create_organization_endpoint(
     organization_data: OrganizationCreate,
     current_user: User = Depends(get_current_active_user),
+    role_cache: RoleCache = Depends(get_role_cache),
 ):
     """Create a new organization."""
-    organization =  await OrganizationDAO.create_organization(organization_data, current_user)
+    organization = await OrganizationDAO.create_organization(
+        organization_data,
+        current_user,
+        role_cache,
+    )
     return {"id": f"{organization.id}"}
 
+
 @router.get(
-    "/{organization_id}",
+    "/search",
+    response_model=OrganizationSearchResponse,
     dependencies=[Depends(get_current_active_user)],
 )
-async def get_organization_endpoint(organization_id: str):
-    """Retrieve an organization by its ID."""
-    return await OrganizationDAO.get_organization(organization_id)
+async def search_organizations_endpoint(
+    q: str = Query(min_length=1, max_length=100),
+    mode: SearchMode = SearchMode.prefix,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    role_cache: RoleCache = Depends(get_role_cache),
+) -> ModelResponse:
+    """
+    Search organizations of the current user by name prefix or keywords.
+
+    Pass `next_cursor` of a page as `cursor` to get the next one.
+    """
+    roles = await role_cache.roles(current_user.id)  # type: ignore
+    page = await OrganizationDAO.search_organizations(q, mode, limit, cursor, roles)
+    return ModelResponse(OrganizationSearchResponse.from_page(page))
+
+
+@router.get(
+    "/{organization_id}",
+    response_model=OrganizationResponse,
+    dependencies=[Depends(OrganizationAccess())],
+)
+async def get_organization_endpoint(organization_id: str, request: Request) -> Response:
+    """
+    Retrieve an organization by its ID.
+
+    Sends 304 when If-None-Match has the current ETag,
+    the revision is checked without loading the organization.
+    """
+    if request.headers.get("if-none-match"):
+        revision = await OrganizationDAO.get_organization_revision(organization_id)
+        etag = _revisions_etag([revision])
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    organization = await OrganizationDAO.get_organization(organization_id)
+    etag = _revisions_etag([organization])
+    return ModelResponse(
+        OrganizationResponse.from_organization(organization),
+        headers={"ETag": etag, **REVALIDATE_HEADERS},
+    )
 
 
 @router.get(
     "/",
+    response_model=list[OrganizationResponse],
     dependencies=[Depends(get_current_active_user)],
 )
-async def get_all_organizations_endpoint():
-    """Retrieve all organizations."""
-    return await OrganizationDAO.get_all_organizations()
+async def get_all_organizations_endpoint(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    role_cache: RoleCache = Depends(get_role_cache),
+) -> Response:
+    """
+    Retrieve organizations of the current user.
 
+    Sends 304 when If-None-Match has the current ETag,
+    only revisions are loaded to check it.
+    """
+    roles = await role_cache.roles(current_user.id)  # type: ignore
+    if request.headers.get("if-none-match"):
+        revisions = await OrganizationDAO.get_all_organization_revisions(roles)
+        etag = _revisions_etag(revisions)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    organizations = await OrganizationDAO.get_all_organizations(roles)
+    etag = _revisions_etag(organizations)
+    return ModelResponse(
+        [
+            OrganizationResponse.from_organization(organization)
+            for organization in organizations
+        ],
+        headers={"ETag": etag, **REVALIDATE_HEADERS},
+    )
 
 
 @router.put(
     "/{organization_id}",
-    dependencies=[Depends(get_current_active_user)],
+    response_model=OrganizationResponse,
+    dependencies=[Depends(OrganizationAccess("admin"))],
 )
 async def update_organization_endpoint(
     organization_id: str,
     organization_data: OrganizationUpdate,
-):
+) -> ModelResponse:
     """Update an organization by its ID."""
-    return await OrganizationDAO.update_organization(
+    organization = await OrganizationDAO.update_organization(
         organization_id,
         organization_data,
     )
+    etag = _revisions_etag([organization])
+    return ModelResponse(
+        OrganizationResponse.from_organization(organization),
+        headers={"ETag": etag, **REVALIDATE_HEADERS},
+    )
 
 
 @router.delete(
     "/{organization_id}",
-    dependencies=[Depends(get_current_active_user)],
+    dependencies=[Depends(OrganizationAccess("admin"))],
 )
-async def delete_organization_endpoint(organization_id: str) -> None:
+async def delete_organization_endpoint(
+    organization_id: str,
+    role_cache: RoleCache = Depends(get_role_cache),
+) -> None:
     """Delete an organization by its ID."""
-    await OrganizationDAO.delete_organization(organization_id)
+    await OrganizationDAO.delete_organization(organization_id, role_cache)
     return {"message": "Organization deleted successfully"}
 
 
-@router.post("/{organization_id}/invite")
+@router.post(
+    "/{organization_id}/invite",
+    dependencies=[Depends(OrganizationAccess("admin"))],
+)
 async def invite_user_endpoint(
     organization_id: str,
     invite_data: OrganizationInvite,
     current_user: User = Depends(get_current_active_user),
+    role_cache: RoleCache = Depends(get_role_cache),
 ):
     """Invites user to Organization."""
-    await OrganizationDAO.invite_user(organization_id, invite_data, current_user)
+    await OrganizationDAO.invite_user(
+        organization_id,
+        invite_data,
+        current_user,
+        role_cache,
+    )
     return {"message": "User invited successfully"}
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt
 
 
 class RedisValueDTO(BaseModel):
@@ -8,3 +8,35 @@ class RedisValueDTO(BaseModel):
 
     key: str
     value: Optional[str]
+
+
+class RedisExpiringValueDTO(RedisValueDTO):
+    """DTO for redis values with optional time to live in seconds."""
+
+    ttl: Optional[PositiveInt] = None
+
+
+class RedisKeysDTO(BaseModel):
+    """DTO for reading many redis keys at once."""
+
+    keys: List[str] = Field(min_length=1)
+
+
+class RedisValuesDTO(BaseModel):
+    """DTO for writing many redis values at once."""
+
+    items: List[RedisExpiringValueDTO] = Field(min_length=1)
+
+
+class RedisPoolStatsDTO(BaseModel):
+    """DTO for redis connection pool usage. Times are in seconds."""
+
+    max_connections: int
+    in_use: int
+    idle: int
+    checkouts: int
+    checkout_errors: int
+    avg_checkout_time: float
+    max_checkout_time: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,44 +1,225 @@
-from fastapi import APIRouter
+import json
+from typing import Any, AsyncGenerator, List, Optional
+
+from fastapi import APIRouter, Query
 from fastapi.param_functions import Depends
-from redis.asyncio import ConnectionPool, Redis
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
 
-from ideanest_assesment.services.redis.dependency import get_redis_pool
-from ideanest_assesment.web.api.redis.schema import RedisValueDTO
+from ideanest_assesment.services.redis.codec import ValueCodec
+from ideanest_assesment.services.redis.dependency import (
+    get_redis,
+    get_redis_codec,
+    get_redis_pool,
+)
+from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
+from ideanest_assesment.web.api.redis.schema import (
+    RedisKeysDTO,
+    RedisPoolStatsDTO,
+    RedisValueDTO,
+    RedisValuesDTO,
+)
 
 router = APIRouter()
 
+# Number of keys fetched by one MGET while streaming.
+STREAM_CHUNK_SIZE = 500
+
+
+def _ndjson_line(entry: dict[str, Any]) -> str:
+    return json.dumps(entry) + "\n"
+
+
+def _decode(codec: ValueCodec, value: Optional[bytes]) -> Optional[str]:
+    value = codec.decode(value)
+    # Values that aren't valid UTF-8 are escaped instead of failing
+    # the whole response.
+    return None if value is None else value.decode(errors="backslashreplace")
+
+
+def _decode_key(key: bytes) -> str:
+    return key.decode(errors="backslashreplace")
+
 
 @router.get("/", response_model=RedisValueDTO)
 async def get_redis_value(
     key: str,
-    redis_pool: ConnectionPool = Depends(get_redis_pool),
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
 ) -> RedisValueDTO:
     """
     Get value from redis.
 
     :param key: redis key, to get data from.
-    :param redis_pool: redis connection pool.
+    :param redis: redis client.
+    :param codec: codec for redis values.
     :returns: information from redis.
     """
-    async with Redis(connection_pool=redis_pool) as redis:
-        redis_value = await redis.get(key)
+    redis_value = await redis.get(key)
     return RedisValueDTO(
         key=key,
-        value=redis_value,
+        value=_decode(codec, redis_value),
     )
 
 
 @router.put("/")
 async def set_redis_value(
     redis_value: RedisValueDTO,
-    redis_pool: ConnectionPool = Depends(get_redis_pool),
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
 ) -> None:
     """
     Set value in redis.
 
     :param redis_value: new value data.
-    :param redis_pool: redis connection pool.
+    :param redis: redis client.
+    :param codec: codec for redis values.
     """
     if redis_value.value is not None:
-        async with Redis(connection_pool=redis_pool) as redis:
-            await redis.set(name=redis_value.key, value=redis_value.value)
+        await redis.set(name=redis_value.key, value=codec.encode(redis_value.value))
+
+
+@router.post("/mget", response_model=List[RedisValueDTO])
+async def get_redis_values(
+    request: RedisKeysDTO,
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
+) -> List[RedisValueDTO]:
+    """
+    Get many values from redis with a single MGET.
+
+    :param request: keys to get data from.
+    :param redis: redis client.
+    :param codec: codec for redis values.
+    :returns: values in the order of requested keys.
+    """
+    redis_values = await redis.mget(request.keys)
+    return [
+        RedisValueDTO(key=key, value=_decode(codec, value))
+        for key, value in zip(request.keys, redis_values)
+    ]
+
+
+@router.post("/mget/stream")
+async def stream_redis_values(
+    request: RedisKeysDTO,
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
+) -> StreamingResponse:
+    """
+    Stream many values from redis as newline delimited JSON.
+
+    Keys are fetched in chunks, so large requests are never
+    buffered as a whole.
+
+    :param request: keys to get data from.
+    :param redis: redis client.
+    :param codec: codec for redis values.
+    :returns: one JSON object per line, in the order of requested keys.
+    """
+
+    async def values() -> AsyncGenerator[str, None]:
+        for start in range(0, len(request.keys), STREAM_CHUNK_SIZE):
+            keys = request.keys[start : start + STREAM_CHUNK_SIZE]
+            redis_values = await redis.mget(keys)
+            yield "".join(
+                _ndjson_line({"key": key, "value": _decode(codec, value)})
+                for key, value in zip(keys, redis_values)
+            )
+
+    return StreamingResponse(values(), media_type="application/x-ndjson")
+
+
+@router.get("/scan")
+async def scan_redis_keys(
+    match: Optional[str] = None,
+    count: int = Query(default=STREAM_CHUNK_SIZE, ge=1, le=10000),
+    cursor: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1),
+    with_values: bool = False,
+    set_key: Optional[str] = None,
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
+) -> StreamingResponse:
+    """
+    Walk redis keys with SCAN and stream them as newline delimited JSON.
+
+    Unlike KEYS, SCAN never blocks redis for long, and keys are sent
+    as soon as they are found. The last line holds the cursor to resume from,
+    it's 0 when the whole keyspace was walked.
+
+    :param match: glob-style pattern of keys.
+    :param count: number of keys redis inspects per call.
+    :param cursor: cursor returned by a previous call.
+    :param limit: stop after a batch brings the number of keys to this value.
+    :param with_values: add values of keys, fetched with one MGET per batch.
+    :param set_key: walk members of this set with SSCAN instead of keys.
+    :param redis: redis client.
+    :param codec: codec for redis values.
+    :returns: one JSON object per key, followed by the cursor.
+    """
+
+    async def entries() -> AsyncGenerator[str, None]:
+        position, found = cursor, 0
+        while True:
+            if set_key is None:
+                position, keys = await redis.scan(position, match=match, count=count)
+            else:
+                position, keys = await redis.sscan(
+                    set_key,
+                    position,
+                    match=match,
+                    count=count,
+                )
+            if with_values and set_key is None and keys:
+                values = await redis.mget(keys)
+                yield "".join(
+                    _ndjson_line(
+                        {"key": _decode_key(key), "value": _decode(codec, value)},
+                    )
+                    for key, value in zip(keys, values)
+                )
+            elif keys:
+                yield "".join(_ndjson_line({"key": _decode_key(key)}) for key in keys)
+            found += len(keys)
+            if position == 0 or (limit is not None and found >= limit):
+                break
+        yield _ndjson_line({"cursor": position})
+
+    return StreamingResponse(entries(), media_type="application/x-ndjson")
+
+
+@router.put("/mset")
+async def set_redis_values(
+    request: RedisValuesDTO,
+    redis: Redis = Depends(get_redis),
+    codec: ValueCodec = Depends(get_redis_codec),
+) -> None:
+    """
+    Set many values in redis in one round-trip.
+
+    Values with ttl expire after the given number of seconds.
+    Items without value are skipped.
+
+    :param request: new values data.
+    :param redis: redis client.
+    :param codec: codec for redis values.
+    """
+    async with redis.pipeline(transaction=False) as pipe:
+        for item in request.items:
+            if item.value is not None:
+                pipe.set(name=item.key, value=codec.encode(item.value), ex=item.ttl)
+        await pipe.execute()
+
+
+@router.get("/pool", response_model=RedisPoolStatsDTO)
+async def get_redis_pool_stats(
+    redis_pool: InstrumentedConnectionPool = Depends(get_redis_pool),
+) -> RedisPoolStatsDTO:
+    """
+    Get usage of the redis connection pool of this worker.
+
+    :param redis_pool: redis connection pool.
+    :returns: pool statistics.
+    """
+    return RedisPoolStatsDTO.model_validate(redis_pool.stats())
@@ -2,7 +2,7 @@ from typing import Dict
 
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from redis.asyncio import ConnectionPool
+from redis.asyncio import Redis
 
 from ideanest_assesment.auth.auth import (
     authenticate_user,
@@ -12,19 +12,34 @@ from ideanest_assesment.auth.auth import (
     signup,
 )
 from ideanest_assesment.db.models.user import User
-from ideanest_assesment.services.redis.dependency import get_redis_pool
+from ideanest_assesment.services.ratelimit.dependency import (
+    RateLimit,
+    form_username,
+    json_email,
+    refresh_token_subject,
+)
+from ideanest_assesment.services.redis.dependency import get_redis
 from ideanest_assesment.web.api.user.schema import Token, UserCreate, UserResponse
+from ideanest_assesment.web.responses import ModelResponse
 
 router = APIRouter()
 
 
-@router.post("/signup", response_model=Dict)
+@router.post(
+    "/signup",
+    response_model=Dict,
+    dependencies=[Depends(RateLimit("signup", account=json_email))],
+)
 async def signup_endpoint(user_data: UserCreate) -> Dict:
     """Create a new user account."""
     return await signup(user_data.model_dump())
 
 
-@router.post("/token", response_model=Token)
+@router.post(
+    "/token",
+    response_model=Token,
+    dependencies=[Depends(RateLimit("token", account=form_username))],
+)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
@@ -32,25 +47,32 @@ async def login_for_access_token(
     return await authenticate_user(form_data)
 
 
-@router.post("/refresh-token", response_model=Token)
-async def refresh_token_endpoint(refresh_token: str) -> Token:
+@router.post(
+    "/refresh-token",
+    response_model=Token,
+    dependencies=[Depends(RateLimit("refresh-token", account=refresh_token_subject))],
+)
+async def refresh_token_endpoint(
+    refresh_token: str,
+    redis: Redis = Depends(get_redis),
+) -> Token:
     """Refresh an access token."""
-    return await new_refresh_token(refresh_token)
+    return await new_refresh_token(refresh_token, redis)
 
 
 @router.post("/revoke-refresh-token/")
 async def revoke_refresh_token_endpoint(
     refresh_token: str,
     current_user: User = Depends(get_current_active_user),
-    redis_pool: ConnectionPool = Depends(get_redis_pool),
+    redis: Redis = Depends(get_redis),
 ):
     """Revoke a refresh token."""
-    return await revoke_refresh_token(refresh_token, current_user, redis_pool)
+    return await revoke_refresh_token(refresh_token, current_user, redis)
 
 
 @router.get("/users/me", response_model=UserResponse)
 async def read_users_me(
     current_user: User = Depends(get_current_active_user),
-) -> UserResponse:
+) -> ModelResponse:
     """Retrieve the current user's information."""
-    return current_user
+    return ModelResponse(current_user, include=set(UserResponse.model_fields))
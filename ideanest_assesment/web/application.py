@@ -2,11 +2,18 @@ from importlib import metadata
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.responses import UJSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 
+from ideanest_assesment.log import configure_logging
+from ideanest_assesment.settings import settings
 from ideanest_assesment.web.api.router import api_router
 from ideanest_assesment.web.lifespan import lifespan_setup
+from ideanest_assesment.web.middleware.compression import CompressionMiddleware
+from ideanest_assesment.web.middleware.db_timing import DbTimingMiddleware
+from ideanest_assesment.web.middleware.metrics import MetricsMiddleware
+from ideanest_assesment.web.middleware.profiling import ProfilingMiddleware
+from ideanest_assesment.web.openapi import OpenAPIDocument
+from ideanest_assesment.web.static import PrecompressedStaticFiles
 
 APP_ROOT = Path(__file__).parent.parent
 
@@ -19,20 +26,51 @@ def get_app() -> FastAPI:
 
     :return: application.
     """
+    configure_logging()
     app = FastAPI(
         title="ideanest_assesment",
         version=metadata.version("ideanest_assesment"),
         lifespan=lifespan_setup,
         docs_url=None,
         redoc_url=None,
-        openapi_url="/api/openapi.json",
-        default_response_class=UJSONResponse,
+        # Served from memory by the docs router.
+        openapi_url=None,
+        default_response_class=ORJSONResponse,
     )
 
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        zstd_level=settings.compression_zstd_level,
+    )
+    app.add_middleware(
+        DbTimingMiddleware,
+        commands_warning=settings.db_request_commands_warning,
+    )
+    if settings.profiling_enabled:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.profiling_dir,
+            sample_rate=settings.profiling_sample_rate,
+            token=settings.profiling_token,
+            interval=settings.profiling_interval,
+            max_profiles=settings.profiling_max_profiles,
+        )
+    if settings.metrics_enabled:
+        # Added last to measure whole requests, compression included.
+        app.add_middleware(MetricsMiddleware)
+
     # Main router for the API.
     app.include_router(router=api_router, prefix="/api")
     # Adds static directory.
     # This directory is used to access swagger files.
-    app.mount("/static", StaticFiles(directory=APP_ROOT / "static"), name="static")
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(directory=APP_ROOT / "static"),
+        name="static",
+    )
+    app.state.openapi = OpenAPIDocument.load(app)
 
     return app
@@ -1,18 +1,53 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Union
 
 import beanie
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.trace import set_tracer_provider
+from pymongo import monitoring
 
 from ideanest_assesment.db.models import load_all_models
+from ideanest_assesment.db.monitoring import CommandTimingListener
+from ideanest_assesment.services.health.lifespan import (
+    init_health_checker,
+    shutdown_health_checker,
+)
+from ideanest_assesment.services.metrics.lifespan import init_metrics, shutdown_metrics
+from ideanest_assesment.services.metrics.listeners import MongoPoolMetrics
+from ideanest_assesment.services.outbox.lifespan import (
+    init_outbox_relay,
+    shutdown_outbox_relay,
+)
 from ideanest_assesment.services.rabbit.lifespan import init_rabbit, shutdown_rabbit
+from ideanest_assesment.services.ratelimit.lifespan import init_rate_limiter
 from ideanest_assesment.services.redis.lifespan import init_redis, shutdown_redis
+from ideanest_assesment.services.roles.lifespan import init_role_cache
+from ideanest_assesment.services.tasks.lifespan import (
+    init_task_dispatcher,
+    shutdown_task_dispatcher,
+)
 from ideanest_assesment.settings import settings
+from ideanest_assesment.telemetry import (
+    create_tracer_provider,
+    instrument_clients,
+    uninstrument_clients,
+)
 
 
 async def _setup_db(app: FastAPI) -> None:
-    client = AsyncIOMotorClient(str(settings.db_url))  # type: ignore
+    listeners: List[
+        Union[monitoring.CommandListener, monitoring.ConnectionPoolListener]
+    ] = [
+        CommandTimingListener(slow_threshold=settings.db_slow_command_threshold),
+    ]
+    if settings.metrics_enabled:
+        listeners.append(MongoPoolMetrics())
+    client = AsyncIOMotorClient(  # type: ignore
+        str(settings.db_url),
+        event_listeners=listeners,
+    )
     app.state.db_client = client
     await beanie.init_beanie(
         database=client[settings.db_base],
@@ -20,6 +55,48 @@ async def _setup_db(app: FastAPI) -> None:
     )
 
 
+def setup_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Enables opentelemetry instrumentation.
+
+    Must be called before the database client is created.
+
+    :param app: current application.
+    """
+    if not settings.opentelemetry_endpoint:
+        return
+
+    tracer_provider = create_tracer_provider("ideanest_assesment")
+    excluded_endpoints = [
+        app.url_path_for("health_check"),
+        app.url_path_for("liveness"),
+        app.url_path_for("readiness"),
+        app.url_path_for("metrics"),
+    ]
+    FastAPIInstrumentor().instrument_app(
+        app,
+        tracer_provider=tracer_provider,
+        excluded_urls=",".join(excluded_endpoints),
+    )
+    instrument_clients(tracer_provider)
+    set_tracer_provider(tracer_provider=tracer_provider)
+    app.state.tracer_provider = tracer_provider
+
+
+def stop_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Disables opentelemetry instrumentation and sends remaining spans.
+
+    :param app: current application.
+    """
+    if not settings.opentelemetry_endpoint:
+        return
+
+    FastAPIInstrumentor().uninstrument_app(app)
+    uninstrument_clients()
+    app.state.tracer_provider.shutdown()
+
+
 @asynccontextmanager
 async def lifespan_setup(
     app: FastAPI,
@@ -35,11 +112,25 @@ async def lifespan_setup(
     """
 
     app.middleware_stack = None
+    setup_opentelemetry(app)
     await _setup_db(app)
     init_redis(app)
+    init_rate_limiter(app)
+    init_role_cache(app)
     init_rabbit(app)
+    init_task_dispatcher(app)
+    init_outbox_relay(app)
+    if settings.metrics_enabled:
+        init_metrics(app)
+    init_health_checker(app)
     app.middleware_stack = app.build_middleware_stack()
 
     yield
+    await shutdown_health_checker(app)
+    if settings.metrics_enabled:
+        await shutdown_metrics(app)
+    await shutdown_outbox_relay(app)
+    await shutdown_task_dispatcher(app)
     await shutdown_redis(app)
     await shutdown_rabbit(app)
+    stop_opentelemetry(app)
@@ -0,0 +1 @@
+"""Middlewares of the application."""
@@ -0,0 +1,310 @@
+import zlib
+from typing import Any, Callable, Dict, Optional, Protocol, TypeVar
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+# Responses without a body or with a part of it.
+UNCOMPRESSED_STATUSES = frozenset((204, 206, 304))
+
+
+def uncompressed(endpoint: F) -> F:
+    """
+    Mark an endpoint whose responses mustn't be compressed.
+
+    >>> @router.get("/events")
+    >>> @uncompressed
+    >>> async def handler() -> StreamingResponse:
+
+    :param endpoint: route handler.
+    :return: the same handler.
+    """
+    endpoint.__uncompressed__ = True  # type: ignore
+    return endpoint
+
+
+class Compressor(Protocol):
+    """Incremental compressor of a response body."""
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Compress a chunk and flush it, so the client can decode it at once.
+
+        :param chunk: part of the body.
+        :return: compressed data.
+        """
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """
+        Compress the last chunk and end the stream.
+
+        :param chunk: last part of the body.
+        :return: compressed data.
+        """
+
+
+class GzipCompressor:
+    """Gzip compressor."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """See :meth:`Compressor.compress`."""
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH,
+        )
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """See :meth:`Compressor.finish`."""
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Brotli compressor."""
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """See :meth:`Compressor.compress`."""
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """See :meth:`Compressor.finish`."""
+        return self._compressor.process(chunk) + self._compressor.finish()
+
+
+class ZstdCompressor:
+    """Zstandard compressor."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        """See :meth:`Compressor.compress`."""
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+        )
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        """See :meth:`Compressor.finish`."""
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse Accept-Encoding header.
+
+    :param header: header value.
+    :return: quality of every listed encoding.
+    """
+    encodings = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with zstd, brotli or gzip.
+
+    The encoding is negotiated with ``Accept-Encoding``: zstd is preferred,
+    then brotli, then gzip. Only text-like responses are compressed;
+    responses that already have ``Content-Encoding``, responses of endpoints
+    marked with :func:`uncompressed` and complete bodies smaller than
+    ``minimum_size`` are sent as is.
+
+    Streaming bodies are compressed chunk by chunk, every chunk is flushed,
+    so clients get data as soon as the handler produces it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.factories: Dict[str, Callable[[], Compressor]] = {
+            "zstd": lambda: ZstdCompressor(zstd_level),
+            "br": lambda: BrotliCompressor(brotli_quality),
+            "gzip": lambda: GzipCompressor(gzip_level),
+        }
+
+    def choose_encoding(self, scope: Scope) -> Optional[str]:
+        """
+        Choose encoding accepted by the client.
+
+        :param scope: current request scope.
+        :return: name of the encoding, if any is accepted.
+        """
+        accepted = parse_accept_encoding(
+            Headers(scope=scope).get("accept-encoding", ""),
+        )
+        wildcard = accepted.get("*", 0)
+        for encoding in self.factories:
+            if accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle ASGI request.
+
+        :param scope: current request scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(
+            self.app,
+            self.minimum_size,
+            self.choose_encoding(scope),
+            self.factories,
+        )
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    """Compresses a single response."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        encoding: Optional[str],
+        factories: Dict[str, Callable[[], Compressor]],
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.factories = factories
+        self.scope: Scope = {}
+        self.send: Send = _unattached_send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Run the app and compress its response.
+
+        :param scope: current request scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        self.scope = scope
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def is_compressible(self, message: Message) -> bool:
+        """
+        Check whether the response may be compressed.
+
+        Routing adds the endpoint to the scope, so it's known
+        by the time the response starts.
+
+        :param message: response start message.
+        :return: whether the response may be compressed.
+        """
+        headers = Headers(raw=message["headers"])
+        endpoint = self.scope.get("endpoint")
+        return (
+            message["status"] not in UNCOMPRESSED_STATUSES
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            and not getattr(endpoint, "__uncompressed__", False)
+        )
+
+    async def send_compressed(self, message: Message) -> None:
+        """
+        Compress response messages and send them.
+
+        :param message: ASGI message produced by the app.
+        """
+        if message["type"] == "http.response.start":
+            if not self.is_compressible(message):
+                await self.send(message)
+                return
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                await self.send(message)
+                return
+            # Headers depend on the first chunk of the body.
+            self.start_message = message
+        elif message["type"] == "http.response.body" and self.start_message:
+            await self.send_first_body(message)
+        elif message["type"] == "http.response.body" and self.compressor:
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                body = self.compressor.compress(body) if body else b""
+            else:
+                body = self.compressor.finish(body)
+            await self.send({**message, "body": body})
+        else:
+            if self.start_message:
+                # The body isn't sent in body messages, e.g. a file is sent
+                # with pathsend, so the response goes out uncompressed.
+                start_message, self.start_message = self.start_message, None
+                await self.send(start_message)
+            await self.send(message)
+
+    async def send_first_body(self, message: Message) -> None:
+        """
+        Send response headers with the first chunk of the body.
+
+        :param message: first body message.
+        """
+        start_message, self.start_message = self.start_message, None
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self.minimum_size:
+            await self.send(start_message)  # type: ignore
+            await self.send(message)
+            return
+
+        self.compressor = self.factories[self.encoding]()  # type: ignore
+        headers = MutableHeaders(raw=start_message["headers"])  # type: ignore
+        headers["Content-Encoding"] = self.encoding  # type: ignore
+        del headers["Content-Length"]
+        # The representation changed, so a strong validator doesn't hold.
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            body = self.compressor.compress(body)
+        else:
+            body = self.compressor.finish(body)
+            headers["Content-Length"] = str(len(body))
+        await self.send(start_message)  # type: ignore
+        await self.send({**message, "body": body})
+
+
+async def _unattached_send(message: Message) -> None:  # pragma: no cover
+    raise RuntimeError("send awaitable not set")
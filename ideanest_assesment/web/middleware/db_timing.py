@@ -0,0 +1,63 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ideanest_assesment.db.monitoring import track_commands
+
+logger = logging.getLogger(__name__)
+
+
+class DbTimingMiddleware:
+    """
+    Reports MongoDB commands run by each request.
+
+    The number of commands and their total duration are sent
+    in the ``Server-Timing`` header, so they show up in browser
+    dev tools, and logged. Requests running more than
+    ``commands_warning`` commands are logged as warnings,
+    that's usually a query in a loop.
+    """
+
+    def __init__(self, app: ASGIApp, commands_warning: int = 50) -> None:
+        self.app = app
+        self.commands_warning = commands_warning
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle ASGI request.
+
+        :param scope: current request scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_commands() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and stats.commands:
+                    duration = stats.duration * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={duration:.1f};desc="{stats.commands} commands"',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        if not stats.commands:
+            return
+        level = logging.DEBUG
+        if stats.commands > self.commands_warning:
+            level = logging.WARNING
+        logger.log(
+            level,
+            "%s %s ran %d MongoDB commands in %.1f ms",
+            scope["method"],
+            scope["path"],
+            stats.commands,
+            stats.duration * 1000,
+        )
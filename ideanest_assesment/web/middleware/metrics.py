@@ -0,0 +1,107 @@
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ideanest_assesment.services.metrics.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+KNOWN_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"),
+)
+# Label of requests that matched no route, such as 404s.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Get path template of the route that handled a request.
+
+    Templates keep label values bounded: ``/api/organizations/{organization_id}``
+    instead of one value per organization.
+
+    :param scope: scope of a handled request.
+    :return: path template, prefix of a mounted app or ``<unmatched>``.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # Mounted apps, such as static files, don't set the route.
+        return scope.get("root_path") or UNMATCHED_ROUTE
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and concurrency of HTTP requests.
+
+    Requests are labelled with the method and the route template.
+    Labelled metric children are looked up once and cached,
+    so a request costs a few dictionary lookups and metric updates.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._in_progress: Dict[str, Any] = {}
+        self._observers: Dict[
+            Tuple[str, str, int],
+            Tuple[Callable[[float], None], Callable[[], None]],
+        ] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle ASGI request.
+
+        :param scope: current request scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method not in KNOWN_METHODS:
+            method = "OTHER"
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+            self._in_progress[method] = in_progress
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            observe, count = self._observer(method, route_template(scope), status_code)
+            observe(elapsed)
+            count()
+
+    def _observer(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+    ) -> Tuple[Callable[[float], None], Callable[[], None]]:
+        key = (method, route, status_code)
+        observer = self._observers.get(key)
+        if observer is None:
+            observer = (
+                HTTP_REQUEST_DURATION.labels(method, route).observe,
+                HTTP_REQUESTS.labels(method, route, str(status_code)).inc,
+            )
+            self._observers[key] = observer
+        return observer
@@ -0,0 +1,130 @@
+import logging
+import random
+import re
+import secrets
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+from pyinstrument.session import Session
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ideanest_assesment.web.middleware.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# Requests with this header set to the profiling token are always profiled.
+PROFILE_HEADER = "x-profile"
+
+
+def route_directory(route: str) -> str:
+    """
+    Turn route template into a directory name.
+
+    >>> route_directory("/api/organizations/{organization_id}")
+    'api_organizations_{organization_id}'
+
+    :param route: path template of a route.
+    :return: name safe to use in paths.
+    """
+    return re.sub(r"[^\w{}.-]+", "_", route.strip("/")) or "root"
+
+
+class ProfilingMiddleware:
+    """
+    Profiles sampled requests with pyinstrument.
+
+    A ``sample_rate`` fraction of requests is profiled, as well as
+    requests carrying ``X-Profile`` header equal to ``token``.
+    Profiles are saved in speedscope format to a directory per route,
+    open them at https://www.speedscope.app. Only the newest
+    ``max_profiles`` of every route are kept.
+
+    The middleware is added only when profiling is enabled,
+    so it costs nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: Path,
+        sample_rate: float = 0.0,
+        token: Optional[str] = None,
+        interval: float = 0.001,
+        max_profiles: int = 20,
+    ) -> None:
+        self.app = app
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.token = token
+        self.interval = interval
+        self.max_profiles = max_profiles
+
+    def should_profile(self, scope: Scope) -> bool:
+        """
+        Decide whether to profile a request.
+
+        :param scope: current request scope.
+        :return: whether the request is sampled or asked to be profiled.
+        """
+        if self.token:
+            header = Headers(scope=scope).get(PROFILE_HEADER)
+            if header and secrets.compare_digest(header, self.token):
+                return True
+        return random.random() < self.sample_rate  # noqa: S311
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle ASGI request.
+
+        :param scope: current request scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        if scope["type"] != "http" or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Async mode follows the request's task across awaits
+        # and ignores other requests running in the meantime.
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            name = f"{scope['method']}-{status_code}"
+            await anyio.to_thread.run_sync(
+                self._save,
+                session,
+                route_template(scope),
+                name,
+            )
+
+    def _save(self, session: Session, route: str, name: str) -> None:
+        directory = self.directory / route_directory(route)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f")
+        path = directory / f"{timestamp}-{name}.speedscope.json"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(SpeedscopeRenderer().render(session))
+            # Names start with the timestamp, so they sort by age.
+            profiles = sorted(directory.glob("*.speedscope.json"))
+            for old in profiles[: -self.max_profiles]:
+                old.unlink(missing_ok=True)
+        except OSError:
+            logger.exception("Failed to save profile of %s", route)
+            return
+        logger.info("Saved profile of %s to %s", route, path)
@@ -0,0 +1,122 @@
+"""
+OpenAPI document served from memory.
+
+The document is stored in ``ideanest_assesment/openapi.json``, so clients
+may generate code from the repository, and loaded once per worker.
+Regenerate it after changing routes or schemas::
+
+    python -m ideanest_assesment.web.openapi
+"""
+
+import gzip
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import brotli
+import orjson
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ideanest_assesment.web.middleware.compression import parse_accept_encoding
+from ideanest_assesment.web.responses import (
+    REVALIDATE_HEADERS,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+
+SCHEMA_PATH = Path(__file__).parent.parent / "openapi.json"
+
+
+def render_openapi(app: FastAPI) -> bytes:
+    """
+    Generate OpenAPI document of the app.
+
+    :param app: the application.
+    :return: indented JSON, so changes of the stored document are easy to review.
+    """
+    return orjson.dumps(app.openapi(), option=orjson.OPT_INDENT_2) + b"\n"
+
+
+class OpenAPIDocument:
+    """OpenAPI document with its compressed variants."""
+
+    def __init__(self, content: bytes) -> None:
+        """
+        Compress the document.
+
+        :param content: JSON of the document.
+        """
+        self.content = content
+        etag = make_etag([content])
+        # Every encoding is a different representation with its own ETag.
+        # Variants are listed in the order of preference.
+        self.variants: Dict[Optional[str], Tuple[str, bytes]] = {
+            "br": (
+                f'{etag[:-1]}-br"',
+                brotli.compress(content, quality=11),
+            ),
+            "gzip": (
+                f'{etag[:-1]}-gzip"',
+                gzip.compress(content, compresslevel=9, mtime=0),
+            ),
+            None: (etag, content),
+        }
+
+    @classmethod
+    def load(cls, app: FastAPI) -> "OpenAPIDocument":
+        """
+        Load the stored document.
+
+        The document is generated if it isn't stored,
+        e.g. when the app runs from a source tree without it.
+
+        :param app: the application.
+        :return: the document.
+        """
+        try:
+            content = SCHEMA_PATH.read_bytes()
+        except FileNotFoundError:
+            content = render_openapi(app)
+        return cls(content)
+
+    def choose(self, accept_encoding: str) -> Optional[str]:
+        """
+        Choose the encoding accepted by the client.
+
+        :param accept_encoding: value of Accept-Encoding header.
+        :return: the encoding, None for the uncompressed document.
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0)
+        for encoding in self.variants:
+            if encoding and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return None
+
+    def response(self, request: Request) -> Response:
+        """
+        Send the document in the encoding accepted by the client.
+
+        :param request: current request.
+        :return: response with the document.
+        """
+        encoding = self.choose(request.headers.get("accept-encoding", ""))
+        etag, content = self.variants[encoding]
+        if is_not_modified(request, etag):
+            response = not_modified(etag)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        headers = {"ETag": etag, **REVALIDATE_HEADERS}
+        if encoding:
+            # Uncompressed JSON gets Vary from the compression middleware.
+            headers["Content-Encoding"] = encoding
+            headers["Vary"] = "Accept-Encoding"
+        return Response(content, headers=headers, media_type="application/json")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from ideanest_assesment.web.application import get_app
+
+    SCHEMA_PATH.write_bytes(render_openapi(get_app()))
@@ -0,0 +1,116 @@
+import hashlib
+from typing import Any, Iterable, Mapping, Optional, Sequence, Union
+
+from pydantic import BaseModel
+from pydantic.main import IncEx
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients may cache responses with ETag, but must revalidate them.
+REVALIDATE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+class ModelResponse(Response):
+    """
+    Response serializing pydantic models straight to JSON bytes.
+
+    Return it from a handler to skip FastAPI response handling:
+    ``response_model`` validation, ``jsonable_encoder`` and the JSON
+    library. Models, beanie documents included, are serialized by
+    pydantic-core in one pass without building an intermediate dict tree.
+    Output is the same as FastAPI produces: fields use their aliases.
+
+    >>> @router.get("/{organization_id}", response_model=OrganizationResponse)
+    >>> async def handler(organization_id: str) -> ModelResponse:
+    >>>     return ModelResponse(await Organization.get(organization_id))
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Union[BaseModel, Sequence[BaseModel]],
+        include: Optional[IncEx] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        """
+        Create response.
+
+        :param content: model or list of models to send.
+        :param include: fields to send, all fields by default.
+            Use it to send only fields of a response model, e.g.
+            ``include=set(UserResponse.model_fields)``, nested models
+            take a dict like ``{"items": {"__all__": {"id"}}}``.
+        :param status_code: status of the response.
+        :param headers: additional headers.
+        :param background: task to run after the response is sent.
+        """
+        self.include = include
+        super().__init__(content, status_code, headers, None, background)
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize models to JSON.
+
+        :param content: model or list of models.
+        :return: JSON bytes.
+        """
+        if isinstance(content, BaseModel):
+            return self._dump(content)
+        return b"[" + b",".join(self._dump(model) for model in content) + b"]"
+
+    def _dump(self, model: BaseModel) -> bytes:
+        return model.__pydantic_serializer__.to_json(
+            model,
+            include=self.include,
+            by_alias=True,
+        )
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """
+    Build strong ETag from values identifying a representation.
+
+    :param parts: values that change whenever the representation changes,
+        such as document IDs and revisions.
+    :return: quoted ETag.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check If-None-Match header of a request against ETag.
+
+    Weak comparison is used, so ETags weakened by compression match.
+
+    :param request: current request.
+    :param etag: ETag of the current representation.
+    :return: whether the client already has the representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Create 304 Not Modified response.
+
+    :param etag: ETag of the current representation.
+    :return: response without body.
+    """
+    return Response(status_code=304, headers={"ETag": etag, **REVALIDATE_HEADERS})
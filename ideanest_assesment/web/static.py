@@ -0,0 +1,252 @@
+"""
+Static files served precompressed and cached for long.
+
+Compressed variants are built once, ``python -m ideanest_assesment.web.static``
+writes ``.br`` and ``.gz`` files next to the originals, the Docker image
+builds them. Without them files are sent as is and compressed per request
+by :class:`~ideanest_assesment.web.middleware.compression.CompressionMiddleware`.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import brotli
+from starlette.datastructures import Headers, QueryParams
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.routing import Mount
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from ideanest_assesment.web.middleware.compression import (
+    COMPRESSIBLE_TYPES,
+    parse_accept_encoding,
+)
+from ideanest_assesment.web.responses import REVALIDATE_HEADERS
+
+# Encodings of variants by preference and suffixes of their files.
+VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+# Query parameter with the version of a file, see :func:`static_url`.
+VERSION_PARAM = "v"
+# URLs with the current version never change, so they are cached for a year.
+IMMUTABLE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+@dataclass
+class StaticVariant:
+    """File with one representation of a static asset."""
+
+    path: Path
+    stat: os.stat_result
+    etag: str
+
+
+@dataclass
+class StaticAsset:
+    """Static file with its compressed variants."""
+
+    media_type: str
+    version: str
+    identity: StaticVariant
+    variants: Dict[str, StaticVariant] = field(default_factory=dict)
+
+    def choose(self, accept_encoding: str) -> Tuple[Optional[str], StaticVariant]:
+        """
+        Choose the variant accepted by the client.
+
+        :param accept_encoding: value of Accept-Encoding header.
+        :return: encoding and its variant, None for the original file.
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0)
+        for encoding, variant in self.variants.items():
+            if accepted.get(encoding, wildcard) > 0:
+                return encoding, variant
+        return None, self.identity
+
+
+def file_digest(path: Path) -> str:
+    """
+    Hash file contents.
+
+    :param path: path to the file.
+    :return: hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_compressible(path: Path) -> bool:
+    """
+    Check whether the file is worth compressing.
+
+    :param path: path to the file.
+    :return: whether the file has a text-like type.
+    """
+    media_type, _ = mimetypes.guess_type(path.name)
+    return (media_type or "").startswith(COMPRESSIBLE_TYPES)
+
+
+def load_asset(path: Path) -> StaticAsset:
+    """
+    Describe a static file and its up-to-date variants.
+
+    Variants older than the file are ignored, so an edited file
+    isn't shadowed by its stale compressed copy.
+
+    :param path: path to the file.
+    :return: the asset.
+    """
+    stat = path.stat()
+    version = file_digest(path)
+    asset = StaticAsset(
+        media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+        version=version,
+        identity=StaticVariant(path, stat, f'"{version}"'),
+    )
+    for encoding, suffix in VARIANTS:
+        variant_path = path.with_name(path.name + suffix)
+        try:
+            variant_stat = variant_path.stat()
+        except FileNotFoundError:
+            continue
+        if variant_stat.st_mtime >= stat.st_mtime:
+            asset.variants[encoding] = StaticVariant(
+                variant_path,
+                variant_stat,
+                f'"{version}-{encoding}"',
+            )
+    return asset
+
+
+def precompress(directory: Union[str, Path]) -> int:
+    """
+    Write brotli and gzip variants of compressible static files.
+
+    Variants newer than their files are kept, variants that
+    aren't smaller than the file are not written.
+
+    :param directory: directory with static files.
+    :return: number of written variants.
+    """
+    written = 0
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file() or not is_compressible(path):
+            continue
+        content = None
+        for encoding, suffix in VARIANTS:
+            variant_path = path.with_name(path.name + suffix)
+            if (
+                variant_path.exists()
+                and variant_path.stat().st_mtime >= path.stat().st_mtime
+            ):
+                continue
+            if content is None:
+                content = path.read_bytes()
+            if encoding == "br":
+                compressed = brotli.compress(content, quality=11)
+            else:
+                compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                variant_path.write_bytes(compressed)
+                written += 1
+    return written
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Static files served with their precompressed variants.
+
+    Files found in the directory on start are hashed, their ``.br``
+    and ``.gz`` variants are sent to clients accepting them.
+    Every variant has a strong ETag built from the hash of the file.
+    URLs with the current version of a file, see :func:`static_url`,
+    are cached for a year, other URLs must be revalidated.
+    Files are sent by ``FileResponse``, which hands the path to servers
+    supporting the ``http.response.pathsend`` extension, so they can
+    use sendfile. Files added after start are served as by ``StaticFiles``.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        super().__init__(directory=directory)
+        variants = tuple(suffix for _, suffix in VARIANTS)
+        self.assets = {
+            str(path.relative_to(directory)): load_asset(path)
+            for path in Path(directory).rglob("*")
+            if path.is_file() and not path.name.endswith(variants)
+        }
+
+    def version(self, path: str) -> Optional[str]:
+        """
+        Get version of a file.
+
+        :param path: path of the file relative to the directory.
+        :return: hash of the file, None for unknown files.
+        """
+        asset = self.assets.get(path)
+        return asset.version if asset else None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """
+        Send the variant of a file accepted by the client.
+
+        :param path: path of the file relative to the directory.
+        :param scope: current request scope.
+        :return: response with the file.
+        """
+        asset = self.assets.get(path)
+        if asset is None or scope["method"] not in {"GET", "HEAD"}:
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        encoding, variant = asset.choose(request_headers.get("accept-encoding", ""))
+        version = QueryParams(scope["query_string"]).get(VERSION_PARAM)
+        headers = {
+            "ETag": variant.etag,
+            "Vary": "Accept-Encoding",
+            **(IMMUTABLE_HEADERS if version == asset.version else REVALIDATE_HEADERS),
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        response = FileResponse(
+            variant.path,
+            headers=headers,
+            media_type=asset.media_type,
+            stat_result=variant.stat,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def static_url(request: Request, path: str) -> str:
+    """
+    Get versioned URL of a static file.
+
+    The URL changes with contents of the file, so clients may cache it forever.
+
+    :param request: current request.
+    :param path: path of the file in the static directory.
+    :return: URL path with the version of the file.
+    """
+    url = str(request.app.url_path_for("static", path=path))
+    for route in request.app.routes:
+        if isinstance(route, Mount) and route.name == "static":
+            version = getattr(route.app, "version", lambda _: None)(path)
+            if version:
+                return f"{url}?{VERSION_PARAM}={version}"
+    return url
+
+
+if __name__ == "__main__":  # pragma: no cover
+    static_dir = Path(__file__).parent.parent / "static"
+    written = precompress(static_dir)
+    print(f"Written {written} compressed files to {static_dir}")  # noqa: T201
@@ -12,12 +12,24 @@ from fakeredis.aioredis import FakeConnection
 from fastapi import FastAPI
 from httpx import AsyncClient
 from motor.motor_asyncio import AsyncIOMotorClient
-from redis.asyncio import ConnectionPool
+from redis.asyncio import ConnectionPool, Redis
 
 from ideanest_assesment.services.rabbit.dependencies import get_rmq_channel_pool
 from ideanest_assesment.services.rabbit.lifespan import init_rabbit, shutdown_rabbit
-from ideanest_assesment.services.redis.dependency import get_redis_pool
-from ideanest_assesment.settings import settings
+from ideanest_assesment.services.ratelimit.dependency import get_rate_limiter
+from ideanest_assesment.services.ratelimit.limiter import RateLimiter
+from ideanest_assesment.services.redis.codec import ValueCodec
+from ideanest_assesment.services.redis.dependency import (
+    get_redis,
+    get_redis_codec,
+    get_redis_pool,
+)
+from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
+from ideanest_assesment.services.roles.cache import RoleCache
+from ideanest_assesment.services.roles.dependency import get_role_cache
+from ideanest_assesment.services.tasks.dependency import get_task_dispatcher
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+from ideanest_assesment.settings import RedisCompression, settings
 from ideanest_assesment.web.application import get_app
 
 
@@ -137,17 +149,32 @@ async def fake_redis_pool() -> AsyncGenerator[ConnectionPool, None]:
     """
     server = FakeServer()
     server.connected = True
-    pool = ConnectionPool(connection_class=FakeConnection, server=server)
+    pool = InstrumentedConnectionPool(connection_class=FakeConnection, server=server)
 
     yield pool
 
     await pool.disconnect()
 
 
+@pytest.fixture
+async def test_task_dispatcher() -> AsyncGenerator[TaskDispatcher, None]:
+    """
+    Create dispatcher for celery tasks.
+
+    :yield: task dispatcher.
+    """
+    dispatcher = TaskDispatcher(max_workers=2, buffer_size=10, wait_timeout=1.0)
+
+    yield dispatcher
+
+    await dispatcher.close()
+
+
 @pytest.fixture
 def fastapi_app(
     fake_redis_pool: ConnectionPool,
     test_rmq_pool: Pool[Channel],
+    test_task_dispatcher: TaskDispatcher,
 ) -> FastAPI:
     """
     Fixture for creating FastAPI app.
@@ -155,8 +182,26 @@ def fastapi_app(
     :return: fastapi app with mocked dependencies.
     """
     application = get_app()
+    rate_limiter = RateLimiter(
+        redis=Redis(connection_pool=fake_redis_pool),
+        period=settings.rate_limit_period,
+    )
+    role_cache = RoleCache(
+        redis=Redis(connection_pool=fake_redis_pool),
+        ttl=settings.role_cache_ttl,
+    )
     application.dependency_overrides[get_redis_pool] = lambda: fake_redis_pool
+    application.dependency_overrides[get_redis] = lambda: Redis(
+        connection_pool=fake_redis_pool,
+    )
+    application.dependency_overrides[get_redis_codec] = lambda: ValueCodec(
+        compression=RedisCompression.ZSTD,
+        threshold=1024,
+    )
+    application.dependency_overrides[get_rate_limiter] = lambda: rate_limiter
+    application.dependency_overrides[get_role_cache] = lambda: role_cache
     application.dependency_overrides[get_rmq_channel_pool] = lambda: test_rmq_pool
+    application.dependency_overrides[get_task_dispatcher] = lambda: test_task_dispatcher
     return application
 
 
@@ -0,0 +1,181 @@
+import gzip
+import json
+import zlib
+from pathlib import Path
+from typing import AsyncGenerator, List
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from httpx import AsyncClient
+from starlette import status
+from starlette.types import Message
+
+from ideanest_assesment.web.middleware.compression import (
+    CompressionMiddleware,
+    parse_accept_encoding,
+    uncompressed,
+)
+
+PAYLOAD = [{"name": f"organization {number}"} for number in range(200)]
+
+
+def decompress(encoding: str, body: bytes) -> bytes:
+    """Decompress body sent with the encoding."""
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        return brotli.decompress(body)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+@pytest.fixture
+async def compression_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    Client of an app with compression middleware.
+
+    :yield: client for the app.
+    """
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large() -> ORJSONResponse:
+        return ORJSONResponse(PAYLOAD, headers={"ETag": '"1"'})
+
+    @app.get("/small")
+    async def small() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines() -> AsyncGenerator[bytes, None]:
+            for line in PAYLOAD:
+                yield json.dumps(line).encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/uncompressed")
+    @uncompressed
+    async def plain() -> ORJSONResponse:
+        return ORJSONResponse(PAYLOAD)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("accept_encoding", "encoding"),
+    [
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip, br, zstd", "zstd"),
+        ("zstd;q=0, *", "br"),
+    ],
+)
+async def test_negotiated_compression(
+    compression_client: AsyncClient,
+    accept_encoding: str,
+    encoding: str,
+) -> None:
+    """
+    Tests that the preferred accepted encoding is used.
+
+    :param compression_client: client of app with compression.
+    :param accept_encoding: Accept-Encoding sent by client.
+    :param encoding: expected encoding.
+    """
+    headers = {"Accept-Encoding": accept_encoding}
+    async with compression_client.stream("GET", "/large", headers=headers) as response:
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Content-Length"] == str(len(body))
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"1"'
+    assert json.loads(decompress(encoding, body)) == PAYLOAD
+
+
+@pytest.mark.anyio
+async def test_streaming_compression(compression_client: AsyncClient) -> None:
+    """
+    Tests that every streamed chunk can be decoded as it arrives.
+
+    :param compression_client: client of app with compression.
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    async with compression_client.stream("GET", "/stream", headers=headers) as response:
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        lines = []
+        async for chunk in response.aiter_raw():
+            # Flushed chunks decode to complete lines.
+            lines.extend(inflater.decompress(chunk).splitlines())
+
+    assert [json.loads(line) for line in lines] == PAYLOAD
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/small", "/uncompressed"])
+async def test_not_compressed(compression_client: AsyncClient, path: str) -> None:
+    """
+    Tests that small bodies and opted out endpoints are sent as is.
+
+    :param compression_client: client of app with compression.
+    :param path: requested path.
+    """
+    response = await compression_client.get(
+        path,
+        headers={"Accept-Encoding": "gzip, br, zstd"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_pathsend_not_held(tmp_path: Path) -> None:
+    """
+    Tests that files sent with pathsend get their headers first.
+
+    :param tmp_path: temporary directory.
+    """
+    path = tmp_path / "style.css"
+    path.write_text("body { color: red; }" * 100)
+    middleware = CompressionMiddleware(FileResponse(path), minimum_size=100)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"accept-encoding", b"zstd")],
+        "extensions": {"http.response.pathsend": {}},
+    }
+    sent: List[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request"}  # pragma: no cover
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.pathsend",
+    ]
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+
+
+def test_parse_accept_encoding() -> None:
+    """Tests parsing of Accept-Encoding header."""
+    assert parse_accept_encoding("gzip, br;q=0.5, zstd;q=0, *;q=bad") == {
+        "gzip": 1.0,
+        "br": 0.5,
+        "zstd": 0.0,
+        "*": 0.0,
+    }
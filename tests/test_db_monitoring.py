@@ -0,0 +1,98 @@
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from ideanest_assesment.db.monitoring import (
+    CommandTimingListener,
+    command_filter,
+    query_shape,
+    track_commands,
+)
+from ideanest_assesment.web.middleware.db_timing import DbTimingMiddleware
+
+FIND = {
+    "find": "organizations",
+    "filter": {"members.user.email": "user@example.com", "_id": {"$in": [1, 2]}},
+    "limit": 1,
+}
+
+
+def run_command(
+    listener: CommandTimingListener,
+    command: dict[str, Any],
+    duration: float,
+) -> None:
+    """Pass events of a finished command to the listener."""
+    event: Any = SimpleNamespace(
+        command=command,
+        command_name=next(iter(command)),
+        database_name="admin",
+        request_id=1,
+        connection_id=("localhost", 27017),
+        duration_micros=int(duration * 1_000_000),
+    )
+    listener.started(event)
+    listener.succeeded(event)
+
+
+def test_query_shape() -> None:
+    """Tests that values are removed from filters."""
+    assert query_shape(command_filter(FIND)) == {
+        "members.user.email": "?",
+        "_id": {"$in": "?"},
+    }
+    assert query_shape([{"$match": {"name": "a"}}, {"$limit": 5}]) == [
+        {"$match": {"name": "?"}},
+        {"$limit": "?"},
+    ]
+    assert command_filter({"delete": "users", "deletes": [{"q": {"a": 1}}]}) == {
+        "a": 1,
+    }
+
+
+def test_slow_commands_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Tests that commands are timed and slow ones are logged with the filter.
+
+    :param caplog: log capture.
+    """
+    listener = CommandTimingListener(slow_threshold=0.1)
+    with caplog.at_level(logging.WARNING), track_commands() as stats:
+        run_command(listener, FIND, 0.01)
+        run_command(listener, FIND, 0.25)
+    # Commands outside of requests are not attributed to them.
+    run_command(listener, FIND, 0.01)
+
+    assert stats.commands == 2
+    assert stats.duration == pytest.approx(0.26)
+    (record,) = caplog.records
+    assert "find on admin.organizations succeeded in 250.0 ms" in record.message
+    assert "'members.user.email': '?'" in record.message
+    assert "user@example.com" not in record.message
+
+
+@pytest.mark.anyio
+async def test_server_timing() -> None:
+    """Tests that DB time of a request is sent in Server-Timing header."""
+    listener = CommandTimingListener(slow_threshold=1)
+    app = FastAPI()
+    app.add_middleware(DbTimingMiddleware)
+
+    @app.get("/queries")
+    async def queries() -> None:
+        for _ in range(3):
+            run_command(listener, FIND, 0.002)
+
+    @app.get("/no-queries")
+    async def no_queries() -> None:
+        """Endpoint without commands."""
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/queries")
+        assert response.headers["Server-Timing"] == 'db;dur=6.0;desc="3 commands"'
+        response = await client.get("/no-queries")
+        assert "Server-Timing" not in response.headers
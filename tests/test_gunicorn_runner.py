@@ -0,0 +1,101 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from ideanest_assesment.gunicorn_runner import (
+    cpu_limit,
+    memory_limit,
+    select_worker_to_recycle,
+    worker_rss,
+    workers_for,
+)
+
+GIB = 1024**3
+
+
+def test_cpu_limit_v2(tmp_path: Path) -> None:
+    """
+    Tests that CFS quota of cgroup v2 limits CPUs.
+
+    :param tmp_path: fake cgroup mount.
+    """
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+
+    assert cpu_limit(tmp_path) == min(1.5, len(os.sched_getaffinity(0)))
+
+
+def test_cpu_limit_v1(tmp_path: Path) -> None:
+    """
+    Tests that CFS quota of cgroup v1 limits CPUs.
+
+    :param tmp_path: fake cgroup mount.
+    """
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+    assert cpu_limit(tmp_path) == 0.5
+
+
+def test_cpu_limit_unlimited(tmp_path: Path) -> None:
+    """
+    Tests that all CPUs are available without quota.
+
+    :param tmp_path: fake cgroup mount.
+    """
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+
+    assert cpu_limit(tmp_path) == len(os.sched_getaffinity(0))
+
+
+def test_memory_limit(tmp_path: Path) -> None:
+    """
+    Tests that memory limit of the container is used.
+
+    :param tmp_path: fake cgroup mount.
+    """
+    (tmp_path / "memory.max").write_text(f"{GIB}\n")
+    assert memory_limit(tmp_path) == GIB
+
+    (tmp_path / "memory.max").write_text("max\n")
+    physical = memory_limit(tmp_path)
+    assert physical is not None
+    assert physical > GIB
+
+
+@pytest.mark.parametrize(
+    ("cpus", "memory", "workers"),
+    [
+        (4, 16 * GIB, 4),
+        (1.5, 16 * GIB, 2),
+        (0.5, 16 * GIB, 1),
+        (8, 2 * GIB, 4),
+        (8, None, 8),
+        (2, GIB // 4, 1),
+    ],
+)
+def test_workers_for(cpus: float, memory: int, workers: int) -> None:
+    """
+    Tests that workers fit into CPUs and memory.
+
+    :param cpus: available CPUs.
+    :param memory: available memory.
+    :param workers: expected number of workers.
+    """
+    assert workers_for(cpus, memory, GIB // 2) == workers
+
+
+def test_select_worker_to_recycle() -> None:
+    """Tests that the largest worker over the limit is recycled."""
+    assert select_worker_to_recycle({1: GIB, 2: 3 * GIB, 3: 2 * GIB}, GIB) == 2
+    assert select_worker_to_recycle({1: GIB}, GIB) is None
+
+
+def test_worker_rss() -> None:
+    """Tests that resident memory of a process is read."""
+    rss = worker_rss(os.getpid())
+
+    assert rss is not None
+    assert rss > 1024 * 1024
+    assert worker_rss(2**31) is None
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.services.health.checker import HealthChecker
+from ideanest_assesment.services.health.dependency import get_health_checker
+
+
+async def healthy() -> None:
+    """Check that passes."""
+
+
+async def broken() -> None:
+    """Check of an unavailable dependency."""
+    raise ConnectionError("connection refused")
+
+
+async def hanging() -> None:
+    """Check that never answers."""
+    await asyncio.sleep(10)
+
+
+@pytest.mark.anyio
+async def test_checker_reports_each_dependency() -> None:
+    """Tests that every dependency is checked with its latency."""
+    checker = HealthChecker(
+        checks={"mongo": healthy, "redis": broken, "rabbit": hanging},
+        interval=5,
+        timeout=0.05,
+    )
+    assert not checker.is_ready()
+
+    report = await checker.check()
+
+    assert not checker.is_ready()
+    assert report.dependencies["mongo"].healthy
+    assert report.dependencies["redis"].error == (
+        "ConnectionError('connection refused')"
+    )
+    assert report.dependencies["rabbit"].error == "Timed out after 0.05 s"
+    assert report.dependencies["rabbit"].latency >= 0.05
+
+
+@pytest.mark.anyio
+async def test_checker_runs_in_background() -> None:
+    """Tests that checks repeat in background."""
+    calls = []
+
+    async def counted() -> None:
+        calls.append(1)
+
+    checker = HealthChecker(checks={"mongo": counted}, interval=0.01, timeout=1)
+    checker.start()
+    await asyncio.sleep(0.05)
+    await checker.stop()
+
+    assert len(calls) > 1
+    assert checker.is_ready()
+
+
+@pytest.mark.anyio
+async def test_probes(fastapi_app: FastAPI, client: AsyncClient) -> None:
+    """
+    Tests that readiness follows the cached report and liveness doesn't.
+
+    :param fastapi_app: current application.
+    :param client: client for the app.
+    """
+    checks = {"mongo": healthy, "redis": healthy}
+    checker = HealthChecker(checks=checks, interval=5, timeout=1)
+    fastapi_app.dependency_overrides[get_health_checker] = lambda: checker
+    ready_url = fastapi_app.url_path_for("readiness")
+
+    response = await client.get(ready_url)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"ready": False, "age": None, "dependencies": {}}
+
+    await checker.check()
+    response = await client.get(ready_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["dependencies"]["redis"]["healthy"]
+
+    checks["redis"] = broken
+    await checker.check()
+    response = await client.get(ready_url)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert not response.json()["dependencies"]["redis"]["healthy"]
+
+    response = await client.get(fastapi_app.url_path_for("liveness"))
+    assert response.status_code == status.HTTP_200_OK
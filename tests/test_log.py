@@ -0,0 +1,143 @@
+import io
+import logging
+import threading
+import time
+from typing import Any, List
+from unittest.mock import patch
+
+import orjson
+from loguru import logger
+
+from ideanest_assesment.log import AccessLogSampler, InterceptHandler, JsonSink
+
+
+class BlockedStream(io.BytesIO):
+    """Stream that blocks writes until released, like a full pipe."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, data: Any) -> int:
+        """Wait for release and write."""
+        self.released.wait(timeout=5)
+        return super().write(data)
+
+
+def log_lines(stream: io.BytesIO) -> List[Any]:
+    """Parse lines written by a sink."""
+    return [orjson.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_sink() -> None:
+    """Tests that records are written as JSON lines."""
+    stream = io.BytesIO()
+    sink_id = logger.add(JsonSink(stream), format=lambda _: "{message}")
+    std_logger = logging.getLogger("tests.json")
+    std_logger.addHandler(InterceptHandler(caller=False))
+    std_logger.propagate = False
+    try:
+        logger.bind(request_id="1").info("Hello {}", "world")
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            std_logger.exception("Failed")
+    finally:
+        logger.remove(sink_id)
+
+    hello, failed = log_lines(stream)
+    assert hello["level"] == "INFO"
+    assert hello["message"] == "Hello world"
+    assert hello["extra"] == {"request_id": "1"}
+    assert "function" not in hello
+    assert failed["logger"] == "tests.json"
+    assert failed["level"] == "ERROR"
+    assert "ValueError: broken" in failed["exception"]
+
+
+def test_json_sink_drops_when_full() -> None:
+    """Tests that records are dropped and counted when the stream is stuck."""
+    stream = BlockedStream()
+    sink = JsonSink(stream, buffer_size=10)
+    sink_id = logger.add(sink, format=lambda _: "{message}")
+    try:
+        for number in range(100):
+            logger.info("Record {}", number)
+        assert sink.dropped
+        stream.released.set()
+    finally:
+        logger.remove(sink_id)
+
+    lines = log_lines(stream)
+    reports = [
+        line
+        for line in lines
+        if line["message"].endswith("dropped, the log buffer is full")
+    ]
+    assert len(lines) - len(reports) == 100 - sink.dropped
+    assert sum(int(line["message"].split()[0]) for line in reports) == sink.dropped
+
+
+def test_access_log_sampler() -> None:
+    """Tests that sampled out requests are dropped, but not server errors."""
+
+    def access_record(status: int) -> logging.LogRecord:
+        args = ("127.0.0.1:5000", "GET", "/api/health", "1.1", status)
+        return logging.LogRecord("uvicorn.access", 20, "", 0, "%s", args, None)
+
+    sampler = AccessLogSampler(rate=0)
+
+    assert not sampler.filter(access_record(200))
+    assert sampler.filter(access_record(503))
+    assert AccessLogSampler(rate=1).filter(access_record(200))
+
+
+def test_json_sink_survives_bad_records() -> None:
+    """Tests that a record orjson can't encode doesn't stop the writer."""
+    stream = io.BytesIO()
+    sink = JsonSink(stream)
+    sink_id = logger.add(sink, format=lambda _: "{message}")
+    try:
+        logger.bind(data={1: 2}).info("Int keys")
+        logger.bind(data=2**70).info("Huge")
+        logger.info("After")
+    finally:
+        logger.remove(sink_id)
+
+    int_keys, huge, after = log_lines(stream)
+    assert int_keys["extra"] == {"data": {"1": 2}}
+    assert huge["message"] == "Huge"
+    assert "could not be serialized" in huge["error"]
+    assert after["message"] == "After"
+
+
+def test_json_sink_stops_when_full() -> None:
+    """Tests that stopping doesn't hang when the stream is stuck."""
+    stream = BlockedStream()
+    sink = JsonSink(stream, buffer_size=1)
+    sink_id = logger.add(sink, format=lambda _: "{message}")
+    for number in range(3):
+        logger.info("Record {}", number)
+
+    with patch("ideanest_assesment.log.SINK_STOP_TIMEOUT", 0.1):
+        started = time.monotonic()
+        logger.remove(sink_id)
+        assert time.monotonic() - started < 1
+    stream.released.set()
+
+
+def test_intercepted_records_keep_logger_name() -> None:
+    """Tests that records logged without caller lookup show their logger."""
+    stream = io.StringIO()
+    sink_id = logger.add(stream, format="{name}:{function} {message}")
+    std_logger = logging.getLogger("tests.text")
+    std_logger.addHandler(InterceptHandler(caller=False))
+    std_logger.propagate = False
+    try:
+        std_logger.warning("Hello")
+    finally:
+        logger.remove(sink_id)
+
+    assert stream.getvalue() == (
+        "tests.text:test_intercepted_records_keep_logger_name Hello\n"
+    )
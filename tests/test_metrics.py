@@ -0,0 +1,88 @@
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from redis.asyncio import ConnectionPool, Redis
+from starlette import status
+
+from ideanest_assesment.services.metrics.sampler import PoolMetricsSampler
+from ideanest_assesment.services.redis.pool import InstrumentedConnectionPool
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+
+
+def sample(name: str, **labels: str) -> float:
+    """Get current value of a metric, 0 if it wasn't recorded yet."""
+    value: Optional[float] = REGISTRY.get_sample_value(name, labels)
+    return value or 0.0
+
+
+@pytest.mark.anyio
+async def test_request_metrics(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """
+    Tests that requests are counted by route template and status.
+
+    :param client: client for the app.
+    :param fastapi_app: current application.
+    """
+    organization_route = "/api/organizations/{organization_id}"
+    labels = {"method": "GET", "route": organization_route, "status": "401"}
+    before = sample("http_requests_total", **labels)
+
+    response = await client.get("/api/organizations/unknown")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    await client.get("/api/missing")
+
+    assert sample("http_requests_total", **labels) == before + 1
+    assert sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route=organization_route,
+    )
+    assert sample(
+        "http_requests_total",
+        method="GET",
+        route="<unmatched>",
+        status="404",
+    )
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+    response = await client.get(fastapi_app.url_path_for("metrics"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert f'route="{organization_route}",status="401"' in response.text
+
+
+@pytest.mark.anyio
+async def test_pool_metrics(
+    fake_redis_pool: ConnectionPool,
+    test_task_dispatcher: TaskDispatcher,
+) -> None:
+    """
+    Tests that pool and dispatcher statistics are copied to metrics.
+
+    :param fake_redis_pool: fake redis pool.
+    :param test_task_dispatcher: task dispatcher.
+    """
+    assert isinstance(fake_redis_pool, InstrumentedConnectionPool)
+    sampler = PoolMetricsSampler(
+        interval=60,
+        redis_pool=fake_redis_pool,
+        dispatcher=test_task_dispatcher,
+    )
+    sampler.sample()
+    checkouts = sample("redis_pool_checkouts_total")
+    enqueued = sample("celery_task_dispatches_total", result="enqueued")
+
+    redis = Redis(connection_pool=fake_redis_pool)
+    await redis.set("metrics", "1")
+    await redis.get("metrics")
+    test_task_dispatcher.stats.record(0.01)
+    sampler.sample()
+    sampler.sample()
+
+    assert sample("redis_pool_checkouts_total") == checkouts + 2
+    assert sample("redis_pool_connections", state="idle") == 1
+    assert sample("redis_pool_connections", state="in_use") == 0
+    assert sample("celery_task_dispatches_total", result="enqueued") == enqueued + 1
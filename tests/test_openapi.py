@@ -0,0 +1,72 @@
+import gzip
+
+import brotli
+import orjson
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.web.openapi import SCHEMA_PATH, render_openapi
+
+
+@pytest.mark.anyio
+async def test_stored_schema_is_current(fastapi_app: FastAPI) -> None:
+    """Tests that the stored document matches routes of the app."""
+    assert SCHEMA_PATH.read_bytes() == render_openapi(fastapi_app), (
+        "OpenAPI document is outdated, "
+        "run `python -m ideanest_assesment.web.openapi` to update it"
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("accept_encoding", "encoding"),
+    [("gzip, deflate, br", "br"), ("gzip", "gzip"), ("identity", None)],
+)
+async def test_openapi_encodings(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    accept_encoding: str,
+    encoding: str,
+) -> None:
+    """Tests that the document is sent in the accepted encoding."""
+    response = await client.get(
+        fastapi_app.url_path_for("openapi"),
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert orjson.loads(response.content) == fastapi_app.openapi()
+
+
+@pytest.mark.anyio
+async def test_openapi_not_modified(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Tests revalidation of the document."""
+    url = fastapi_app.url_path_for("openapi")
+    response = await client.get(url, headers={"Accept-Encoding": "br"})
+    identity = await client.get(url, headers={"Accept-Encoding": "identity"})
+
+    revalidated = await client.get(
+        url,
+        headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]},
+    )
+    other_encoding = await client.get(
+        url,
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]},
+    )
+
+    assert response.headers["etag"] != identity.headers["etag"]
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert other_encoding.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_variants_match_document(fastapi_app: FastAPI) -> None:
+    """Tests that compressed variants hold the same document."""
+    document = fastapi_app.state.openapi
+
+    assert brotli.decompress(document.variants["br"][1]) == document.content
+    assert gzip.decompress(document.variants["gzip"][1]) == document.content
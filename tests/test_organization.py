@@ -0,0 +1,377 @@
+import uuid
+from typing import AsyncGenerator
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.auth.auth import get_current_active_user
+from ideanest_assesment.db.dao.organization_dao import OrganizationDAO
+from ideanest_assesment.db.models.organization import (
+    MemberUser,
+    Organization,
+    OrganizationMember,
+)
+from ideanest_assesment.db.models.user import User
+
+
+@pytest.fixture
+async def current_user(fastapi_app: FastAPI) -> AsyncGenerator[User, None]:
+    """
+    Create user and authenticate requests as them.
+
+    :param fastapi_app: current application fixture.
+    :yield: authenticated user.
+    """
+    user = User(
+        name="owner",
+        email=f"{uuid.uuid4().hex}@example.com",
+        hashed_password="hashed",  # noqa: S106
+    )
+    await user.create()
+    fastapi_app.dependency_overrides[get_current_active_user] = lambda: user
+    yield user
+    await user.delete()
+
+
+@pytest.mark.anyio
+async def test_organization_conditional_get(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that unchanged organization is answered with 304.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    response = await client.post(
+        fastapi_app.url_path_for("create_organization_endpoint"),
+        json={"name": uuid.uuid4().hex, "description": "first"},
+    )
+    organization_id = response.json()["id"]
+    url = fastapi_app.url_path_for(
+        "get_organization_endpoint",
+        organization_id=organization_id,
+    )
+
+    # Without If-None-Match the organization is loaded at once.
+    with patch.object(OrganizationDAO, "get_organization_revision") as revision:
+        response = await client.get(url)
+    revision.assert_not_called()
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    response = await client.put(url, json={"description": "second"})
+    assert response.headers["ETag"] != etag
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["description"] == "second"
+    await Organization.find_all().delete()
+
+
+@pytest.mark.anyio
+async def test_organization_list_conditional_get(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that unchanged list of organizations is answered with 304.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    create_url = fastapi_app.url_path_for("create_organization_endpoint")
+    list_url = fastapi_app.url_path_for("get_all_organizations_endpoint")
+    await client.post(create_url, json={"name": uuid.uuid4().hex, "description": ""})
+
+    with patch.object(
+        OrganizationDAO,
+        "get_all_organization_revisions",
+    ) as revisions:
+        response = await client.get(list_url)
+    revisions.assert_not_called()
+    etag = response.headers["ETag"]
+    response = await client.get(list_url, headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    await client.post(create_url, json={"name": uuid.uuid4().hex, "description": ""})
+    response = await client.get(list_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 2
+    await Organization.find_all().delete()
+
+
+@pytest.mark.anyio
+async def test_missing_organization(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that unknown and malformed IDs are not found.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    for organization_id in ("0" * 24, "malformed"):
+        url = fastapi_app.url_path_for(
+            "get_organization_endpoint",
+            organization_id=organization_id,
+        )
+        response = await client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_concurrent_update_conflict(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that a write based on a stale revision is rejected with 409.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    response = await client.post(
+        fastapi_app.url_path_for("create_organization_endpoint"),
+        json={"name": uuid.uuid4().hex, "description": "first"},
+    )
+    organization_id = response.json()["id"]
+    stale = await Organization.get(organization_id)
+    assert stale is not None
+    await client.put(
+        fastapi_app.url_path_for(
+            "update_organization_endpoint",
+            organization_id=organization_id,
+        ),
+        json={"description": "second"},
+    )
+
+    with patch.object(Organization, "get", return_value=stale):
+        response = await client.put(
+            fastapi_app.url_path_for(
+                "update_organization_endpoint",
+                organization_id=organization_id,
+            ),
+            json={"description": "third"},
+        )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    organization = await Organization.get(organization_id)
+    assert organization is not None
+    assert organization.description == "second"
+    await Organization.find_all().delete()
+
+
+async def create_organizations(names: list[str], admin: User) -> list[Organization]:
+    """
+    Create organizations with the names.
+
+    :param names: names of organizations.
+    :param admin: the only member of organizations.
+    :return: created organizations.
+    """
+    member = OrganizationMember(user=MemberUser.from_user(admin), access_level="admin")
+    organizations = [
+        Organization(name=name, description=f"Description of {name}", members=[member])
+        for name in names
+    ]
+    for organization in organizations:
+        await organization.insert()
+    return organizations
+
+
+@pytest.mark.anyio
+async def test_search_prefix_pages(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that prefix search goes through all pages in name order.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    prefix = uuid.uuid4().hex
+    await create_organizations(
+        [f"{prefix}-cherry", f"{prefix}-apple", "other", f"{prefix}-banana"],
+        current_user,
+    )
+    url = fastapi_app.url_path_for("search_organizations_endpoint")
+
+    names = []
+    params = {"q": prefix, "limit": 2}
+    while True:
+        response = await client.get(url, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        names.extend(item["name"] for item in page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert names == [f"{prefix}-apple", f"{prefix}-banana", f"{prefix}-cherry"]
+    await Organization.find_all().delete()
+
+
+@pytest.mark.anyio
+async def test_search_prefix_ignores_case(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that prefix search uses case-insensitive collation.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    prefix = uuid.uuid4().hex
+    await create_organizations(
+        [f"{prefix}-Acme", f"{prefix}-acorn", f"{prefix}-bolt"],
+        current_user,
+    )
+
+    response = await client.get(
+        fastapi_app.url_path_for("search_organizations_endpoint"),
+        params={"q": f"{prefix.upper()}-AC"},
+    )
+
+    assert [item["name"] for item in response.json()["items"]] == [
+        f"{prefix}-Acme",
+        f"{prefix}-acorn",
+    ]
+    await Organization.find_all().delete()
+
+
+@pytest.mark.anyio
+async def test_search_text(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests keyword search in names and descriptions.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    keyword = f"kw{uuid.uuid4().hex}"
+    first, _, third = await create_organizations(
+        [f"{keyword} first", uuid.uuid4().hex, uuid.uuid4().hex],
+        current_user,
+    )
+    third.description = f"Mentions {keyword}"
+    await third.save()
+    url = fastapi_app.url_path_for("search_organizations_endpoint")
+
+    response = await client.get(url, params={"q": keyword, "mode": "text", "limit": 1})
+    page = response.json()
+    response = await client.get(
+        url,
+        params={"q": keyword, "mode": "text", "cursor": page["next_cursor"]},
+    )
+
+    assert [item["_id"] for item in page["items"]] == [str(first.id)]
+    assert [item["_id"] for item in response.json()["items"]] == [str(third.id)]
+    assert response.json()["next_cursor"] is None
+    await Organization.find_all().delete()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzFd", "WyJhIiwgIngiXQ=="])
+async def test_search_invalid_cursor(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+    cursor: str,
+) -> None:
+    """
+    Tests that malformed cursors are rejected.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    :param cursor: malformed cursor.
+    """
+    response = await client.get(
+        fastapi_app.url_path_for("search_organizations_endpoint"),
+        params={"q": "a", "cursor": cursor},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_members_without_credentials(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    current_user: User,
+) -> None:
+    """
+    Tests that responses don't expose credentials of members.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param current_user: authenticated user.
+    """
+    current_user.refresh_token = "live-refresh-token"  # noqa: S105
+    await current_user.save()
+    name = uuid.uuid4().hex
+    response = await client.post(
+        fastapi_app.url_path_for("create_organization_endpoint"),
+        json={"name": name, "description": ""},
+    )
+    organization_id = response.json()["id"]
+
+    responses = [
+        await client.get(
+            fastapi_app.url_path_for(
+                "get_organization_endpoint",
+                organization_id=organization_id,
+            ),
+        ),
+        await client.get(fastapi_app.url_path_for("get_all_organizations_endpoint")),
+        await client.get(
+            fastapi_app.url_path_for("search_organizations_endpoint"),
+            params={"q": name},
+        ),
+    ]
+
+    for response in responses:
+        assert response.status_code == status.HTTP_200_OK
+        assert b"hashed_password" not in response.content
+        assert b"refresh_token" not in response.content
+        assert b"live-refresh-token" not in response.content
+    organization = responses[0].json()
+    assert organization["members"] == [
+        {
+            "user": {
+                "_id": str(current_user.id),
+                "name": current_user.name,
+                "email": current_user.email,
+            },
+            "access_level": "admin",
+        },
+    ]
+    await Organization.find_all().delete()
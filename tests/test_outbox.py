@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+import pytest
+from beanie.exceptions import RevisionIdWasChanged
+
+from ideanest_assesment.db.dao.outbox_dao import OutboxDAO
+from ideanest_assesment.db.models.organization import Organization
+from ideanest_assesment.db.models.outbox import OutboxMessage, OutboxStatus
+from ideanest_assesment.services.outbox.relay import OutboxRelay
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+
+
+class FakeSignature:
+    """Signature stub that remembers published tasks."""
+
+    def __init__(self, name: str, published: list[Any], fail: bool) -> None:
+        self.name = name
+        self.published = published
+        self.fail = fail
+
+    def apply_async(self, args: Any, kwargs: Any, **options: Any) -> None:
+        """Publish the task or fail like an unavailable broker."""
+        if self.fail:
+            raise ConnectionError("broker is down")
+        self.published.append((self.name, args, kwargs, options))
+
+
+class FakeCelery:
+    """Celery app stub creating fake signatures."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.published: list[Any] = []
+        self.fail = fail
+
+    def signature(self, name: str) -> FakeSignature:
+        """Create signature for a task."""
+        return FakeSignature(name, self.published, self.fail)
+
+
+def make_relay(
+    dispatcher: TaskDispatcher,
+    celery_app: FakeCelery,
+) -> OutboxRelay:
+    """Create relay with short intervals."""
+    return OutboxRelay(
+        dispatcher=dispatcher,
+        celery_app=celery_app,  # type: ignore
+        batch_size=10,
+        poll_interval=0.01,
+        claim_timeout=60,
+        max_attempts=2,
+    )
+
+
+@pytest.mark.anyio
+async def test_relay_publishes_and_acks(
+    test_task_dispatcher: TaskDispatcher,
+) -> None:
+    """Tests that published messages are removed from the outbox."""
+    await OutboxMessage.delete_all()
+    await OutboxMessage(task_name="first", args=[1]).insert()
+    await OutboxMessage(task_name="second", options={"queue": "email.bulk"}).insert()
+    celery_app = FakeCelery()
+
+    claimed = await make_relay(test_task_dispatcher, celery_app).relay_batch()
+
+    assert claimed == 2
+    assert sorted(celery_app.published) == [
+        ("first", [1], {}, {}),
+        ("second", [], {}, {"queue": "email.bulk"}),
+    ]
+    assert await OutboxMessage.count() == 0
+
+
+@pytest.mark.anyio
+async def test_relay_retries_failed_messages(
+    test_task_dispatcher: TaskDispatcher,
+) -> None:
+    """Tests that failed messages are retried later and given up eventually."""
+    await OutboxMessage.delete_all()
+    await OutboxMessage(task_name="task").insert()
+    relay = make_relay(test_task_dispatcher, FakeCelery(fail=True))
+
+    assert await relay.relay_batch() == 1
+    message = await OutboxMessage.find_one()
+    assert message is not None
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.available_at > datetime.utcnow()
+    # Not available until the backoff passes.
+    assert await relay.relay_batch() == 0
+
+    await message.set({OutboxMessage.available_at: datetime.utcnow()})
+    assert await relay.relay_batch() == 1
+    message = await OutboxMessage.find_one()
+    assert message is not None
+    assert message.status == OutboxStatus.FAILED
+    await OutboxMessage.delete_all()
+
+
+@pytest.mark.anyio
+async def test_message_is_saved_with_document(
+    test_task_dispatcher: TaskDispatcher,
+) -> None:
+    """Tests that messages kept in documents are moved and published once."""
+    await OutboxMessage.delete_all()
+    organization = Organization(name=uuid.uuid4().hex, description="")
+    await organization.insert()
+    organization.description = "changed"
+    await OutboxDAO().save_with_message(
+        organization,
+        OutboxMessage(task_name="invite", args=[1]),
+    )
+
+    stored = await Organization.get(organization.id)
+    assert stored is not None
+    assert stored.description == "changed"
+    assert [message["task_name"] for message in stored.outbox] == ["invite"]
+    assert await OutboxMessage.count() == 0
+
+    # A move interrupted after the insert is finished without duplicates.
+    await OutboxMessage.get_motor_collection().insert_one(stored.outbox[0])
+    celery_app = FakeCelery()
+    assert await make_relay(test_task_dispatcher, celery_app).relay_batch() == 1
+    assert celery_app.published == [("invite", [1], {}, {})]
+    stored = await Organization.get(organization.id)
+    assert stored is not None
+    assert stored.outbox == []
+
+    # A stale copy still holding the message can't bring it back.
+    with pytest.raises(RevisionIdWasChanged):
+        await organization.save()
+    await Organization.find_all().delete()
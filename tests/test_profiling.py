@@ -0,0 +1,79 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.web.middleware.profiling import ProfilingMiddleware
+
+
+async def get_items(
+    directory: Path,
+    sample_rate: float,
+    headers: Optional[dict[str, str]] = None,
+    requests: int = 1,
+) -> List[Path]:
+    """Request an endpoint of a profiled app and list saved profiles."""
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=directory,
+        sample_rate=sample_rate,
+        token="profile-token",  # noqa: S106
+        max_profiles=2,
+    )
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        await asyncio.sleep(0.01)
+        return {"id": item_id}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for number in range(requests):
+            response = await client.get(f"/items/{number}", headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+    return sorted(directory.rglob("*.speedscope.json"))
+
+
+@pytest.mark.anyio
+async def test_sampled_requests_profiled(tmp_path: Path) -> None:
+    """
+    Tests that sampled requests are saved per route, newest first.
+
+    :param tmp_path: directory for profiles.
+    """
+    profiles = await get_items(tmp_path, sample_rate=1, requests=3)
+
+    assert len(profiles) == 2
+    assert {profile.parent.name for profile in profiles} == {"items_{item_id}"}
+    assert profiles[0].name.endswith("-GET-200.speedscope.json")
+    profile = json.loads(profiles[0].read_text())
+    assert profile["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("token", "profiled"),
+    [(None, False), ("wrong", False), ("profile-token", True)],
+)
+async def test_requested_profiles(
+    tmp_path: Path,
+    token: Optional[str],
+    profiled: bool,
+) -> None:
+    """
+    Tests that requests with the profiling token are profiled.
+
+    :param tmp_path: directory for profiles.
+    :param token: value of X-Profile header.
+    :param profiled: whether a profile is expected.
+    """
+    headers = {"X-Profile": token} if token else None
+
+    profiles = await get_items(tmp_path, sample_rate=0, headers=headers)
+
+    assert bool(profiles) == profiled
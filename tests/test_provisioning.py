@@ -0,0 +1,97 @@
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from beanie.operators import In
+
+from ideanest_assesment.db.models.user import User
+from ideanest_assesment.provisioning import (
+    ALREADY_REGISTERED,
+    provision_users,
+    read_jsonl,
+)
+
+
+@pytest.fixture(scope="module")
+def executor() -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool hashing passwords.
+
+    :yield: the pool.
+    """
+    with ProcessPoolExecutor(
+        2,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        yield pool
+
+
+@pytest.mark.anyio
+async def test_provision_users(executor: ProcessPoolExecutor) -> None:
+    """Tests that users are created and bad rows are reported by number."""
+    prefix = uuid.uuid4().hex
+    await User(
+        name="Existing",
+        email=f"{prefix}-0@example.com",
+        hashed_password="hash",  # noqa: S106
+    ).insert()
+    rows = [
+        {"name": "Existing", "email": f"{prefix}-0@example.com", "password": "p"},
+        {"name": "First", "email": f"{prefix}-1@example.com", "password": "p"},
+        {"name": "No email", "password": "p"},
+        {"name": "Second", "email": f"{prefix}-2@example.com", "password": "p"},
+        {"name": "Repeated", "email": f"{prefix}-1@example.com", "password": "p"},
+    ]
+
+    report = await provision_users(enumerate(rows, start=1), executor, batch_size=2)
+
+    assert report.created == 2
+    assert report.rejected.keys() == {1, 3, 5}
+    assert report.rejected[1] == ALREADY_REGISTERED
+    assert report.rejected[5] == ALREADY_REGISTERED
+    assert "email" in report.rejected[3]
+    users = await User.find(
+        In(User.email, [f"{prefix}-1@example.com", f"{prefix}-2@example.com"]),
+    ).to_list()
+    assert len(users) == 2
+    assert all(user.verify_password("p") for user in users)
+
+
+@pytest.mark.anyio
+async def test_provision_concurrent_duplicate(
+    executor: ProcessPoolExecutor,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests that users inserted after the check are rejected by the index."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    insert_many = User.insert_many
+
+    async def insert_with_race(*args: Any, **kwargs: Any) -> Any:
+        await User(
+            name="Racer",
+            email=email,
+            hashed_password="hash",  # noqa: S106
+        ).insert()
+        return await insert_many(*args, **kwargs)
+
+    monkeypatch.setattr(User, "insert_many", insert_with_race)
+    rows = [
+        {"name": "Late", "email": email, "password": "p"},
+        {"name": "Other", "email": f"other-{email}", "password": "p"},
+    ]
+
+    report = await provision_users(enumerate(rows, start=1), executor)
+
+    assert report.created == 1
+    assert report.rejected == {1: ALREADY_REGISTERED}
+
+
+def test_read_jsonl(tmp_path: Path) -> None:
+    """Tests that rows are numbered by lines and broken lines are kept."""
+    path = tmp_path / "users.jsonl"
+    path.write_bytes(b'{"name": "a"}\n\nnot json\n')
+
+    assert list(read_jsonl(path)) == [(1, {"name": "a"}), (3, b"not json\n")]
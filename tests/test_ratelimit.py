@@ -0,0 +1,81 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ConnectionError
+from starlette import status
+
+from ideanest_assesment.services.ratelimit.limiter import RateLimiter
+from ideanest_assesment.settings import settings
+
+
+@pytest.mark.anyio
+async def test_limit_is_shared_by_keys(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that a request is counted only if every key allows it.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    limiter = RateLimiter(redis=Redis(connection_pool=fake_redis_pool), period=60)
+    ip, first, second = "ip", "first", "second"
+
+    assert await limiter.hit({ip: 3, first: 2}) == 0
+    assert await limiter.hit({ip: 3, first: 2}) == 0
+    assert 0 < await limiter.hit({ip: 3, first: 2}) <= 30
+    # Rejected request wasn't counted against the IP.
+    assert await limiter.hit({ip: 3, second: 2}) == 0
+    assert await limiter.hit({ip: 3, second: 2}) > 0
+
+
+@pytest.mark.anyio
+async def test_denied_keys_skip_redis(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that denied keys are rejected locally until they may retry.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    limiter = RateLimiter(redis=Redis(connection_pool=fake_redis_pool), period=60)
+    await limiter.hit({"key": 1})
+    assert await limiter.hit({"key": 1}) > 0
+
+    with patch.object(limiter, "_script") as script:
+        assert await limiter.hit({"key": 1}) > 0
+        script.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_redis_failure_allows_requests(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that requests are allowed when redis is unavailable.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    limiter = RateLimiter(redis=Redis(connection_pool=fake_redis_pool), period=60)
+    with patch.object(limiter, "_script", side_effect=ConnectionError("down")):
+        assert await limiter.hit({"key": 1}) == 0
+
+
+@pytest.mark.anyio
+async def test_login_is_throttled(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that repeated logins to one account get 429 with Retry-After.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    """
+    url = fastapi_app.url_path_for("login_for_access_token")
+    form = {"username": f"{uuid.uuid4().hex}@example.com", "password": "wrong"}
+    for _ in range(settings.rate_limit_account_requests):
+        response = await client.post(url, data=form)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post(url, data=form)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response.headers["Retry-After"]) <= settings.rate_limit_period
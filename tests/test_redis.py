@@ -1,3 +1,4 @@
+import json
 import uuid
 
 import pytest
@@ -6,6 +7,9 @@ from httpx import AsyncClient
 from redis.asyncio import ConnectionPool, Redis
 from starlette import status
 
+from ideanest_assesment.services.redis.codec import ZSTD_HEADER, ValueCodec
+from ideanest_assesment.settings import RedisCompression
+
 
 @pytest.mark.anyio
 async def test_setting_value(
@@ -55,3 +59,306 @@ async def test_getting_value(
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["key"] == test_key
     assert response.json()["value"] == test_val
+
+
+@pytest.mark.anyio
+async def test_setting_many_values(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that you can set many values in redis at once.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    url = fastapi_app.url_path_for("set_redis_values")
+    persistent_key, expiring_key = uuid.uuid4().hex, uuid.uuid4().hex
+    response = await client.put(
+        url,
+        json={
+            "items": [
+                {"key": persistent_key, "value": "first"},
+                {"key": expiring_key, "value": "second", "ttl": 60},
+            ],
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        assert await redis.mget(persistent_key, expiring_key) == [b"first", b"second"]
+        assert await redis.ttl(persistent_key) == -1
+        assert 0 < await redis.ttl(expiring_key) <= 60
+
+
+@pytest.mark.anyio
+async def test_getting_many_values(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that you can get many values from redis at once.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    test_key, missing_key = uuid.uuid4().hex, uuid.uuid4().hex
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.set(test_key, "value")
+    url = fastapi_app.url_path_for("get_redis_values")
+    response = await client.post(url, json={"keys": [test_key, missing_key]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"key": test_key, "value": "value"},
+        {"key": missing_key, "value": None},
+    ]
+
+
+@pytest.mark.anyio
+async def test_streaming_many_values(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that values of many keys are streamed in order.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    keys = [uuid.uuid4().hex for _ in range(1200)]
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.mset({key: key for key in keys[::2]})
+    url = fastapi_app.url_path_for("stream_redis_values")
+    response = await client.post(url, json={"keys": keys})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["key"] for line in lines] == keys
+    assert lines[0]["value"] == keys[0]
+    assert lines[1]["value"] is None
+
+
+@pytest.mark.anyio
+async def test_binary_values_are_escaped(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that values which aren't valid UTF-8 don't break responses.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    test_key, other_key = uuid.uuid4().hex, uuid.uuid4().hex
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.mset({test_key: b"caf\xe9", other_key: "value"})
+    body = {"keys": [test_key, other_key]}
+
+    response = await client.post(
+        fastapi_app.url_path_for("get_redis_values"),
+        json=body,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"key": test_key, "value": "caf\\xe9"},
+        {"key": other_key, "value": "value"},
+    ]
+
+    response = await client.post(
+        fastapi_app.url_path_for("stream_redis_values"),
+        json=body,
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["value"] for line in lines] == ["caf\\xe9", "value"]
+
+
+@pytest.mark.anyio
+async def test_pool_stats(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that connection checkouts are reported.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    """
+    await client.get(fastapi_app.url_path_for("get_redis_value"), params={"key": "k"})
+    response = await client.get(fastapi_app.url_path_for("get_redis_pool_stats"))
+
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()
+    assert stats["checkouts"] >= 1
+    assert stats["in_use"] == 0
+    assert stats["idle"] >= 1
+
+
+@pytest.mark.anyio
+async def test_scanning_keys(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that keys can be walked in several resumable calls.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    prefix = uuid.uuid4().hex
+    keys = {f"{prefix}:{number}" for number in range(50)}
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.mset({key: key for key in keys})
+        await redis.set(uuid.uuid4().hex, "other")
+    url = fastapi_app.url_path_for("scan_redis_keys")
+
+    found = {}
+    cursor = None
+    while cursor != 0:
+        response = await client.get(
+            url,
+            params={
+                "match": f"{prefix}:*",
+                "count": 10,
+                "limit": 10,
+                "cursor": cursor or 0,
+                "with_values": True,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        *lines, last = [json.loads(line) for line in response.text.splitlines()]
+        found.update({line["key"]: line["value"] for line in lines})
+        cursor = last["cursor"]
+
+    assert found == {key: key for key in keys}
+
+
+@pytest.mark.anyio
+async def test_scanning_binary_keys(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that keys which aren't valid UTF-8 don't break the scan.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    prefix = uuid.uuid4().hex
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.mset({f"{prefix}:a".encode() + b"\xe9": "binary"})
+        await redis.set(f"{prefix}:b", "text")
+    url = fastapi_app.url_path_for("scan_redis_keys")
+
+    for with_values in (False, True):
+        response = await client.get(
+            url,
+            params={"match": f"{prefix}:*", "with_values": with_values},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        *lines, last = [json.loads(line) for line in response.text.splitlines()]
+        assert {line["key"] for line in lines} == {
+            f"{prefix}:a\\xe9",
+            f"{prefix}:b",
+        }
+        assert last == {"cursor": 0}
+
+
+@pytest.mark.anyio
+async def test_scanning_set_members(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that members of a set can be walked.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    set_key = uuid.uuid4().hex
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        await redis.sadd(set_key, "first", "second")
+    url = fastapi_app.url_path_for("scan_redis_keys")
+    response = await client.get(url, params={"set_key": set_key})
+
+    *lines, last = [json.loads(line) for line in response.text.splitlines()]
+    assert {line["key"] for line in lines} == {"first", "second"}
+    assert last == {"cursor": 0}
+
+
+@pytest.mark.anyio
+async def test_large_values_are_compressed(
+    fastapi_app: FastAPI,
+    fake_redis_pool: ConnectionPool,
+    client: AsyncClient,
+) -> None:
+    """
+    Tests that large values are stored compressed and read back intact.
+
+    :param fastapi_app: current application fixture.
+    :param fake_redis_pool: fake redis pool.
+    :param client: client fixture.
+    """
+    test_key = uuid.uuid4().hex
+    test_val = json.dumps([{"name": "organization", "level": "member"}] * 100)
+    response = await client.put(
+        fastapi_app.url_path_for("set_redis_value"),
+        json={"key": test_key, "value": test_val},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        stored = await redis.get(test_key)
+    assert stored.startswith(ZSTD_HEADER)
+    assert len(stored) < len(test_val)
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_redis_value"),
+        params={"key": test_key},
+    )
+    assert response.json()["value"] == test_val
+
+
+@pytest.mark.parametrize("compression", list(RedisCompression))
+def test_codec_round_trip(compression: RedisCompression) -> None:
+    """
+    Tests that every codec restores values, including uncompressed ones.
+
+    :param compression: compression algorithm.
+    """
+    codec = ValueCodec(compression=compression, threshold=16)
+    large = b"value" * 100
+
+    assert codec.decode(codec.encode(large)) == large
+    assert codec.encode("short") == b"short"
+    assert codec.decode(b"legacy value") == b"legacy value"
+    assert codec.decode(b"") == b""
+    assert codec.decode(None) is None
+
+
+@pytest.mark.parametrize("header", [b"\xff", b"\xfe", b"\xfd"])
+def test_codec_returns_undecodable_values(header: bytes) -> None:
+    """
+    Tests that values which only look compressed are returned as stored.
+
+    :param header: header of a compressed value.
+    """
+    codec = ValueCodec(compression=RedisCompression.ZSTD, threshold=16)
+    value = header + b"raw binary value"
+
+    assert codec.decode(value) == value
@@ -0,0 +1,43 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+
+from ideanest_assesment.web.responses import ModelResponse
+
+
+class Member(BaseModel):
+    """Nested model."""
+
+    name: str
+    level: str
+
+
+class Team(BaseModel):
+    """Model with an aliased field."""
+
+    id: str = Field(alias="_id")
+    name: str
+    members: list[Member] = []
+
+
+def test_model_response_matches_fastapi() -> None:
+    """Tests that models are serialized the way FastAPI does it."""
+    team = Team(_id="1", name="team", members=[Member(name="a", level="admin")])
+
+    response = ModelResponse(team)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == jsonable_encoder(team)
+
+
+def test_model_response_lists_and_fields() -> None:
+    """Tests that lists are serialized and fields can be limited."""
+    teams = [Team(_id="1", name="first"), Team(_id="2", name="second")]
+
+    assert json.loads(ModelResponse(teams).body) == jsonable_encoder(teams)
+    assert json.loads(ModelResponse([]).body) == []
+    assert json.loads(ModelResponse(teams, include={"name"}).body) == [
+        {"name": "first"},
+        {"name": "second"},
+    ]
@@ -0,0 +1,269 @@
+import uuid
+from typing import Any, AsyncGenerator, Dict
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ConnectionError
+from starlette import status
+
+from ideanest_assesment.auth.auth import get_current_active_user
+from ideanest_assesment.db.models.organization import (
+    MemberUser,
+    Organization,
+    OrganizationMember,
+)
+from ideanest_assesment.db.models.user import User
+from ideanest_assesment.services.roles import cache
+from ideanest_assesment.services.roles.cache import RoleCache
+
+
+async def create_user(name: str) -> User:
+    """
+    Create a user.
+
+    :param name: name of the user.
+    :return: created user.
+    """
+    user = User(
+        name=name,
+        email=f"{uuid.uuid4().hex}@example.com",
+        hashed_password="hashed",  # noqa: S106
+    )
+    await user.create()
+    return user
+
+
+@pytest.fixture
+async def organization() -> AsyncGenerator[Organization, None]:
+    """
+    Create organization with an admin and a member.
+
+    :yield: the organization.
+    """
+    admin = await create_user("admin")
+    member = await create_user("member")
+    organization = Organization(
+        name=uuid.uuid4().hex,
+        description="",
+        members=[
+            OrganizationMember(user=MemberUser.from_user(admin), access_level="admin"),
+            OrganizationMember(
+                user=MemberUser.from_user(member),
+                access_level="member",
+            ),
+        ],
+    )
+    await organization.create()
+    yield organization
+    await Organization.find_all().delete()
+    await admin.delete()
+    await member.delete()
+
+
+def login(fastapi_app: FastAPI, user: User) -> None:
+    """
+    Authenticate requests as the user.
+
+    :param fastapi_app: current application.
+    :param user: the user.
+    """
+    fastapi_app.dependency_overrides[get_current_active_user] = lambda: user
+
+
+@pytest.mark.anyio
+async def test_access_levels(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    organization: Organization,
+) -> None:
+    """
+    Tests that members read and only admins change the organization.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param organization: organization fixture.
+    """
+    admin, member = [await User.get(item.user.id) for item in organization.members]
+    url = fastapi_app.url_path_for(
+        "update_organization_endpoint",
+        organization_id=str(organization.id),
+    )
+    invite_url = fastapi_app.url_path_for(
+        "invite_user_endpoint",
+        organization_id=str(organization.id),
+    )
+
+    login(fastapi_app, member)  # type: ignore
+    assert admin is not None
+    assert (await client.get(url)).status_code == status.HTTP_200_OK
+    response = await client.put(url, json={"description": "changed"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    response = await client.post(invite_url, json={"user_email": admin.email})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert (await client.delete(url)).status_code == status.HTTP_403_FORBIDDEN
+
+    login(fastapi_app, await create_user("stranger"))
+    assert (await client.get(url)).status_code == status.HTTP_404_NOT_FOUND
+
+    login(fastapi_app, admin)  # type: ignore
+    response = await client.put(url, json={"description": "changed"})
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_membership_changes_update_roles(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """
+    Tests that created, invited and deleted memberships reach the cache.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param fake_redis_pool: fake redis pool.
+    """
+    admin = await create_user("admin")
+    invited = await create_user("invited")
+    role_cache = RoleCache(redis=Redis(connection_pool=fake_redis_pool), ttl=60)
+    login(fastapi_app, admin)
+    response = await client.post(
+        fastapi_app.url_path_for("create_organization_endpoint"),
+        json={"name": uuid.uuid4().hex, "description": ""},
+    )
+    organization_id = response.json()["id"]
+    # Load roles of the invited user before they are invited.
+    assert await role_cache.get(invited.id, organization_id) is None  # type: ignore
+
+    await client.post(
+        fastapi_app.url_path_for(
+            "invite_user_endpoint",
+            organization_id=organization_id,
+        ),
+        json={"user_email": invited.email},
+    )
+    assert await role_cache.get(invited.id, organization_id) == "member"  # type: ignore
+
+    await client.delete(
+        fastapi_app.url_path_for(
+            "delete_organization_endpoint",
+            organization_id=organization_id,
+        ),
+    )
+    assert await role_cache.get(admin.id, organization_id) is None  # type: ignore
+    assert await role_cache.get(invited.id, organization_id) is None  # type: ignore
+    await admin.delete()
+    await invited.delete()
+
+
+@pytest.mark.anyio
+async def test_cached_roles_skip_mongo(
+    fake_redis_pool: ConnectionPool,
+    organization: Organization,
+) -> None:
+    """
+    Tests that roles are loaded from mongo once.
+
+    :param fake_redis_pool: fake redis pool.
+    :param organization: organization fixture.
+    """
+    role_cache = RoleCache(redis=Redis(connection_pool=fake_redis_pool), ttl=60)
+    admin = organization.members[0].user
+    organization_id = str(organization.id)
+
+    assert await role_cache.get(admin.id, organization_id) == "admin"  # type: ignore
+    with patch.object(cache, "load_roles", side_effect=AssertionError("mongo")):
+        assert await role_cache.get(admin.id, organization_id) == "admin"  # type: ignore
+        assert await role_cache.get(admin.id, "_loaded") is None  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_stale_roles_are_not_cached(
+    fake_redis_pool: ConnectionPool,
+    organization: Organization,
+) -> None:
+    """
+    Tests that roles loaded before a membership change are discarded.
+
+    :param fake_redis_pool: fake redis pool.
+    :param organization: organization fixture.
+    """
+    role_cache = RoleCache(redis=Redis(connection_pool=fake_redis_pool), ttl=60)
+    member = organization.members[1].user
+    organization_id = str(organization.id)
+    load_roles = cache.load_roles
+
+    async def load_during_removal(*args: Any) -> Dict[str, str]:
+        roles = await load_roles(*args)
+        await role_cache.set(member.id, organization.id, None)  # type: ignore
+        return roles
+
+    with patch.object(cache, "load_roles", load_during_removal):
+        # The request itself is answered with the roles it read.
+        assert await role_cache.get(member.id, organization_id) == "member"  # type: ignore
+
+    organization.members.pop()
+    await organization.save()
+    assert await role_cache.get(member.id, organization_id) is None  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_redis_failure_reads_mongo(
+    fake_redis_pool: ConnectionPool,
+    organization: Organization,
+) -> None:
+    """
+    Tests that roles are read from mongo when redis is unavailable.
+
+    :param fake_redis_pool: fake redis pool.
+    :param organization: organization fixture.
+    """
+    redis = Redis(connection_pool=fake_redis_pool)
+    role_cache = RoleCache(redis=redis, ttl=60)
+    admin = organization.members[0].user
+
+    with patch.object(redis, "hmget", side_effect=ConnectionError("down")):
+        role = await role_cache.get(admin.id, str(organization.id))  # type: ignore
+
+    assert role == "admin"
+
+
+@pytest.mark.anyio
+async def test_list_and_search_only_own_organizations(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    organization: Organization,
+) -> None:
+    """
+    Tests that users list and find only organizations they are members of.
+
+    :param fastapi_app: current application fixture.
+    :param client: client fixture.
+    :param organization: organization fixture.
+    """
+    other = Organization(name=f"{organization.name}-other", description="")
+    await other.create()
+    member = await User.get(organization.members[1].user.id)
+    assert member is not None
+    login(fastapi_app, member)
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_all_organizations_endpoint"),
+    )
+    assert [item["_id"] for item in response.json()] == [str(organization.id)]
+    response = await client.get(
+        fastapi_app.url_path_for("search_organizations_endpoint"),
+        params={"q": organization.name},
+    )
+    assert [item["_id"] for item in response.json()["items"]] == [
+        str(organization.id),
+    ]
+
+    login(fastapi_app, await create_user("stranger"))
+    response = await client.get(
+        fastapi_app.url_path_for("get_all_organizations_endpoint"),
+    )
+    assert response.json() == []
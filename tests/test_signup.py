@@ -0,0 +1,101 @@
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.auth import auth
+from ideanest_assesment.auth.known_emails import KnownEmails
+from ideanest_assesment.db.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def known_emails(monkeypatch: pytest.MonkeyPatch) -> KnownEmails:
+    """
+    Empty cache of known emails.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: the cache used by signup.
+    """
+    emails = KnownEmails(maxsize=10)
+    monkeypatch.setattr(auth, "known_emails", emails)
+    return emails
+
+
+def signup_data() -> dict[str, str]:
+    """Data of a new user."""
+    return {
+        "name": "New",
+        "email": f"{uuid.uuid4().hex}@example.com",
+        "password": "password",
+    }
+
+
+@pytest.mark.anyio
+async def test_signup(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Tests that a user is created and the email is remembered."""
+    data = signup_data()
+
+    response = await client.post(fastapi_app.url_path_for("signup_endpoint"), json=data)
+
+    assert response.status_code == status.HTTP_200_OK
+    user = await User.find_one(User.email == data["email"])
+    assert user is not None
+    assert user.verify_password(data["password"])
+    assert data["email"] in auth.known_emails
+
+
+@pytest.mark.anyio
+async def test_signup_duplicate(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    known_emails: KnownEmails,
+) -> None:
+    """Tests that the unique index rejects emails registered elsewhere."""
+    data = signup_data()
+    await User(
+        name="Existing",
+        email=data["email"],
+        hashed_password="hashed",  # noqa: S106
+    ).insert()
+
+    response = await client.post(fastapi_app.url_path_for("signup_endpoint"), json=data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Email already registered"}
+    assert data["email"] in known_emails
+    assert await User.find(User.email == data["email"]).count() == 1
+
+
+@pytest.mark.anyio
+async def test_signup_known_email_skips_hashing(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    known_emails: KnownEmails,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tests that known emails are rejected before hashing the password."""
+    data = signup_data()
+    known_emails.add(data["email"])
+    pwd_context = Mock()
+    monkeypatch.setattr(auth, "pwd_context", pwd_context)
+
+    response = await client.post(fastapi_app.url_path_for("signup_endpoint"), json=data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    pwd_context.hash.assert_not_called()
+
+
+def test_known_emails_forget_oldest() -> None:
+    """Tests that the oldest email is forgotten when the cache is full."""
+    emails = KnownEmails(maxsize=2)
+    emails.add("a@example.com")
+    emails.add("b@example.com")
+    emails.add("a@example.com")
+    emails.add("c@example.com")
+
+    assert "a@example.com" not in emails
+    assert "b@example.com" in emails
+    assert "c@example.com" in emails
@@ -0,0 +1,163 @@
+import gzip
+import os
+import re
+from pathlib import Path
+from typing import AsyncGenerator
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from ideanest_assesment.web.middleware.compression import CompressionMiddleware
+from ideanest_assesment.web.static import PrecompressedStaticFiles, precompress
+
+SCRIPT = b"function hello() { return 'hello'; }\n" * 200
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> Path:
+    """
+    Directory with static files and their compressed variants.
+
+    :param tmp_path: temporary directory.
+    :return: the static directory.
+    """
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" * 100)
+    precompress(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+async def static_client(static_dir: Path) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Client of an app serving the static directory.
+
+    :param static_dir: the static directory.
+    :yield: client for the app.
+    """
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+def test_precompress(static_dir: Path) -> None:
+    """Tests that only compressible files get variants, once."""
+    script = static_dir / "docs" / "app.js"
+    assert brotli.decompress((static_dir / "docs" / "app.js.br").read_bytes()) == SCRIPT
+    assert gzip.decompress((static_dir / "docs" / "app.js.gz").read_bytes()) == SCRIPT
+    assert not (static_dir / "logo.png.br").exists()
+    assert precompress(static_dir) == 0
+
+    os.utime(script, (script.stat().st_mtime + 10,) * 2)
+    assert precompress(static_dir) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("accept_encoding", "encoding"),
+    [("gzip, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip")],
+)
+async def test_precompressed_variant(
+    static_client: AsyncClient,
+    accept_encoding: str,
+    encoding: str,
+) -> None:
+    """Tests that accepted variant is sent as it was written."""
+    response = await static_client.get(
+        "/static/docs/app.js",
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert not response.headers["etag"].startswith("W/")
+    assert response.content == SCRIPT
+
+
+@pytest.mark.anyio
+async def test_identity(static_client: AsyncClient) -> None:
+    """Tests that original file is sent to clients not accepting variants."""
+    response = await static_client.get(
+        "/static/docs/app.js",
+        headers={"Accept-Encoding": "identity"},
+    )
+    compressed = await static_client.get(
+        "/static/docs/app.js",
+        headers={"Accept-Encoding": "br"},
+    )
+
+    assert "content-encoding" not in response.headers
+    assert response.content == SCRIPT
+    assert response.headers["etag"] != compressed.headers["etag"]
+
+
+@pytest.mark.anyio
+async def test_not_modified(static_client: AsyncClient) -> None:
+    """Tests revalidation of a variant."""
+    headers = {"Accept-Encoding": "br"}
+    response = await static_client.get("/static/docs/app.js", headers=headers)
+    revalidated = await static_client.get(
+        "/static/docs/app.js",
+        headers={**headers, "If-None-Match": response.headers["etag"]},
+    )
+
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert revalidated.headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.anyio
+async def test_cache_control(
+    static_client: AsyncClient,
+    static_dir: Path,
+) -> None:
+    """Tests that only URLs with the current version are immutable."""
+    static_files = PrecompressedStaticFiles(directory=static_dir)
+    version = static_files.version("docs/app.js")
+
+    current = await static_client.get(f"/static/docs/app.js?v={version}")
+    outdated = await static_client.get("/static/docs/app.js?v=0")
+    unversioned = await static_client.get("/static/docs/app.js")
+
+    assert "immutable" in current.headers["cache-control"]
+    assert outdated.headers["cache-control"] == "no-cache"
+    assert unversioned.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.anyio
+async def test_stale_variant(static_dir: Path) -> None:
+    """Tests that variants older than the file aren't sent."""
+    script = static_dir / "docs" / "app.js"
+    script.write_bytes(SCRIPT * 2)
+    os.utime(script, (script.stat().st_mtime + 10,) * 2)
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(
+            "/static/docs/app.js",
+            headers={"Accept-Encoding": "br"},
+        )
+
+    assert "content-encoding" not in response.headers
+    assert response.content == SCRIPT * 2
+
+
+@pytest.mark.anyio
+async def test_docs_versioned_urls(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    """Tests that docs pages link versioned assets."""
+    response = await client.get(fastapi_app.url_path_for("swagger_ui_html"))
+    urls = re.findall(r"/static/docs/[\w.-]+\?v=\w+", response.text)
+
+    assert len(urls) == 2
+    for url in urls:
+        asset = await client.get(url)
+        assert asset.status_code == status.HTTP_200_OK
+        assert "immutable" in asset.headers["cache-control"]
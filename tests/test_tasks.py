@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from ideanest_assesment.services.tasks.dispatcher import (
+    TaskDispatcher,
+    TaskDispatchError,
+)
+from ideanest_assesment.services.tasks.profiles import (
+    BULK_EMAIL_QUEUE,
+    INTERACTIVE_EMAIL_QUEUE,
+    get_celery_profile,
+)
+from ideanest_assesment.settings import CeleryProfile
+
+
+class SlowTask:
+    """Task stub whose publishing blocks like a slow broker."""
+
+    name = "slow_task"
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls: list[tuple[Any, ...]] = []
+
+    def apply_async(self, args: Any, kwargs: Any, **options: Any) -> str:
+        """Block the calling thread and remember the call."""
+        time.sleep(self.delay)
+        self.calls.append((args, kwargs, options))
+        return "task-id"
+
+
+@pytest.mark.anyio
+async def test_enqueue_does_not_block_loop() -> None:
+    """Tests that the event loop keeps running while a task is published."""
+    dispatcher = TaskDispatcher(max_workers=1, buffer_size=1, wait_timeout=1.0)
+    task = SlowTask(delay=0.2)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    result = await dispatcher.enqueue(task, args=(1, 2), queue="email")  # type: ignore
+    ticker_task.cancel()
+    await dispatcher.close()
+
+    assert result == "task-id"
+    assert task.calls == [((1, 2), None, {"queue": "email"})]
+    assert ticks > 5
+    assert dispatcher.stats.enqueued == 1
+    assert dispatcher.stats.last_latency >= 0.2
+
+
+@pytest.mark.anyio
+async def test_enqueue_rejects_when_buffer_full() -> None:
+    """Tests that publishes are rejected once the buffer stays full."""
+    dispatcher = TaskDispatcher(max_workers=1, buffer_size=0, wait_timeout=0.05)
+    task = SlowTask(delay=0.3)
+
+    first = asyncio.create_task(dispatcher.enqueue(task))  # type: ignore
+    await asyncio.sleep(0)
+    with pytest.raises(TaskDispatchError):
+        await dispatcher.enqueue(task)  # type: ignore
+    await first
+    await dispatcher.close()
+
+    assert dispatcher.stats.rejected == 1
+    assert dispatcher.stats.enqueued == 1
+
+
+def test_performance_profile_routes_interactive_emails() -> None:
+    """Tests that the performance profile separates email queues."""
+    config = get_celery_profile(CeleryProfile.PERFORMANCE)
+
+    assert config["task_ignore_result"] is True
+    assert config["task_acks_late"] is True
+    assert config["worker_prefetch_multiplier"] == 1
+    assert config["task_routes"]["send_invitation_email"] == {
+        "queue": INTERACTIVE_EMAIL_QUEUE,
+    }
+    assert {queue.name for queue in config["task_queues"]} == {
+        INTERACTIVE_EMAIL_QUEUE,
+        BULK_EMAIL_QUEUE,
+    }
+    assert get_celery_profile(CeleryProfile.DEFAULT) == {}
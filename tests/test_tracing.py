@@ -0,0 +1,133 @@
+from typing import Any, Generator, List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from opentelemetry import trace
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from starlette import status
+
+from ideanest_assesment.db.models.outbox import OutboxMessage
+from ideanest_assesment.services.outbox.relay import OutboxRelay
+from ideanest_assesment.services.tasks.dispatcher import TaskDispatcher
+from ideanest_assesment.telemetry import (
+    create_tracer_provider,
+    instrument_clients,
+    uninstrument_clients,
+)
+
+EXPORTER = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="session")
+def tracer_provider() -> TracerProvider:
+    """
+    Tracer provider exporting spans to memory.
+
+    The global provider can be set only once per process.
+
+    :return: tracer provider.
+    """
+    provider = create_tracer_provider("ideanest_assesment-tests", exporter=EXPORTER)
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+@pytest.fixture
+def span_exporter(
+    tracer_provider: TracerProvider,
+) -> Generator[InMemorySpanExporter, None, None]:
+    """
+    Trace clients and collect finished spans.
+
+    :param tracer_provider: tracer provider.
+    :yield: exporter with spans finished by the test.
+    """
+    EXPORTER.clear()
+    instrument_clients(tracer_provider)
+    yield EXPORTER
+    uninstrument_clients()
+
+
+class TracedSignature:
+    """Signature stub remembering traces its tasks were published in."""
+
+    name = "traced"
+
+    def __init__(self) -> None:
+        self.trace_ids: List[int] = []
+
+    def apply_async(self, args: Any, kwargs: Any, **options: Any) -> None:
+        """Publish the task."""
+        self.trace_ids.append(trace.get_current_span().get_span_context().trace_id)
+
+
+@pytest.mark.anyio
+async def test_request_trace(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    span_exporter: InMemorySpanExporter,
+    tracer_provider: TracerProvider,
+) -> None:
+    """
+    Tests that redis commands belong to the trace of the request.
+
+    :param fastapi_app: current application.
+    :param client: client for the app.
+    :param span_exporter: exporter of finished spans.
+    :param tracer_provider: tracer provider.
+    """
+    FastAPIInstrumentor().instrument_app(fastapi_app, tracer_provider=tracer_provider)
+    try:
+        response = await client.get("/api/redis/", params={"key": "traced"})
+    finally:
+        FastAPIInstrumentor().uninstrument_app(fastapi_app)
+
+    assert response.status_code == status.HTTP_200_OK
+    spans = span_exporter.get_finished_spans()
+    (server,) = [span for span in spans if span.kind == trace.SpanKind.SERVER]
+    (command,) = [span for span in spans if span.name == "GET"]
+    assert server.name == "GET /api/redis/"
+    assert command.context.trace_id == server.context.trace_id
+
+
+@pytest.mark.anyio
+async def test_outbox_continues_trace(
+    span_exporter: InMemorySpanExporter,
+    test_task_dispatcher: TaskDispatcher,
+) -> None:
+    """
+    Tests that tasks from the outbox are published in the writer's trace.
+
+    :param span_exporter: exporter of finished spans.
+    :param test_task_dispatcher: task dispatcher.
+    """
+    await OutboxMessage.delete_all()
+    with trace.get_tracer(__name__).start_as_current_span("invite") as request_span:
+        await OutboxMessage(task_name=TracedSignature.name).insert()
+    signature = TracedSignature()
+    celery_app: Any = type("Celery", (), {"signature": lambda _, name: signature})()
+    relay = OutboxRelay(
+        dispatcher=test_task_dispatcher,
+        celery_app=celery_app,
+        batch_size=10,
+        poll_interval=0.01,
+        claim_timeout=60,
+        max_attempts=2,
+    )
+
+    assert await relay.relay_batch() == 1
+
+    trace_id = request_span.get_span_context().trace_id
+    assert signature.trace_ids == [trace_id]
+    (publish,) = [
+        span
+        for span in span_exporter.get_finished_spans()
+        if span.name == "outbox publish traced"
+    ]
+    assert publish.parent is not None
+    assert publish.parent.span_id == request_span.get_span_context().span_id